@@ -0,0 +1,107 @@
+"""Deliverability check latency, uncached versus the per-domain cache
+
+Runs a stream of prospect addresses, most of them at a few popular domains,
+against a local stand-in DNS server. The addresses are checked once with
+email_validator resolving every address and once with DeliverabilityChecker.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_deliverability --checks 500 --dns-latency-ms 40
+"""
+
+import argparse
+import random
+import time
+
+from email_validator import EmailUndeliverableError, validate_email
+
+from benchmarks.dns_standin import StandInDNSServer
+from deliverability import DeliverabilityChecker, make_resolver
+
+POPULAR = ["gmail.com", "outlook.com", "yahoo.com", "icloud.com"]
+
+
+def addresses(count, companies, seed=7):
+    rng = random.Random(seed)
+    result = []
+    for n in range(count):
+        if rng.random() < 0.7:
+            domain = rng.choice(POPULAR)
+        elif rng.random() < 0.9:
+            domain = f"company{rng.randrange(companies)}.com"
+        else:
+            domain = f"typo{n}.invalid-example.com"
+        result.append(f"prospect{n}@{domain}")
+    return result
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+def run(label, check, emails):
+    timings = []
+    rejected = 0
+    for email in emails:
+        started = time.perf_counter()
+        if check(email):
+            rejected += 1
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        f"{label:<10} p50 {percentile(timings, 0.5):7.2f} ms  "
+        f"p95 {percentile(timings, 0.95):7.2f} ms  "
+        f"max {timings[-1]:7.2f} ms  total {sum(timings) / 1000:6.2f} s  "
+        f"rejected {rejected}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=500)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--dns-latency-ms", type=float, default=40)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    mx = {domain: [(10, f"mx.{domain}")] for domain in POPULAR}
+    mx.update(
+        (f"company{n}.com", [(10, f"mail.company{n}.com")])
+        for n in range(args.companies)
+    )
+    emails = addresses(args.checks, args.companies)
+
+    with StandInDNSServer(mx, latency=args.dns_latency_ms / 1000) as dns_server:
+
+        def resolver():
+            return make_resolver(
+                ["127.0.0.1"], port=dns_server.port, timeout=args.timeout
+            )
+
+        uncached_resolver = resolver()
+        # dnspython's own cache would hide the per-address lookups
+        uncached_resolver.cache = None
+
+        def uncached(email):
+            try:
+                validate_email(
+                    email, check_deliverability=True, dns_resolver=uncached_resolver
+                )
+            except EmailUndeliverableError as e:
+                return str(e)
+            return None
+
+        queries = dns_server.queries
+        run("uncached", uncached, emails)
+        print(f"{'':<10} {dns_server.queries - queries} DNS queries")
+
+        checker = DeliverabilityChecker(resolver=resolver(), timeout=args.timeout)
+        queries = dns_server.queries
+        run("cached", checker.check, emails)
+        print(f"{'':<10} {dns_server.queries - queries} DNS queries, {checker.stats()}")
+
+
+if __name__ == "__main__":
+    main()
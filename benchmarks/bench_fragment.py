@@ -0,0 +1,91 @@
+"""Server CPU and bytes sent per submit: form fragment versus full-page reruns
+
+Starts the app against a local stand-in SMTP server and submits the form
+from one headless session, first as the browser does (rerunning only the
+form's fragment) and then forcing a full-page rerun for each submit.
+Reports the app process's CPU time, the bytes the browser receives and
+the latency per submit.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fragment --submits 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.load_test import FormSession, free_port, start_app, write_app_config
+from benchmarks.smtp_standin import StandInSMTPServer
+
+TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(pid):
+    """User plus system CPU time of a process, from /proc"""
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / TICKS
+
+
+async def submit_all(session, pid, first, count, fragment):
+    received = session.bytes_received
+    cpu = cpu_seconds(pid)
+    latencies = []
+    for n in range(first, first + count):
+        started = time.perf_counter()
+        alerts = await session.submit(n, full_rerun=not fragment)
+        latencies.append(time.perf_counter() - started)
+        if not any(alert.startswith("🎉") for alert in alerts):
+            raise RuntimeError(f"Submit {n} was not accepted: {alerts}")
+    # Let the outbox finish this batch's emails before reading CPU time
+    await asyncio.sleep(1)
+    return (
+        (cpu_seconds(pid) - cpu) / count,
+        (session.bytes_received - received) / count,
+        statistics.median(latencies),
+    )
+
+
+async def measure(port, pid, submits):
+    session = FormSession(port)
+    await session.connect()
+    # Warm caches, connections and the outbox before timing either mode
+    await submit_all(session, pid, 0, 20, fragment=True)
+    results = {
+        "fragment": await submit_all(session, pid, 1000, submits, fragment=True),
+        "full page": await submit_all(session, pid, 2000, submits, fragment=False),
+    }
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submits", type=int, default=200)
+    args = parser.parse_args()
+
+    with StandInSMTPServer() as smtp, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_app_config(workdir, smtp.port, keep_rate_limits=False)
+        port = free_port()
+        app = start_app(workdir, port)
+        try:
+            results = asyncio.run(measure(port, app.pid, args.submits))
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+
+    for mode, (cpu, sent, latency) in results.items():
+        print(
+            f"{mode:<10} {cpu * 1000:6.2f} ms CPU  {sent / 1024:6.1f} KiB sent  "
+            f"p50 {latency * 1000:6.1f} ms per submit"
+        )
+
+
+if __name__ == "__main__":
+    main()
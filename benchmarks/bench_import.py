@@ -0,0 +1,104 @@
+"""Bulk import throughput as validation processes are added
+
+Writes a CSV of synthetic leads, about 10% invalid and 2% repeated, then
+imports it into a fresh lead store with 1, 2 and 4 validation processes,
+queueing a confirmation email per new lead. Reports records per second,
+against adding the same records one at a time the way the form does.
+Extra processes only help on a host with that many CPUs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import --records 100000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from lead_import import import_leads, prepare_chunk, read_records
+from lead_store import LEAD_FIELDS, LeadStore, connect
+from outbox import status_counts
+from page_sections import REVENUE_RANGES
+
+WORKERS = (1, 2, 4)
+
+
+def write_leads(path, count, seed=7):
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(LEAD_FIELDS)
+        for n in range(count):
+            if rng.random() < 0.02 and n:
+                n = rng.randrange(n)
+            writer.writerow(
+                [
+                    "Bulk",
+                    f"Lead {n}",
+                    f"bulk{n}@example.com" if n % 10 else f"bulk{n}@",
+                    f"(555) {n % 1000:03d}-{n % 10000:04d}",
+                    f"Company {n}",
+                    rng.choice(REVENUE_RANGES),
+                    "Our reports take forever to build",
+                ]
+            )
+
+
+def one_at_a_time(source, store):
+    """Validate, then store and wait, per record, as a form submit does"""
+    with open(source, newline="") as f:
+        for record in read_records(f, "csv"):
+            accepted, _ = prepare_chunk([record])
+            for _, lead, key in accepted:
+                store.add(
+                    lead,
+                    dedupe_key=key,
+                    messages=[("prospect", {"lead": lead})],
+                ).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "leads.csv")
+        write_leads(source, args.records)
+        print(f"{os.cpu_count()} CPUs")
+
+        started = time.perf_counter()
+        one_at_a_time(source, LeadStore(os.path.join(tmp, "single.db")))
+        print(
+            f"one at a time {args.records / (time.perf_counter() - started):8.0f} "
+            "records/s"
+        )
+        for workers in WORKERS:
+            path = os.path.join(tmp, f"leads-{workers}.db")
+            store = LeadStore(path)
+            rejected = []
+            with open(source, newline="") as f:
+                started = time.perf_counter()
+                counts = import_leads(
+                    read_records(f, "csv"),
+                    store,
+                    workers=workers,
+                    chunk_size=args.chunk_size,
+                    on_rejected=lambda number, errors: rejected.append(number),
+                )
+                elapsed = time.perf_counter() - started
+            queued = status_counts(connect(path)).get("pending", 0)
+            assert queued == counts["imported"] and len(rejected) == counts["rejected"]
+            print(
+                f"{workers} workers     {counts['records'] / elapsed:8.0f} records/s  "
+                f"{counts['imported']} imported  {counts['duplicates']} duplicates  "
+                f"{counts['rejected']} rejected  {queued} emails queued"
+            )
+
+
+if __name__ == "__main__":
+    main()
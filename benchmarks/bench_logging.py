@@ -0,0 +1,89 @@
+"""Caller-side cost of a log call: synchronous stderr versus the queue pipeline
+
+Times the submit path's log line as the calling thread sees it, with a
+stream that takes --write-latency-us per write (a busy pipe to the log
+collector), and the cost of a disabled debug call with f-string versus
+%-style arguments.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --calls 20000 --write-latency-us 50
+"""
+
+import argparse
+import io
+import logging
+import time
+
+import structured_logging
+
+EMAIL = "prospect@example.com"
+COMPANY = "Acme Analytics"
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            deadline = time.perf_counter() + self.latency
+            while time.perf_counter() < deadline:
+                pass
+        return len(text)
+
+
+def per_call_us(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--write-latency-us", type=float, default=50)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    root = logging.getLogger()
+    stream = SlowStream(args.write_latency_us / 1e6)
+
+    # What logging.basicConfig(level=INFO) did, pointed at the slow stream
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    sync = per_call_us(
+        lambda: logger.info(f"New consultation request from {EMAIL} at {COMPANY}"),
+        args.calls,
+    )
+    root.removeHandler(handler)
+
+    structured_logging.configure_logging(max_queue=args.calls * 2, stream=stream)
+    queued = per_call_us(
+        lambda: logger.info("New consultation request from %s at %s", EMAIL, COMPANY),
+        args.calls,
+    )
+    structured_logging.shutdown_logging()
+
+    root.setLevel(logging.INFO)
+    disabled_f = per_call_us(
+        lambda: logger.debug(f"New consultation request from {EMAIL} at {COMPANY}"),
+        args.calls,
+    )
+    disabled_lazy = per_call_us(
+        lambda: logger.debug("New consultation request from %s at %s", EMAIL, COMPANY),
+        args.calls,
+    )
+
+    print(f"info, synchronous stderr   {sync:7.2f} us per call")
+    print(f"info, queue pipeline       {queued:7.2f} us per call")
+    print(f"debug off, f-string        {disabled_f:7.3f} us per call")
+    print(f"debug off, %-style         {disabled_lazy:7.3f} us per call")
+
+
+if __name__ == "__main__":
+    main()
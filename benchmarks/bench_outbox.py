@@ -0,0 +1,118 @@
+"""Outbox delivery throughput as worker processes and threads are added
+
+Queues messages in a temporary lead store, then drains them with outbox
+workers in several processes, each sending through its own SMTP connection
+pool to a local stand-in server with injected latency and failures. Reports
+messages per second and checks that nothing was sent twice.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_outbox --messages 400 --smtp-latency-ms 20 \\
+        --smtp-failure-rate 0.05
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.smtp_standin import StandInSMTPServer
+from lead_store import connect, enqueue, migrate
+from outbox import Outbox, status_counts
+from smtp_pool import SMTPConnectionPool
+
+LAYOUTS = ((1, 1), (1, 4), (2, 4), (4, 4))
+
+
+def run_workers(path, smtp_port, threads, stop):
+    # Injected failures would log a retry warning each
+    logging.getLogger("outbox").setLevel(logging.ERROR)
+    pool = SMTPConnectionPool(
+        "127.0.0.1", smtp_port, "", "", use_tls=False, max_size=threads
+    )
+
+    def send(payload):
+        pool.sendmail("site@example.com", payload["to"], payload["body"])
+        return True
+
+    Outbox(
+        path,
+        {"mail": send},
+        workers=threads,
+        backoff_base=0.05,
+        backoff_cap=0.5,
+        poll_interval=0.05,
+    ).start()
+    stop.wait()
+
+
+def drain(path, smtp, processes, threads, count):
+    conn = connect(path)
+    migrate(conn)
+    conn.execute("BEGIN IMMEDIATE")
+    for n in range(count):
+        enqueue(
+            conn,
+            "mail",
+            {"to": f"prospect{n}@example.com", "body": f"Subject: {n}\r\n\r\nHi"},
+        )
+    conn.execute("COMMIT")
+    sent_before = smtp.messages
+
+    stop = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(
+            target=run_workers, args=(path, smtp.port, threads, stop)
+        )
+        for _ in range(processes)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    while status_counts(conn).get("sent", 0) < count:
+        if status_counts(conn).get("dead"):
+            raise RuntimeError("Messages were dead-lettered")
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for worker in workers:
+        worker.join()
+    conn.close()
+    return elapsed, smtp.messages - sent_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--smtp-latency-ms", type=float, default=20)
+    parser.add_argument("--smtp-failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    latency = args.smtp_latency_ms / 1000
+    with StandInSMTPServer(
+        connect_latency=latency,
+        command_latency=latency,
+        failure_rate=args.smtp_failure_rate,
+    ) as smtp:
+        for processes, threads in LAYOUTS:
+            with tempfile.TemporaryDirectory() as tmp:
+                failures = smtp.failures
+                elapsed, delivered = drain(
+                    os.path.join(tmp, "leads.db"),
+                    smtp,
+                    processes,
+                    threads,
+                    args.messages,
+                )
+            print(
+                f"{processes} process x {threads} workers  "
+                f"{args.messages / elapsed:7.1f} msgs/s  "
+                f"{delivered - args.messages} duplicates  "
+                f"{smtp.failures - failures} retried failures"
+            )
+
+
+if __name__ == "__main__":
+    main()
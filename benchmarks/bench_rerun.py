@@ -0,0 +1,67 @@
+"""Per-rerun script time and element count for the landing page
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rerun --reruns 50
+
+AppTest parses, rewrites and compiles the script again on every run, which
+a server does only once, and that grows with the size of the script. The
+runs here share one bytecode cache like a server does; --recompile times
+them the AppTest way instead.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+APP = "business_website.py"
+
+
+def count_elements(node):
+    children = getattr(node, "children", None) or {}
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument(
+        "--recompile",
+        action="store_true",
+        help="compile the script on every rerun, as AppTest does by default",
+    )
+    args = parser.parse_args()
+
+    if not args.recompile:
+        cache = ScriptCache()
+        app_test.ScriptCache = lambda: cache
+        local_script_runner.ScriptCache = lambda: cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        at = AppTest.from_file(APP, default_timeout=60)
+        # Keep leads.db out of the repository and leave the SMTP warm-up
+        # off; the outbox workers still start on the first render
+        at.secrets["LEADS_DB_PATH"] = os.path.join(tmp, "leads.db")
+        at.secrets["STARTUP_MODE"] = "lazy"
+        at.run()
+        timings = []
+        for _ in range(args.reruns):
+            started = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    markdown = sum(1 for _ in at.markdown)
+    print(f"elements   {count_elements(at._tree) - 1}  ({markdown} markdown)")
+    print(
+        f"rerun      mean {statistics.mean(timings):.2f} ms  "
+        f"median {statistics.median(timings):.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
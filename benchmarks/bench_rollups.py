@@ -0,0 +1,105 @@
+"""Dashboard queries on the rollup tables versus scanning leads
+
+Fills a temporary lead store, then times the dashboard's per-day, per-revenue
+query against the equivalent GROUP BY over leads, and the insert cost the
+rollup trigger adds.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rollups --leads 300000 --days 365
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from lead_store import LeadStore, daily_submissions
+from page_sections import REVENUE_RANGES
+
+SCAN = (
+    "SELECT substr(submitted_at, 1, 10) AS day, COALESCE(revenue, '') AS revenue, "
+    "COUNT(*) AS submissions FROM leads WHERE submitted_at >= ? AND submitted_at < ? "
+    "GROUP BY 1, 2 ORDER BY 1, 2"
+)
+
+
+def fill(store, count, days, seed=3):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    futures = []
+    for n in range(count):
+        day = n * days // count
+        lead = {
+            "first_name": "Bench",
+            "last_name": f"Lead {n}",
+            "email": f"bench{n}@example.com",
+            "phone": "(555) 555-5555",
+            "company": f"Company {n % 5000}",
+            "revenue": rng.choice(REVENUE_RANGES),
+            "challenge": "Our reports take forever to build",
+        }
+        submitted = f"{day_string(day)}T{n % 24:02d}:00:00+00:00"
+        futures.append(store.add(lead, submitted_at=submitted))
+    for future in futures:
+        future.result()
+    return time.perf_counter() - started
+
+
+def day_string(offset):
+    return time.strftime("%Y-%m-%d", time.gmtime(1704067200 + offset * 86400))
+
+
+def timed_ms(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=300000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--window", type=int, default=30, help="days shown")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = LeadStore(os.path.join(tmp, "plain.db"), batch_size=1000)
+        plain._reader().execute("DROP TRIGGER leads_daily_insert")
+        without = fill(plain, args.leads, args.days)
+
+        store = LeadStore(os.path.join(tmp, "leads.db"), batch_size=1000)
+        with_trigger = fill(store, args.leads, args.days)
+        print(
+            f"insert     {args.leads / without:9.0f} leads/s without rollups, "
+            f"{args.leads / with_trigger:9.0f} with"
+        )
+
+        conn = store._reader()
+        start = day_string(args.days - args.window)
+        end = day_string(args.days)
+        assert daily_submissions(conn, start, end) == [
+            dict(row) for row in conn.execute(SCAN, (start, end))
+        ]
+        rollup = timed_ms(lambda: daily_submissions(conn, start, end), args.repeats)
+        scan = timed_ms(
+            lambda: conn.execute(SCAN, (start, end)).fetchall(), args.repeats
+        )
+        print(f"{args.window}-day query  rollup {rollup:7.2f} ms  scan {scan:7.2f} ms")
+
+        start = day_string(0)
+        rollup = timed_ms(lambda: daily_submissions(conn, start, end), args.repeats)
+        scan = timed_ms(
+            lambda: conn.execute(SCAN, (start, end)).fetchall(), args.repeats
+        )
+        print(f"all-time query rollup {rollup:7.2f} ms  scan {scan:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Process memory as idle sessions pile up, and after the reaper runs
+
+Starts the app with a short SESSION_IDLE_SECONDS, opens --sessions headless
+sessions in batches that then sit idle like crawler tabs, and records the
+app's RSS and Streamlit's session state total after each batch. Then waits
+for the reaper to close them and opens the same number again, to show the
+memory is reused rather than grown.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sessions --sessions 500 --batch 100
+"""
+
+import argparse
+import asyncio
+import re
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from benchmarks.load_test import FormSession, free_port, start_app, write_app_config
+from benchmarks.smtp_standin import StandInSMTPServer
+
+STATE_BYTES = re.compile(
+    r'cache_memory_bytes\{cache_type="st_session_state"[^}]*\} (\d+)'
+)
+
+
+def rss_mib(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("No VmRSS for the app process")
+
+
+def session_state_kib(port):
+    """Total session state of connected sessions, from Streamlit's own stats"""
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/metrics") as r:
+        text = r.read().decode()
+    return sum(int(n) for n in STATE_BYTES.findall(text)) / 1024
+
+
+async def open_sessions(port, count):
+    sessions = [FormSession(port) for _ in range(count)]
+    for session in sessions:
+        await session.connect()
+    return sessions
+
+
+async def still_open(sessions):
+    async def is_open(session):
+        # Drain anything still queued; None means the server closed it
+        try:
+            while True:
+                if await asyncio.wait_for(session.ws.read_message(), 0.05) is None:
+                    return False
+        except asyncio.TimeoutError:
+            return True
+
+    return sum(await asyncio.gather(*(is_open(s) for s in sessions)))
+
+
+def report(label, pid, port, sessions):
+    print(
+        f"{label:<24} {sessions:5d} sessions  RSS {rss_mib(pid):7.1f} MiB  "
+        f"session state {session_state_kib(port):8.1f} KiB"
+    )
+
+
+async def measure(port, pid, total, batch, idle):
+    # The first session pays for imports and caches, so it isn't counted
+    first = await open_sessions(port, 1)
+    await asyncio.sleep(1)
+    first[0].close()
+    report("start", pid, port, 0)
+    base = rss_mib(pid)
+    sessions = []
+    while len(sessions) < total:
+        sessions += await open_sessions(port, min(batch, total - len(sessions)))
+        report("opened", pid, port, len(sessions))
+    per_session = (rss_mib(pid) - base) * 1024 / total
+    print(f"{'':<24} ~{per_session:.0f} KiB of RSS per idle session")
+
+    # Idle past the limit, plus a sweep interval and some slack
+    await asyncio.sleep(idle + 2.5)
+    remaining = await still_open(sessions)
+    report("after reaper", pid, port, remaining)
+    for session in sessions:
+        session.close()
+
+    sessions = await open_sessions(port, total)
+    report("reopened", pid, port, len(sessions))
+    for session in sessions:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--idle-seconds", type=float, default=60)
+    args = parser.parse_args()
+
+    with StandInSMTPServer() as smtp, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_app_config(workdir, smtp.port, keep_rate_limits=False)
+        with open(workdir / ".streamlit" / "secrets.toml", "a") as secrets:
+            secrets.write(
+                f"SESSION_IDLE_SECONDS = {args.idle_seconds}\n"
+                "SESSION_SWEEP_SECONDS = 1\n"
+            )
+        port = free_port()
+        app = start_app(workdir, port)
+        try:
+            asyncio.run(
+                measure(port, app.pid, args.sessions, args.batch, args.idle_seconds)
+            )
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare per-submission SMTP latency with and without the connection pool
+
+Run from the repository root:
+
+    python -m benchmarks.bench_smtp_pool --submissions 200 --rtt-ms 5
+"""
+
+import argparse
+import smtplib
+import ssl
+import statistics
+import time
+
+from benchmarks.smtp_standin import StandInSMTPServer
+from smtp_pool import SMTPConnectionPool
+
+SENDER = "bench@example.com"
+OWNER = "owner@example.com"
+MESSAGE = "Subject: benchmark\r\n\r\n" + "x" * 2000
+
+
+def submit_without_pool(port):
+    # Mirrors the original send path: new context, connect and login per lead
+    ssl.create_default_context()
+    with smtplib.SMTP("127.0.0.1", port) as server:
+        server.login(SENDER, "secret")
+        server.sendmail(SENDER, OWNER, MESSAGE)
+        server.sendmail(SENDER, "prospect@example.com", MESSAGE)
+
+
+def submit_with_pool(pool):
+    pool.sendmail(SENDER, OWNER, MESSAGE)
+    pool.sendmail(SENDER, "prospect@example.com", MESSAGE)
+
+
+def measure(label, submit, submissions):
+    timings = []
+    for _ in range(submissions):
+        started = time.perf_counter()
+        submit()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        f"{label:<14} mean {statistics.mean(timings):7.2f} ms  "
+        f"p50 {timings[len(timings) // 2]:7.2f} ms  "
+        f"p95 {timings[int(0.95 * (len(timings) - 1))]:7.2f} ms"
+    )
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument(
+        "--rtt-ms",
+        type=float,
+        default=5.0,
+        help="simulated network round trip per SMTP command",
+    )
+    args = parser.parse_args()
+    latency = args.rtt_ms / 1000
+
+    with StandInSMTPServer(connect_latency=latency, command_latency=latency) as smtp:
+        baseline = measure(
+            "without pool", lambda: submit_without_pool(smtp.port), args.submissions
+        )
+
+        pool = SMTPConnectionPool(
+            "127.0.0.1", smtp.port, SENDER, "secret", use_tls=False
+        )
+        pooled = measure("with pool", lambda: submit_with_pool(pool), args.submissions)
+        pool.close()
+
+    print(f"speedup        {baseline / pooled:.1f}x  ({pool.connects} connects)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Cold-start profile: time to healthy, first render and first submission
+
+Launches business_website.py with `streamlit run` several times against a
+local stand-in SMTP server. For each cold start it records time to a healthy
+server, time to the first rendered page, the first submission's latency and
+when its emails were delivered, and the app's own "Startup profile" log line.
+It also reports the slowest imports from `python -X importtime`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 5 --startup-mode warm
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.load_test import APP, FormSession, free_port, write_app_config
+from benchmarks.smtp_standin import StandInSMTPServer
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def launch(workdir, port, log):
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME="1")
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            str(APP),
+            "--server.headless=true",
+            f"--server.port={port}",
+            "--server.fileWatcherType=none",
+            "--browser.gatherUsageStats=false",
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=log,
+    )
+
+
+def wait_healthy(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/_stcore/health", timeout=1
+            ) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError(f"Streamlit did not become healthy within {timeout}s")
+
+
+async def first_session(port, think_time):
+    client = FormSession(port)
+    started = time.perf_counter()
+    await client.connect()
+    first_render = time.perf_counter() - started
+    # A visitor reads the page before submitting; warm-up runs meanwhile
+    await asyncio.sleep(think_time)
+    started = time.perf_counter()
+    alerts = await client.submit(0)
+    submit = time.perf_counter() - started
+    client.close()
+    if not any(alert.startswith("🎉") for alert in alerts):
+        raise RuntimeError(f"First submission was not accepted: {alerts}")
+    return first_render, submit, time.perf_counter()
+
+
+def cold_start(smtp, startup_mode, think_time):
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_app_config(workdir, smtp.port, keep_rate_limits=False)
+        with open(workdir / ".streamlit" / "secrets.toml", "a") as f:
+            f.write(f'STARTUP_MODE = "{startup_mode}"\n')
+        log_path = workdir / "stderr.log"
+        port = free_port()
+        delivered_before = smtp.messages
+
+        with open(log_path, "w") as log:
+            launched = time.perf_counter()
+            app = launch(workdir, port, log)
+            try:
+                wait_healthy(port)
+                healthy = time.perf_counter() - launched
+                first_render, submit, submitted_at = asyncio.run(
+                    first_session(port, think_time)
+                )
+                while smtp.messages < delivered_before + 2:
+                    if time.perf_counter() - submitted_at > 30:
+                        raise RuntimeError("First submission's emails never arrived")
+                    time.sleep(0.005)
+                delivered = time.perf_counter() - submitted_at
+                # The profile is logged once warm-up has finished
+                deadline = time.monotonic() + 15
+                while "Startup profile" not in log_path.read_text(errors="replace"):
+                    if time.monotonic() > deadline:
+                        break
+                    time.sleep(0.05)
+            finally:
+                app.terminate()
+                app.wait(timeout=10)
+
+        output = log_path.read_text(errors="replace")
+    profile = next(
+        (line for line in output.splitlines() if "Startup profile" in line), ""
+    )
+    if profile.startswith("{"):
+        profile = json.loads(profile)["message"]
+    return {
+        "healthy": healthy,
+        "first_render": first_render,
+        "submit": submit,
+        "delivered": delivered,
+        "profile": profile.split("Startup profile: ", 1)[-1],
+        "imports": parse_importtime(output),
+    }
+
+
+def parse_importtime(output):
+    """{module: cumulative microseconds} for top-level imports"""
+    imports = {}
+    for match in IMPORT_LINE.finditer(output):
+        _, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            imports[module] = imports.get(module, 0) + int(cumulative)
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--startup-mode", choices=("warm", "lazy"), default="warm")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=2.0,
+        help="seconds between the first render and the first submission",
+    )
+    parser.add_argument("--smtp-latency-ms", type=float, default=50)
+    parser.add_argument("--top", type=int, default=12, help="slowest imports to list")
+    args = parser.parse_args()
+
+    latency = args.smtp_latency_ms / 1000
+    runs = []
+    with StandInSMTPServer(connect_latency=latency, command_latency=latency) as smtp:
+        for n in range(args.runs):
+            run = cold_start(smtp, args.startup_mode, args.think_time)
+            runs.append(run)
+            print(f"run {n + 1}: {run['profile']}")
+
+    print(f"\nstartup mode    {args.startup_mode}, {args.runs} cold starts")
+    for name, label in (
+        ("healthy", "healthy"),
+        ("first_render", "first render"),
+        ("submit", "first submit"),
+        ("delivered", "first delivery"),
+    ):
+        values = [run[name] * 1000 for run in runs]
+        print(
+            f"{label:<15} median {statistics.median(values):8.1f} ms  "
+            f"max {max(values):8.1f} ms"
+        )
+
+    imports = {}
+    for run in runs:
+        for module, micros in run["imports"].items():
+            imports.setdefault(module, []).append(micros)
+    print(f"\nslowest top-level imports (median of {args.runs})")
+    slowest = sorted(
+        ((statistics.median(v), module) for module, v in imports.items()),
+        reverse=True,
+    )
+    for micros, module in slowest[: args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Cost of a page view: Streamlit session versus the static export
+
+Opens --views headless sessions on the app, each loading the full page or
+only the form view (?view=form) the static site embeds, and reports the
+app process's CPU time, bytes sent and time to a rendered page. Then
+fetches the static_site export from a plain HTTP server for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_static --views 100
+"""
+
+import argparse
+import asyncio
+import functools
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import static_site
+from benchmarks.bench_fragment import cpu_seconds
+from benchmarks.load_test import FormSession, free_port, start_app, write_app_config
+from benchmarks.smtp_standin import StandInSMTPServer
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+async def streamlit_views(port, pid, views, query_string):
+    cpu = cpu_seconds(pid)
+    sent = 0
+    latencies = []
+    for _ in range(views):
+        session = FormSession(port, query_string)
+        started = time.perf_counter()
+        await session.connect()
+        latencies.append(time.perf_counter() - started)
+        sent += session.bytes_received
+        session.close()
+    return (cpu_seconds(pid) - cpu) / views, sent / views, statistics.median(latencies)
+
+
+def static_views(site, views):
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(QuietHandler, directory=site)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    paths = [p.relative_to(site).as_posix() for p in Path(site).rglob("*.*")]
+    sent = 0
+    latencies = []
+    for _ in range(views):
+        started = time.perf_counter()
+        for path in paths:
+            with urllib.request.urlopen(base + path) as response:
+                sent += len(response.read())
+        latencies.append(time.perf_counter() - started)
+    server.shutdown()
+    return sent / views, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=100)
+    args = parser.parse_args()
+
+    with StandInSMTPServer() as smtp, tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_app_config(workdir, smtp.port, keep_rate_limits=False)
+        port = free_port()
+        app = start_app(workdir, port)
+        try:
+            # One view first so imports and caches aren't counted
+            asyncio.run(streamlit_views(port, app.pid, 1, ""))
+            for name, query in (("full page", ""), ("form view", "view=form")):
+                cpu, sent, latency = asyncio.run(
+                    streamlit_views(port, app.pid, args.views, query)
+                )
+                print(
+                    f"streamlit {name:<10} {cpu * 1000:6.2f} ms CPU  "
+                    f"{sent / 1024:6.1f} KiB  p50 {latency * 1000:6.1f} ms per view"
+                )
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+
+        site = workdir / "site"
+        static_site.export(site, f"http://127.0.0.1:{port}")
+        sent, latency = static_views(site, args.views)
+        print(
+            f"static export        0.00 ms CPU  {sent / 1024:6.1f} KiB  "
+            f"p50 {latency * 1000:6.1f} ms per view (uncached, every file)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Messages built per second and bytes allocated per message
+
+Compares the original MIMEMultipart construction with email_templates.py.
+Run from the repository root:
+
+    python -m benchmarks.bench_templates --messages 5000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from email_templates import (
+    OWNER_BODY,
+    PROSPECT_BODY,
+    build_owner_message,
+    build_prospect_message,
+)
+
+SENDER = "sender@example.com"
+OWNER = "owner@example.com"
+LEAD = {
+    "first_name": "Ann",
+    "last_name": "Lee",
+    "email": "ann@example.com",
+    "phone": "(555) 555-5555",
+    "company": "Acme Analytics",
+    "revenue": "$1M - $5M",
+    "challenge": "Our reports take forever to create and nobody trusts them.",
+}
+
+
+def build_original(lead):
+    # The per-lead construction send_consultation_email() used to do
+    fields = dict(lead, submitted=datetime.now().strftime("%B %d, %Y at %I:%M %p"))
+    business_msg = MIMEMultipart()
+    business_msg["From"] = SENDER
+    business_msg["To"] = OWNER
+    business_msg["Subject"] = (
+        f"🚀 New Analytics Consultation Request - {lead['company']}"
+    )
+    business_msg["Reply-To"] = lead["email"]
+    business_msg.attach(MIMEText(OWNER_BODY.format(**fields), "plain"))
+
+    prospect_msg = MIMEMultipart()
+    prospect_msg["From"] = SENDER
+    prospect_msg["To"] = lead["email"]
+    prospect_msg["Subject"] = (
+        "Your Free Analytics Consultation Request - Excelerate Analytics"
+    )
+    prospect_msg.attach(MIMEText(PROSPECT_BODY.format(**fields), "plain"))
+    return business_msg.as_string(), prospect_msg.as_string()
+
+
+def build_templated(lead):
+    return (
+        build_owner_message(SENDER, OWNER, lead, datetime.now()),
+        build_prospect_message(SENDER, lead),
+    )
+
+
+def measure(label, build, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        build(LEAD)
+    elapsed = time.perf_counter() - started
+
+    # Peak memory held while building one lead's pair of messages
+    peaks = []
+    tracemalloc.start()
+    for _ in range(100):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        build(LEAD)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    # Two messages per lead
+    rate = 2 * count / elapsed
+    per_message = sum(peaks) / len(peaks) / 2
+    print(f"{label:<10} {rate:10,.0f} messages/s  {per_message:9,.0f} bytes/message")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    original = measure("original", build_original, args.messages)
+    templated = measure("templated", build_templated, args.messages)
+    print(f"speedup    {templated / original:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
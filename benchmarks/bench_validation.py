@@ -0,0 +1,82 @@
+"""Per-record cost of lead validation: original inline checks vs validation.py
+
+Run from the repository root:
+
+    python -m benchmarks.bench_validation --records 10000
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from validation import normalize_email, validate_submission
+
+
+def original_validate(lead):
+    # The checks as they were inlined in the form handler
+    errors = []
+    if not lead["first_name"].strip():
+        errors.append("First name is required")
+    if not lead["last_name"].strip():
+        errors.append("Last name is required")
+    if not lead["email"].strip():
+        errors.append("Email is required")
+    elif re.match(r"^[^\s@]+@[^\s@]+\.[^\s@]+$", lead["email"]) is None:
+        errors.append("Please enter a valid email address")
+    if not lead["phone"].strip():
+        errors.append("Phone number is required")
+    elif len(re.sub(r"[\s\-\(\)\.]+", "", lead["phone"])) < 10:
+        errors.append("Please enter a valid phone number")
+    if not lead["company"].strip():
+        errors.append("Company name is required")
+    if not lead["challenge"].strip():
+        errors.append("Please describe your biggest data challenge")
+    return errors
+
+
+def make_records(count, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        records.append(
+            {
+                "first_name": rng.choice(["Ann", "Bo", "", "Carla"]),
+                "last_name": f"Lee{i}",
+                "email": rng.choice([f"user{i}@example.com", f"user{i}@bad", ""]),
+                "phone": rng.choice(["(555) 555-5555", "555-0101", "702.445.2266"]),
+                "company": f"Company {i % 500}",
+                "revenue": "",
+                "challenge": "Our reports take forever to create",
+            }
+        )
+    return records
+
+
+def per_record_us(func, count, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    records = make_records(args.records)
+
+    assert [original_validate(r) for r in records] == [
+        validate_submission(r) for r in records
+    ]
+
+    results = {
+        "original inline": lambda: [original_validate(r) for r in records],
+        "validate_submission": lambda: [validate_submission(r) for r in records],
+        "normalize_email": lambda: [normalize_email(r["email"]) for r in records],
+    }
+    for label, func in results.items():
+        cost = per_record_us(func, len(records), args.repeat)
+        print(f"{label:<20} {cost:6.2f} us/record")
+
+
+if __name__ == "__main__":
+    main()
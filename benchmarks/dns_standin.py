@@ -0,0 +1,74 @@
+"""Minimal local DNS server for deliverability benchmarks"""
+
+import socketserver
+import threading
+import time
+
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.rrset
+
+
+class _DNSHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        question = query.question[0]
+        name = question.name.to_text(omit_final_dot=True).lower()
+        server.record()
+
+        if name not in server.mx:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        elif question.rdtype == dns.rdatatype.MX and server.mx[name]:
+            response.answer.append(
+                dns.rrset.from_text_list(
+                    question.name,
+                    300,
+                    dns.rdataclass.IN,
+                    dns.rdatatype.MX,
+                    [f"{pref} {host}." for pref, host in server.mx[name]],
+                )
+            )
+        # Any other type for a known name is an empty NOERROR answer
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class StandInDNSServer(socketserver.ThreadingUDPServer):
+    """Answer MX queries from a {domain: [(preference, host)]} table
+
+    Domains not in the table are NXDOMAIN; a domain mapped to an empty list
+    exists but has no MX record. Every query waits `latency` seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, mx, port=0, latency=0.0):
+        super().__init__(("127.0.0.1", port), _DNSHandler)
+        self.mx = {domain.lower(): records for domain, records in mx.items()}
+        self.latency = latency
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record(self):
+        with self._lock:
+            self.queries += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
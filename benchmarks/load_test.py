@@ -0,0 +1,284 @@
+"""Concurrent load test for the consultation form
+
+Starts business_website.py with `streamlit run`, pointed at a local stand-in
+SMTP server, then opens headless websocket sessions that fill in and submit
+consultation_form at a target rate. Reports throughput, p50/p95/p99 submit
+latency and how quickly the queued emails were delivered.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --sessions 20 --rate 10 --duration 30 \\
+        --smtp-latency-ms 20 --smtp-failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from benchmarks.smtp_standin import StandInSMTPServer
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "business_website.py"
+
+FORM_VALUES = {
+    "First Name *": "Load",
+    "Last Name *": "Tester {n}",
+    "Business Email *": "loadtest+{n}@example.com",
+    "Phone Number *": "(555) 555-{n:04d}",
+    "Company Name *": "Load Test Co {n}",
+    "What's your biggest data challenge? *": "Synthetic load test submission {n}",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+def write_app_config(workdir, smtp_port, keep_rate_limits):
+    streamlit_dir = workdir / ".streamlit"
+    streamlit_dir.mkdir()
+    shutil.copy(ROOT / ".streamlit" / "config.toml", streamlit_dir / "config.toml")
+    (streamlit_dir / "secrets.toml").write_text(f"""
+SMTP_SERVER = "127.0.0.1"
+SMTP_PORT = {smtp_port}
+SMTP_USE_TLS = false
+SENDER_EMAIL = "site@example.com"
+SENDER_PASSWORD = "load-test"
+RECIPIENT_EMAIL = "owner@example.com"
+LEADS_DB_PATH = "{workdir / 'leads.db'}"
+RATE_LIMIT_ENABLED = {'true' if keep_rate_limits else 'false'}
+# Headless sessions submit as soon as the form is shown
+SPAM_MIN_FILL_SECONDS = 0
+""")
+
+
+def start_app(workdir, port):
+    # Streamlit reads .streamlit/ from the working directory
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            str(APP),
+            "--server.headless=true",
+            f"--server.port={port}",
+            "--server.fileWatcherType=none",
+            "--browser.gatherUsageStats=false",
+        ],
+        cwd=workdir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/_stcore/health", timeout=1
+            ) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Streamlit did not become healthy within 30s")
+
+
+class FormSession:
+    """One browser tab, speaking Streamlit's websocket protocol"""
+
+    def __init__(self, port, query_string=""):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.query_string = query_string
+        self.widgets = {}
+        self.submit_id = None
+        # The browser reruns only the form's fragment when it is submitted
+        self.fragment_id = ""
+        self.bytes_received = 0
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+        await self.rerun([])
+
+    async def rerun(self, widget_states, fragment_id=""):
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+        msg.rerun_script.fragment_id = fragment_id
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        alerts = []
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("Websocket closed by server")
+            self.bytes_received += len(raw)
+            fwd = ForwardMsg.FromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "script_finished":
+                return alerts
+            if kind != "delta" or fwd.delta.WhichOneof("type") != "new_element":
+                continue
+            element = fwd.delta.new_element
+            widget = element.WhichOneof("type")
+            if widget in ("text_input", "text_area"):
+                proto = getattr(element, widget)
+                self.widgets[proto.label] = proto.id
+            elif widget == "button" and element.button.is_form_submitter:
+                self.submit_id = element.button.id
+                self.fragment_id = fwd.delta.fragment_id
+            elif widget == "alert":
+                alerts.append(element.alert.body)
+            elif widget == "exception":
+                alerts.append(f"exception: {element.exception.message}")
+
+    async def submit(self, n, full_rerun=False):
+        states = [
+            WidgetState(id=self.widgets[label], string_value=template.format(n=n))
+            for label, template in FORM_VALUES.items()
+        ]
+        states.append(WidgetState(id=self.submit_id, trigger_value=True))
+        return await self.rerun(states, "" if full_rerun else self.fragment_id)
+
+    def close(self):
+        self.ws.close()
+
+
+async def drive(port, sessions, rate, duration):
+    clients = [FormSession(port) for _ in range(sessions)]
+    await asyncio.gather(*(client.connect() for client in clients))
+
+    jobs = asyncio.Queue()
+    results = []
+
+    async def worker(client):
+        while True:
+            n = await jobs.get()
+            if n is None:
+                return
+            started = time.perf_counter()
+            try:
+                alerts = await client.submit(n)
+            except Exception as e:
+                alerts = [f"exception: {e}"]
+            latency = time.perf_counter() - started
+            if any(alert.startswith("🎉") for alert in alerts):
+                outcome = "accepted"
+            elif any(alert.startswith("exception") for alert in alerts):
+                outcome = "error"
+            else:
+                outcome = "rejected"
+            results.append((outcome, latency))
+
+    workers = [asyncio.create_task(worker(client)) for client in clients]
+    started = time.perf_counter()
+    total = int(rate * duration)
+    for n in range(total):
+        # Open-loop arrivals: submissions are offered on schedule even when
+        # every session is busy, so saturation shows up as queueing
+        delay = started + n / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        jobs.put_nowait(n)
+    for _ in workers:
+        jobs.put_nowait(None)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - started
+
+    for client in clients:
+        client.close()
+    return results, elapsed
+
+
+def report(results, elapsed, smtp, drain_seconds):
+    counts = {}
+    for outcome, _ in results:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    latencies = sorted(latency * 1000 for _, latency in results)
+
+    print(f"submissions     {len(results)} in {elapsed:.1f}s")
+    print(f"throughput      {len(results) / elapsed:.1f} submits/s")
+    print(
+        "outcomes        "
+        + ", ".join(f"{name} {count}" for name, count in sorted(counts.items()))
+    )
+    print(
+        f"submit latency  p50 {percentile(latencies, 0.50):.1f} ms  "
+        f"p95 {percentile(latencies, 0.95):.1f} ms  "
+        f"p99 {percentile(latencies, 0.99):.1f} ms  "
+        f"max {latencies[-1] if latencies else float('nan'):.1f} ms"
+    )
+    print(
+        f"smtp            {smtp.messages} delivered, {smtp.failures} injected "
+        f"failures, drained {drain_seconds:.1f}s after the last submit"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=10, help="submits per second")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--smtp-latency-ms", type=float, default=20)
+    parser.add_argument("--smtp-failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--keep-rate-limits",
+        action="store_true",
+        help="leave the form's submission throttling on",
+    )
+    parser.add_argument("--drain-timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    latency = args.smtp_latency_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp, StandInSMTPServer(
+        connect_latency=latency,
+        command_latency=latency,
+        failure_rate=args.smtp_failure_rate,
+    ) as smtp:
+        workdir = Path(tmp)
+        write_app_config(workdir, smtp.port, args.keep_rate_limits)
+        port = free_port()
+        app = start_app(workdir, port)
+        try:
+            results, elapsed = asyncio.run(
+                drive(port, args.sessions, args.rate, args.duration)
+            )
+
+            # Emails are sent in the background; wait for the queue to drain
+            accepted = sum(1 for outcome, _ in results if outcome == "accepted")
+            drain_started = time.monotonic()
+            while (
+                smtp.messages + smtp.failures < 2 * accepted
+                and time.monotonic() - drain_started < args.drain_timeout
+            ):
+                time.sleep(0.1)
+            report(results, elapsed, smtp, time.monotonic() - drain_started)
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
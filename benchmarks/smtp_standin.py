@@ -0,0 +1,97 @@
+"""Minimal local SMTP server for benchmarks and load tests"""
+
+import random
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        if server.connect_latency:
+            time.sleep(server.connect_latency)
+        self.reply("220 localhost stand-in ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if server.command_latency:
+                time.sleep(server.command_latency)
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250-AUTH PLAIN LOGIN")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 localhost")
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk == b".\r\n":
+                        break
+                    size += len(chunk)
+                if random.random() < server.failure_rate:
+                    server.record(failed=True)
+                    self.reply("451 4.3.0 Injected failure")
+                else:
+                    server.record(size=size)
+                    self.reply("250 OK queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    """Accept mail on localhost with injectable latency and failures"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self, port=0, connect_latency=0.0, command_latency=0.0, failure_rate=0.0
+    ):
+        super().__init__(("127.0.0.1", port), _SMTPHandler)
+        self.connect_latency = connect_latency
+        self.command_latency = command_latency
+        self.failure_rate = failure_rate
+        self.messages = 0
+        self.failures = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record(self, size=0, failed=False):
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.messages += 1
+                self.bytes_received += size
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
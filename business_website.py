@@ -1,14 +1,41 @@
+# Imported first so the profile can time the script's own imports
+import startup
 import streamlit as st
-import smtplib
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from streamlit import config as st_config
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime
-import re
 import logging
+import time
+
+from idempotency import IdempotencyGuard, submission_key
+from lead_store import LeadStore
+from mail_config import MailConfigError, MailConfigWatcher
+import metrics
+from outbox import Outbox
+from owner_digest import OwnerDigest
+from page_sections import (
+    BENEFITS_MD,
+    FOOTER_HTML,
+    LANDING_HTML,
+    PRIVACY_NOTE_HTML,
+    REVENUE_RANGES,
+    SESSION_INTRO_MD,
+)
+from rate_limit import RateLimiter, RateLimitExceeded
+import session_monitor
+from spam_filter import SpamFilter, SpamRejected
+from site_assets import style_tag
+from structured_logging import (
+    configure_logging,
+    correlation_scope,
+    current_correlation_id,
+)
+from validation import normalize_email, validate_submission
+
+# smtp_pool (smtplib, TLS) and email_templates are imported on first use or
+# by the background warm-up, so page views that never submit don't pay for them
+startup.mark("imports")
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Page configuration
@@ -22,545 +49,513 @@ st.set_page_config(
 
 # Custom CSS for dark blue theme
 def load_css():
-    st.markdown(
-        """
-    <style>
-    /* Import fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-    
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Root variables for dark blue theme */
-    :root {
-        --primary-dark: #0f172a;
-        --primary-blue: #1e293b;
-        --secondary-blue: #334155;
-        --accent-blue: #3b82f6;
-        --light-blue: #60a5fa;
-        --gold: #fbbf24;
-        --text-primary: #f8fafc;
-        --text-secondary: #cbd5e1;
-        --text-muted: #94a3b8;
-        --success: #10b981;
-    }
-    
-    /* Main app styling */
-    .stApp {
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-        font-family: 'Inter', sans-serif;
-        color: #f8fafc;
-    }
-    
-    /* Hero section */
-    .hero-section {
-        text-align: center;
-        padding: 4rem 0 6rem 0;
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-        position: relative;
-    }
-    
-    .hero-title {
-        font-size: 6rem;
-        font-weight: 1200;
-        color: #f8fafc;
-        margin-bottom: 1.5rem;
-        text-shadow: 0 4px 20px rgba(15, 23, 42, 0.5);
-        line-height: 1.1;
-    }
-    
-    .hero-highlight {
-        font-size: 2rem;
-        font-weight: 600;
-        color: #f8fafc;
-        margin-bottom: 1.5rem;
-        text-shadow: 0 4px 20px rgba(15, 23, 42, 0.5);
-        line-height: 1.1;
-        background: linear-gradient(45deg, #fbbf24, #60a5fa);
-        -webkit-background-clip: text;
-        background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    
-    .hero-subtext {
-        font-size: 1.4rem;
-        color: #fbbf24;
-        margin-bottom: 1rem;
-        font-weight: 600;
-    }
-    
-    .hero-description {
-        font-size: 1.1rem;
-        color: #cbd5e1;
-        margin-bottom: 2.5rem;
-        text=align: center;
-    }
-    
-    /* Value propositions */
-    .value-props {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 2rem;
-        margin: 3rem 0;
-    }
-    
-    .value-prop {
-        background: rgba(30, 41, 59, 0.8);
-        backdrop-filter: blur(20px);
-        border: 1px solid rgba(59, 130, 246, 0.3);
-        border-radius: 20px;
-        padding: 2rem 1.5rem;
-        text-align: center;
-        transition: all 0.3s ease;
-    }
-    
-    .value-prop:hover {
-        transform: translateY(-5px);
-        background: rgba(59, 130, 246, 0.15);
-        border-color: #3b82f6;
-        box-shadow: 0 10px 30px rgba(59, 130, 246, 0.3);
-    }
-    
-    .value-prop h3 {
-        color: #f8fafc;
-        font-size: 1.2rem;
-        margin-bottom: 0.75rem;
-        font-weight: 600;
-    }
-    
-    .value-prop p {
-        color: #cbd5e1;
-        margin: 0;
-    }
-    
-    /* Trust indicators */
-    .trust-section {
-        background: #1e293b;
-        padding: 3rem 0;
-        text-align: center;
-        border-radius: 20px;
-        margin: 3rem 0;
-    }
-    
-    .trust-items {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 2rem;
-        margin-top: 2rem;
-    }
-    
-    .trust-item {
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-    }
-    
-    .trust-number {
-        font-size: 2.5rem;
-        font-weight: 800;
-        color: #60a5fa;
-        margin-bottom: 0.5rem;
-    }
-    
-    .trust-label {
-        font-weight: 600;
-        color: #cbd5e1;
-    }
-    
-    /* Form styling */
-    .stForm {
-        background: rgba(15, 23, 42, 0.95);
-        backdrop-filter: blur(20px);
-        border: 1px solid rgba(59, 130, 246, 0.3);
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 2rem 0;
-    }
-    
-    /* Input styling */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea,
-    .stSelectbox > div > div > select {
-        background: rgba(30, 41, 59, 0.5) !important;
-        color: #f8fafc !important;
-        border: 2px solid rgba(148, 163, 184, 0.2) !important;
-        border-radius: 12px !important;
-        padding: 16px !important;
-        font-size: 1rem !important;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus,
-    .stSelectbox > div > div > select:focus {
-        border-color: #3b82f6 !important;
-        box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.3) !important;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(45deg, #3b82f6, #60a5fa) !important;
-        color: #f8fafc !important;
-        padding: 18px 40px !important;
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        border: none !important;
-        border-radius: 12px !important;
-        width: 100% !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 25px rgba(59, 130, 246, 0.4) !important;
-        background: linear-gradient(45deg, #60a5fa, #3b82f6) !important;
-    }
-    
-    /* Labels */
-    .stTextInput > label,
-    .stTextArea > label,
-    .stSelectbox > label {
-        color: #cbd5e1 !important;
-        font-weight: 600 !important;
-        margin-bottom: 8px !important;
-    }
-    
-    /* Success/Error messages */
-    .stSuccess {
-        background: rgba(16, 185, 129, 0.2) !important;
-        border: 1px solid #10b981 !important;
-        color: #10b981 !important;
-        border-radius: 12px !important;
-    }
-    
-    .stError {
-        background: rgba(239, 68, 68, 0.2) !important;
-        border: 1px solid #ef4444 !important;
-        color: #fca5a5 !important;
-        border-radius: 12px !important;
-    }
-    
-    /* Section headers */
-    h1, h2, h3 {
-        color: #f8fafc !important;
-    }
-    
-    h2 {
-        font-size: 2.5rem !important;
-        font-weight: 700 !important;
-        text-align: center !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    /* Benefits section */
-    .benefits-container {
-        background: rgba(30, 41, 59, 0.8);
-        backdrop-filter: blur(20px);
-        border: 1px solid rgba(59, 130, 246, 0.3);
-        border-radius: 20px;
-        padding: 2rem;
-        margin: 2rem 0;
-    }
-    
-    .benefit-item {
-        display: flex;
-        align-items: flex-start;
-        margin-bottom: 1rem;
-        padding: 1rem;
-        background: rgba(59, 130, 246, 0.1);
-        border: 1px solid rgba(148, 163, 184, 0.2);
-        border-radius: 12px;
-    }
-    
-    .benefit-icon {
-        width: 24px;
-        height: 24px;
-        background: linear-gradient(45deg, #10b981, #60a5fa);
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin-right: 15px;
-        flex-shrink: 0;
-        color: #f8fafc;
-        font-weight: bold;
-        font-size: 14px;
-    }
-    
-    /* Footer */
-    .footer {
-        background: #171923;
-        color: #cbd5e1;
-        padding: 2rem 0;
-        text-align: center;
-        border-radius: 20px;
-        margin-top: 1rem;
-    }
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .hero-title {
-            font-size: 2.5rem !important;
-        }
-        
-        .value-props {
-            grid-template-columns: 1fr !important;
-        }
-        
-        .trust-items {
-            grid-template-columns: 1fr !important;
-        }
-    }
-    </style>
-    """,
-        unsafe_allow_html=True,
+    with metrics.timed("render_seconds", section="css"):
+        st.markdown(style_tag(), unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_smtp_pool(
+    smtp_server,
+    smtp_port,
+    sender_email,
+    sender_password,
+    use_tls=True,
+    timeout=10,
+    deadline=None,
+):
+    """Shared pool of authenticated SMTP connections"""
+    from smtp_pool import SMTPConnectionPool
+
+    return SMTPConnectionPool(
+        smtp_server,
+        smtp_port,
+        sender_email,
+        sender_password,
+        use_tls=use_tls,
+        timeout=timeout,
+        deadline=deadline,
     )
 
 
-def validate_email(email):
-    """Validate email format"""
-    pattern = r"^[^\s@]+@[^\s@]+\.[^\s@]+$"
-    return re.match(pattern, email) is not None
+@st.cache_resource
+def get_mail_config_watcher():
+    """Mail configuration loaded once and reloaded when secrets.toml changes"""
+    # st.secrets is looked up on each load, so tests can swap it out
+    return MailConfigWatcher(st_config.get_option("secrets.files"), lambda: st.secrets)
 
 
-def validate_phone(phone):
-    """Validate phone number"""
-    clean_phone = re.sub(r"[\s\-\(\)\.]+", "", phone)
-    return len(clean_phone) >= 10
+def mail_settings():
+    """Current validated mail configuration"""
+    watcher = get_mail_config_watcher()
+    if watcher.config is None:
+        raise MailConfigError(watcher.error)
+    return watcher.config
 
 
-def send_consultation_email(
-    first_name, last_name, email, phone, company, revenue, challenge
-):
-    """Send email notifications for consultation requests"""
-    try:
-        # Email configuration (you'll need to set these up)
-        smtp_server = st.secrets.get("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = st.secrets.get("SMTP_PORT", 587)
-        sender_email = st.secrets.get("SENDER_EMAIL", "your-email@gmail.com")
-        sender_password = st.secrets.get("SENDER_PASSWORD", "your-app-password")
-        recipient_email = st.secrets.get(
-            "RECIPIENT_EMAIL", "michael@excelerateanalytics.com"
-        )
+def _pool_for(settings):
+    return get_smtp_pool(
+        settings.smtp_server,
+        settings.smtp_port,
+        settings.sender_email,
+        settings.sender_password,
+        use_tls=settings.use_tls,
+        timeout=settings.timeout,
+        # Sends give up before the outbox could lease the message again
+        deadline=get_outbox().send_deadline,
+    )
+
+
+def send_owner_notification(lead, submitted, spam_reason=None):
+    """Send the business owner a notification for one lead"""
+    from email_templates import build_owner_message
 
-        # Create message to business owner
-        business_msg = MIMEMultipart()
-        business_msg["From"] = sender_email
-        business_msg["To"] = recipient_email
-        business_msg["Subject"] = f"🚀 New Analytics Consultation Request - {company}"
-        business_msg["Reply-To"] = email
+    settings = mail_settings()
+    message = build_owner_message(
+        settings.sender_email, settings.recipient_email, lead, submitted, spam_reason
+    )
+    _pool_for(settings).sendmail(
+        settings.sender_email, settings.recipient_email, message, kind="owner"
+    )
 
-        business_body = f"""
-NEW CONSULTATION REQUEST RECEIVED!
 
-Contact Information:
-━━━━━━━━━━━━━━━━━━━━━━━━
-👤 Name: {first_name} {last_name}
-📧 Email: {email}
-📞 Phone: {phone}
-🏢 Company: {company}
-💰 Revenue Range: {revenue or "Not specified"}
+def send_prospect_confirmation(lead):
+    """Send the prospect a confirmation of their request"""
+    from email_templates import ascii_address, build_prospect_message
 
-Challenge Description:
-━━━━━━━━━━━━━━━━━━━━━━━━
-{challenge}
+    settings = mail_settings()
+    message = build_prospect_message(settings.sender_email, lead)
+    _pool_for(settings).sendmail(
+        settings.sender_email,
+        ascii_address(lead["email"]),
+        message,
+        kind="prospect",
+    )
 
-━━━━━━━━━━━━━━━━━━━━━━━━
-⏰ Submitted: {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
 
-Next Steps:
-1. Review their challenge description
-2. Contact them within 24 hours
-3. Schedule their free strategy session
+def send_owner_digest(batch):
+    """Send the business owner one summary for several leads"""
+    from email_templates import build_owner_digest
 
-Reply directly to this email to contact {first_name}.
-        """
+    settings = mail_settings()
+    message = build_owner_digest(settings.sender_email, settings.recipient_email, batch)
+    _pool_for(settings).sendmail(
+        settings.sender_email, settings.recipient_email, message, kind="digest"
+    )
+    logger.info("Owner digest sent for %d leads", len(batch))
 
-        business_msg.attach(MIMEText(business_body, "plain"))
 
-        # Create confirmation message to prospect
-        prospect_msg = MIMEMultipart()
-        prospect_msg["From"] = sender_email
-        prospect_msg["To"] = email
-        prospect_msg["Subject"] = (
-            "Your Free Analytics Consultation Request - Excelerate Analytics"
-        )
+@st.cache_resource
+def get_owner_digest():
+    """Shared owner digest, or None when digest mode is off"""
+    try:
+        mode = st.secrets.get("OWNER_DIGEST_MODE", "off")
+        window = float(st.secrets.get("OWNER_DIGEST_WINDOW_SECONDS", 300))
+        max_leads = int(st.secrets.get("OWNER_DIGEST_MAX_LEADS", 20))
+    except FileNotFoundError:
+        return None
+    if mode == "off":
+        return None
+    return OwnerDigest(
+        send_owner_notification,
+        send_owner_digest,
+        mode=mode,
+        window=window,
+        max_leads=max_leads,
+    )
 
-        prospect_body = f"""Hi {first_name},
 
-Thank you for requesting a free analytics strategy session with Excelerate Analytics!
+def outbox_messages(lead, spam_reason=None):
+    """The emails a new lead needs, as (kind, payload) outbox messages
+
+    A lead the spam filter flagged only gets an owner notification marked
+    as possible spam, sent on its own rather than in a digest; the address
+    may not be the visitor's, so it is not sent a confirmation.
+    """
+    submitted = datetime.now().isoformat(timespec="seconds")
+    correlation_id = current_correlation_id()
+    if spam_reason:
+        return [
+            (
+                "flagged",
+                {
+                    "lead": lead,
+                    "submitted": submitted,
+                    "spam_reason": spam_reason,
+                    "correlation_id": correlation_id,
+                },
+            )
+        ]
+    return [
+        ("prospect", {"lead": lead, "correlation_id": correlation_id}),
+        (
+            "owner",
+            {"lead": lead, "submitted": submitted, "correlation_id": correlation_id},
+        ),
+    ]
 
-We've received your consultation request and will contact you within 24 hours to schedule your complimentary 45-minute session.
 
-During your session, we'll:
-✅ Audit your current data and analytics setup
-✅ Identify your biggest profit opportunities
-✅ Create a custom roadmap to increase revenue and reduce costs
-✅ Provide actionable steps you can implement immediately
+def deliver_prospect(payload):
+    send_prospect_confirmation(payload["lead"])
 
-What to Expect Next:
-━━━━━━━━━━━━━━━━━━━━━━━━
-1. We'll call you within 24 hours to schedule your session
-2. Your free consultation will be scheduled at your convenience
-3. We'll send you a calendar invite with all the details
 
-Questions? Simply reply to this email or call us at (702) 445-2266.
+def deliver_owner(payload):
+    send_owner_notification(
+        payload["lead"], datetime.fromisoformat(payload["submitted"])
+    )
 
-Looking forward to helping you transform your data into your biggest competitive advantage!
 
-Best regards,
-Michael Bacon
-Excelerate Analytics, LLC
-michael@excelerateanalytics.com
-(702) 445-2266
+def deliver_flagged(payload):
+    send_owner_notification(
+        payload["lead"],
+        datetime.fromisoformat(payload["submitted"]),
+        spam_reason=payload["spam_reason"],
+    )
 
-P.S. This consultation is normally $500 but it's completely free with no obligation. We're confident you'll find immediate value in our session!
-        """
 
-        prospect_msg.attach(MIMEText(prospect_body, "plain"))
+OUTBOX_FUNNEL_EVENTS = {
+    "sent": "email_delivered",
+    "retry": "email_retried",
+    "dead": "email_failed",
+}
 
-        # Send emails
-        context = ssl.create_default_context()
 
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls(context=context)
-            server.login(sender_email, sender_password)
+def record_outbox_outcome(kind, outcome):
+    record_funnel(OUTBOX_FUNNEL_EVENTS[outcome])
 
-            # Send to business owner
-            server.sendmail(sender_email, recipient_email, business_msg.as_string())
 
-            # Send confirmation to prospect
-            server.sendmail(sender_email, email, prospect_msg.as_string())
+@st.cache_resource
+def get_outbox():
+    """Outbox workers delivering queued emails, including other processes'"""
+    try:
+        workers = int(st.secrets.get("OUTBOX_WORKERS", 4))
+        lease = float(st.secrets.get("OUTBOX_LEASE_SECONDS", 60))
+        max_attempts = int(st.secrets.get("OUTBOX_MAX_ATTEMPTS", 8))
+        send_deadline = float(st.secrets.get("SMTP_DEADLINE_SECONDS", 30))
+    except FileNotFoundError:
+        workers, lease, max_attempts, send_deadline = 4, 60, 8, 30
+    # In digest mode owner messages wait in the outbox and go out in batches
+    digest = get_owner_digest()
+    return Outbox(
+        get_lead_store().path,
+        {
+            "prospect": deliver_prospect,
+            "owner": deliver_owner,
+            "flagged": deliver_flagged,
+        },
+        workers=workers,
+        lease_seconds=lease,
+        max_attempts=max_attempts,
+        on_outcome=record_outbox_outcome,
+        batches={"owner": digest} if digest else None,
+        send_deadline=send_deadline,
+    ).start()
+
+
+@st.cache_resource
+def get_lead_store():
+    """Shared SQLite store for consultation submissions"""
+    try:
+        path = st.secrets.get("LEADS_DB_PATH", "leads.db")
+    except FileNotFoundError:
+        path = "leads.db"
+    return LeadStore(path)
 
-        logger.info(f"Emails sent successfully for {first_name} {last_name}")
-        return True
 
+def record_funnel(*events):
+    """Count funnel events for the owner dashboard"""
+    try:
+        get_lead_store().record_events(*events)
     except Exception as e:
-        logger.error(f"Failed to send emails: {str(e)}")
-        return False
+        # The dashboard is never worth failing a submission over
+        logger.error("Failed to record funnel events: %s", e)
 
 
-def main():
-    load_css()
+@st.cache_resource
+def get_idempotency_guard():
+    """Shared guard that catches repeated submissions"""
+    return IdempotencyGuard(window=600, store=get_lead_store())
+
+
+@st.cache_resource
+def get_rate_limiter():
+    """Shared token buckets protecting the SMTP sending quota"""
+    limits = {}
+    try:
+        enabled = st.secrets.get("RATE_LIMIT_ENABLED", True)
+        for scope, burst, per_minute in (
+            ("GLOBAL", 30, 30),
+            ("SESSION", 3, 1),
+            ("EMAIL", 2, 0.1),
+        ):
+            limits[f"{scope.lower()}_limit"] = (
+                float(st.secrets.get(f"RATE_LIMIT_{scope}_BURST", burst)),
+                float(st.secrets.get(f"RATE_LIMIT_{scope}_PER_MINUTE", per_minute))
+                / 60,
+            )
+    except FileNotFoundError:
+        enabled = True
+    # Load tests switch throttling off to measure the raw submit path
+    return RateLimiter(**limits) if enabled else None
 
-    # Hero Section
-    st.markdown(
-        """
-    <div class="hero-section">
-        <h1 class="hero-title">
-            Excelerate Analytics, LLC<br><br>
-            <span class="hero-highlight">Turn Your Data Into Your Biggest Competitive Advantage</span>
-        </h1>
-        <p class="hero-subtext">🚀 Get A FREE Strategy Session Worth $500</p>
-        <p class="hero-description">
-            Discover exactly how to unlock hidden profits in your data and make decisions that drive real growth. 
-            No fluff, just actionable insights tailored to your business.
-        </p>
-    </div>
-    """,
-        unsafe_allow_html=True,
+
+def report_rate_limits(limiter):
+    """Export the limiter's counters for Prometheus"""
+    stats = limiter.stats()
+    metrics.set_gauge("rate_limit_checks", stats["accepted"], outcome="accepted")
+    metrics.set_gauge("rate_limit_checks", stats["delayed"], outcome="delayed")
+    for scope, count in stats["throttled"].items():
+        metrics.set_gauge("rate_limit_checks", count, outcome=f"throttled_{scope}")
+
+
+@st.cache_resource
+def get_deliverability_checker():
+    """Shared MX checker for prospect emails, or None when it is switched off"""
+    try:
+        if not st.secrets.get("DELIVERABILITY_CHECK", False):
+            return None
+        timeout = float(st.secrets.get("DELIVERABILITY_TIMEOUT_SECONDS", 1.0))
+        nameservers = st.secrets.get("DELIVERABILITY_NAMESERVERS")
+    except FileNotFoundError:
+        return None
+    # Imported here so dnspython only loads when the check is on
+    from deliverability import DeliverabilityChecker, make_resolver
+
+    return DeliverabilityChecker(
+        resolver=make_resolver(nameservers, timeout=timeout), timeout=timeout
     )
 
-    # Value Propositions
-    col1, col2, col3 = st.columns(3)
 
-    with col1:
-        st.markdown(
-            """
-        <div class="value-prop">
-            <h3>📈 Increase Revenue by 15-30%</h3>
-            <p>Identify profit opportunities hiding in your data</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+def check_deliverability(email):
+    """Errors for an address whose domain can't receive mail"""
+    checker = get_deliverability_checker()
+    if checker is None:
+        return []
+    error = checker.check(email.strip())
+    return [error] if error else []
 
-    with col2:
-        st.markdown(
-            """
-        <div class="value-prop">
-            <h3>💰 Cut Costs by 20-40%</h3>
-            <p>Eliminate waste and optimize operations</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with col3:
-        st.markdown(
-            """
-        <div class="value-prop">
-            <h3>🎯 Make Smarter Decisions</h3>
-            <p>Stop guessing, start knowing with data-driven insights</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    # Trust Section
-    st.markdown(
-        """
-    <div class="trust-section">
-        <h2>Trusted by Growing Businesses</h2>
-        <div class="trust-items">
-            <div class="trust-item">
-                <div class="trust-number">50+</div>
-                <div class="trust-label">Businesses Transformed</div>
-            </div>
-            <div class="trust-item">
-                <div class="trust-number">$2M+</div>
-                <div class="trust-label">In Client Savings Generated</div>
-            </div>
-            <div class="trust-item">
-                <div class="trust-number">100%</div>
-                <div class="trust-label">Client Satisfaction Rate</div>
-            </div>
-        </div>
-    </div>
-    """,
-        unsafe_allow_html=True,
+
+@st.cache_resource
+def get_spam_filter():
+    """Shared spam checks for the form, or None when SPAM_FILTER is off"""
+    try:
+        if not st.secrets.get("SPAM_FILTER", True):
+            return None
+        min_fill = float(st.secrets.get("SPAM_MIN_FILL_SECONDS", 3))
+        repeat_limit = int(st.secrets.get("SPAM_REPEAT_LIMIT", 3))
+    except FileNotFoundError:
+        min_fill, repeat_limit = 3, 3
+    return SpamFilter(min_fill_seconds=min_fill, repeat_limit=repeat_limit)
+
+
+def check_spam(lead, honeypot, fill_seconds):
+    """(why the submission is rejected, why it is flagged), each or None"""
+    spam_filter = get_spam_filter()
+    if spam_filter is None:
+        return None, None
+    try:
+        flag = spam_filter.check(lead, honeypot=honeypot, fill_seconds=fill_seconds)
+    except SpamRejected as e:
+        logger.info("Consultation request rejected as spam (%s)", e.reason)
+        return e.reason, None
+    return None, flag
+
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+
+def process_submission(lead, session_id=None, spam_reason=None):
+    """Store a validated lead and queue its emails
+
+    A lead the spam filter flagged is stored with its spam_reason, and the
+    owner is sent it marked as possible spam. Past the global rate limit the lead is
+    still stored and its emails are held until the limit allows them.
+    Raises RateLimitExceeded, storing nothing, when the visitor's session or
+    email address is throttled, and whatever the lead store raised if the
+    lead could not be stored.
+    """
+    key = submission_key(
+        lead["email"], lead["phone"], lead["company"], lead["challenge"]
     )
+    guard = get_idempotency_guard()
+    previous = guard.claim(key)
+    if previous is not None:
+        # Double-click or resubmit: answer as before without touching SMTP
+        logger.info("Duplicate consultation request ignored for %s", lead["email"])
+        record_funnel("duplicate")
+        return
 
-    # Consultation Form Section
-    st.markdown("## Book Your Free Analytics Strategy Session")
-    st.markdown("** Normally $500 - Yours FREE for a Limited Time")
-    st.markdown(
-        "In just 45 minutes, we'll analyze your current data situation and show you exactly how to unlock hidden profits in your business."
+    try:
+        delay = 0
+        limiter = get_rate_limiter()
+        if limiter is not None:
+            try:
+                delay = limiter.check(session_id=session_id, email=lead["email"])
+            finally:
+                report_rate_limits(limiter)
+        if delay:
+            logger.info("Consultation emails held %.0fs by the rate limit", delay)
+            record_funnel("mail_delayed")
+
+        # The lead and its emails commit together; outbox workers in any
+        # process send them, retrying failures, so the visitor never
+        # waits on SMTP and a failed send is never lost
+        get_lead_store().add(
+            lead,
+            dedupe_key=key,
+            messages=outbox_messages(lead, spam_reason),
+            spam_reason=spam_reason,
+            delay=delay,
+        ).result()
+        if spam_reason:
+            logger.info("Consultation request stored flagged as spam (%s)", spam_reason)
+            record_funnel(f"spam_flagged:{spam_reason}")
+        get_outbox().wake()
+    except Exception:
+        # Forget the claim so a throttled or failed submission can be retried
+        guard.release(key)
+        raise
+
+    guard.complete(key, True)
+
+
+@st.cache_resource
+def setup_logging():
+    """JSON logs (or LOG_FORMAT = "text") written by a background thread"""
+    try:
+        level = st.secrets.get("LOG_LEVEL", "INFO")
+        log_format = st.secrets.get("LOG_FORMAT", "json")
+    except FileNotFoundError:
+        level, log_format = "INFO", "json"
+    configure_logging(level, json_format=log_format == "json")
+
+
+@st.cache_resource
+def setup_metrics():
+    """Turn on hot-path instrumentation when METRICS_ENABLED is set"""
+    try:
+        if st.secrets.get("METRICS_ENABLED", False):
+            metrics.configure(
+                interval=float(st.secrets.get("METRICS_INTERVAL_SECONDS", 60)),
+                textfile=st.secrets.get("METRICS_TEXTFILE"),
+            )
+    except FileNotFoundError:
+        pass
+
+
+@st.cache_resource
+def get_session_reaper():
+    """Background sweep closing idle sessions and reporting session gauges"""
+    try:
+        idle = float(st.secrets.get("SESSION_IDLE_SECONDS", 1800))
+        cap = int(st.secrets.get("SESSION_MAX", 0))
+        interval = float(st.secrets.get("SESSION_SWEEP_SECONDS", 60))
+    except FileNotFoundError:
+        idle, cap, interval = 1800, 0, 60
+    return session_monitor.SessionReaper(idle, cap, interval).start()
+
+
+def _warm_mail_stack():
+    import smtp_pool
+    import email_templates  # noqa: F401
+
+    smtp_pool.get_ssl_context()
+    # First use imports email_validator and its IDNA tables
+    normalize_email("warm-up@example.com")
+
+
+def _warm_workers():
+    get_idempotency_guard()
+    get_rate_limiter()
+    get_spam_filter()
+
+
+def _warm_smtp_connection():
+    # Outbox workers send a lead's prospect and owner emails concurrently
+    _pool_for(mail_settings()).warm(count=2)
+
+
+@st.cache_resource
+def start_warm_up():
+    """Prepare the submit path in the background once the first page is out
+
+    Either way the outbox workers start, so emails queued by earlier or
+    other processes go out without waiting for a submission here. STARTUP_MODE
+    "warm" (the default) also imports the mail stack and logs in to SMTP
+    ahead of the first submission; "lazy" leaves that to the first send.
+    """
+    try:
+        mode = st.secrets.get("STARTUP_MODE", "warm")
+    except FileNotFoundError:
+        mode = "warm"
+    if mode != "warm":
+        startup.warm_up([("outbox", get_outbox)], then=startup.report)
+        return
+    startup.warm_up(
+        [
+            ("mail_stack", _warm_mail_stack),
+            ("lead_store", get_lead_store),
+            ("outbox", get_outbox),
+            ("workers", _warm_workers),
+            ("deliverability", get_deliverability_checker),
+            ("smtp_connection", _warm_smtp_connection),
+        ],
+        then=startup.report,
     )
 
+
+def main():
+    setup_logging()
+    setup_metrics()
+    get_session_reaper()
+    session_monitor.touch()
+    # Load and validate mail settings at startup so problems surface early
+    get_mail_config_watcher()
+    with metrics.timed("rerun_seconds", scope="page"):
+        render_page()
+    startup.mark("first_render")
+    start_warm_up()
+
+
+def render_page():
+    load_css()
+
+    if st.query_params.get("view") == "form":
+        # Just the form, for the static site (static_site.py) to embed or link
+        consultation_form()
+        st.markdown(PRIVACY_NOTE_HTML, unsafe_allow_html=True)
+        return
+
+    # Hero, value propositions and trust section (pre-rendered at import)
+    with metrics.timed("render_seconds", section="landing"):
+        st.markdown(LANDING_HTML, unsafe_allow_html=True)
+
+    # Consultation Form Section
+    st.markdown(SESSION_INTRO_MD)
+
     # Two columns for benefits and form
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        st.markdown("### What You'll Get In Your Session:")
+        st.markdown(BENEFITS_MD, unsafe_allow_html=True)
 
-        # Create benefits using Streamlit components instead of HTML
-
-        # Benefits as individual items
-        benefits = [
-            "✅ A complete audit of your current data and analytics setup",
-            "✅ Custom roadmap to increase revenue and reduce costs",
-            "✅ Identification of your biggest profit opportunities",
-            "✅ Actionable steps you can implement immediately",
-            "✅ No-obligation consultation - zero pressure",
-        ]
+    with col2:
+        consultation_form()
+        st.markdown(PRIVACY_NOTE_HTML, unsafe_allow_html=True)
 
-        for benefit in benefits:
-            st.markdown(
-                f"""
-            <div style="display: flex; align-items: flex-start; margin-bottom: 1rem; padding: 1rem; background: rgba(59, 130, 246, 0.1); border: 1px solid rgba(148, 163, 184, 0.2); border-radius: 12px; color: #f8fafc;">
-                {benefit}
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
+    # Footer
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
-        st.markdown("</div>", unsafe_allow_html=True)
 
-    with col2:
+@st.fragment
+def consultation_form():
+    """The form and its messages, rerun on submit without the rest of the page"""
+    # Fragment reruns skip main(), so activity is recorded here as well
+    session_monitor.touch()
+    # When the empty form was shown, for the spam filter's minimum fill time
+    form_shown_at = st.session_state.setdefault("form_shown_at", time.time())
+    with metrics.timed("rerun_seconds", scope="form"):
         with st.form("consultation_form", clear_on_submit=True):
             st.markdown("### Reserve Your Free Session")
 
@@ -579,7 +574,7 @@ def main():
 
             revenue = st.selectbox(
                 "Annual Revenue Range",
-                ["", "Under $500K", "$500K - $1M", "$1M - $5M", "$5M - $10M", "$10M+"],
+                REVENUE_RANGES,
                 key="revenue",
             )
 
@@ -590,99 +585,98 @@ def main():
                 key="challenge",
             )
 
+            # Honeypot: moved off screen by the stylesheet, so only bots fill it
+            honeypot = st.text_input(
+                "Leave this field empty",
+                key="website",
+                label_visibility="collapsed",
+                autocomplete="off",
+            )
+
             # Submit button
             submitted = st.form_submit_button("🚀 Book My Free Session Now")
 
             if submitted:
-                # Validation
-                errors = []
-
-                if not first_name.strip():
-                    errors.append("First name is required")
-                if not last_name.strip():
-                    errors.append("Last name is required")
-                if not email.strip():
-                    errors.append("Email is required")
-                elif not validate_email(email):
-                    errors.append("Please enter a valid email address")
-                if not phone.strip():
-                    errors.append("Phone number is required")
-                elif not validate_phone(phone):
-                    errors.append("Please enter a valid phone number")
-                if not company.strip():
-                    errors.append("Company name is required")
-                if not challenge.strip():
-                    errors.append("Please describe your biggest data challenge")
-
-                if errors:
-                    for error in errors:
-                        st.error(error)
-                else:
-                    # Process successful form submission
-                    try:
-                        # Log the submission
-                        logger.info(
-                            f"New consultation request from {first_name} {last_name} ({email}) at {company}"
+                # Every log line for this submission shares one ID, which
+                # also travels with its outbox emails
+                with correlation_scope():
+                    lead = {
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "email": email,
+                        "phone": phone,
+                        "company": company,
+                        "revenue": revenue,
+                        "challenge": challenge,
+                    }
+
+                    # Spam is turned away before validation, the DNS lookup
+                    # and anything being stored or sent; a lead that only
+                    # reads like spam is stored flagged instead
+                    spam, spam_flag = check_spam(
+                        lead, honeypot, time.time() - form_shown_at
+                    )
+                    st.session_state["form_shown_at"] = time.time()
+
+                    # Validation
+                    errors = []
+                    if spam is None:
+                        with metrics.timed("validation_seconds"):
+                            errors = validate_submission(lead)
+                        if not errors:
+                            errors = check_deliverability(email)
+                    if spam is not None:
+                        record_funnel("submit_attempt", f"spam_blocked:{spam}")
+                    elif errors:
+                        record_funnel(
+                            "submit_attempt",
+                            "validation_failed",
+                            *(f"validation_error:{error}" for error in errors),
                         )
+                    else:
+                        record_funnel("submit_attempt")
 
-                        # Send emails
-                        email_sent = send_consultation_email(
-                            first_name,
-                            last_name,
-                            email,
-                            phone,
-                            company,
-                            revenue,
-                            challenge,
+                    if spam is not None:
+                        st.error(
+                            "We couldn't accept this request. Please contact us directly at michael@excelerateanalytics.com or (702) 445-2266."
                         )
+                    elif errors:
+                        for error in errors:
+                            st.error(error)
+                    else:
+                        # Process successful form submission
+                        try:
+                            # Log the submission
+                            logger.info(
+                                "New consultation request from %s at %s", email, company
+                            )
+
+                            lead["email"] = normalize_email(email)
+                            with metrics.timed("submit_seconds"):
+                                process_submission(
+                                    lead,
+                                    session_id=current_session_id(),
+                                    spam_reason=spam_flag,
+                                )
 
-                        if email_sent:
                             st.success(
                                 f"🎉 Thank you {first_name}! We've received your consultation request and will contact you within 24 hours to schedule your free strategy session."
                             )
-                        else:
-                            st.success(
-                                f"🎉 Thank you {first_name}! We've received your consultation request. If you don't hear from us within 24 hours, please contact us directly at michael@excelerateanalytics.com or (702) 445-2266."
-                            )
-
-                        # Optional: Save to a database or CSV file here
-
-                    except Exception as e:
-                        logger.error(f"Error processing form: {str(e)}")
-                        st.error(
-                            "There was an error processing your request. Please try again or contact us directly at michael@excelerateanalytics.com"
-                        )
 
-        st.markdown(
-            """
-        <p style="text-align: center; color: #94a3b8; font-size: 0.9rem; margin-top: 1rem;">
-            🔒 Your information is secure and will never be shared. We'll contact you within 24 hours to schedule your session.
-        </p>
-        """,
-            unsafe_allow_html=True,
-        )
+                        except RateLimitExceeded as e:
+                            logger.warning(
+                                "Consultation request throttled: %s", e.scope
+                            )
+                            record_funnel("throttled")
+                            st.error(
+                                "We've received several requests in a short time. Please wait a few minutes and try again, or contact us directly at michael@excelerateanalytics.com"
+                            )
 
-    # Footer
-    st.markdown(
-        """
-    <div class="footer">
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 2rem; margin-bottom: 2rem;">
-            <div>
-                <h4 style="color: #fbbf24; margin-bottom: 1rem;">Excelerate Analytics, LLC</h4>
-                <p>Transforming data into competitive advantages for ambitious businesses.</p>
-            </div>
-            <div>
-                <h4 style="color: #fbbf24; margin-bottom: 1rem;">Contact Info</h4>
-                <p>michael@excelerateanalytics.com<br>
-                (702) 445-2266<br>
-                Las Vegas, NV</p>
-            </div>
-        </div>
-        <p>© 2025 Excelerate Analytics, LLC. All rights reserved.</p>
-    </div>
-    """,
-        unsafe_allow_html=True,
-    )
+                        except Exception as e:
+                            logger.error("Error processing form: %s", e)
+                            st.error(
+                                "There was an error processing your request. Please try again or contact us directly at michael@excelerateanalytics.com"
+                            )
 
 
 if __name__ == "__main__":
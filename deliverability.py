@@ -0,0 +1,169 @@
+"""Check that a prospect's email domain accepts mail, cached per domain"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import dns.resolver
+from email_validator import EmailNotValidError, EmailUndeliverableError
+from email_validator import validate_email as parse_email
+from email_validator.deliverability import validate_email_deliverability
+
+import metrics
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+UNDELIVERABLE_EMAIL = (
+    "We couldn't find a mail server for {domain}. Please check your email address"
+)
+
+# Cached outcomes; an error message string means the domain is undeliverable
+DELIVERABLE = True
+UNKNOWN = None
+
+# DNS answers that show a domain takes no mail. email_validator also turns
+# any other error into EmailUndeliverableError, raised from that error;
+# its own verdicts (null MX, SPF reject-all) have no cause.
+NO_MAIL_ANSWERS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+
+def make_resolver(nameservers=None, port=53, timeout=1.0):
+    """A private dnspython resolver, leaving the process default untouched
+
+    nameservers is a list of addresses, or a string of one or more
+    separated by commas or spaces.
+    """
+    if isinstance(nameservers, str):
+        nameservers = nameservers.replace(",", " ").split()
+    if nameservers:
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = list(nameservers)
+        resolver.port = port
+    else:
+        resolver = dns.resolver.Resolver()
+    resolver.lifetime = timeout
+    resolver.cache = dns.resolver.LRUCache()
+    return resolver
+
+
+class DeliverabilityChecker:
+    """MX lookups for email domains under a hard time limit
+
+    Results are cached per domain (TTL + LRU), so popular domains are
+    resolved once. Concurrent checks for the same domain share a single
+    lookup. A lookup that overruns the timeout is treated as deliverable:
+    the visitor is not held up, and the lookup keeps running in the
+    background to fill the cache for the next submission.
+    """
+
+    def __init__(
+        self,
+        resolver=None,
+        timeout=1.0,
+        ttl=3600,
+        unknown_ttl=60,
+        max_domains=5000,
+        max_workers=4,
+        clock=time.monotonic,
+    ):
+        # Anything with dnspython's resolve(qname, rdtype) works here
+        self.resolver = resolver or make_resolver(timeout=timeout)
+        self.timeout = timeout
+        self.ttl = ttl
+        # Timeouts and unreachable nameservers are retried sooner
+        self.unknown_ttl = unknown_ttl
+        self._cache = TTLCache(max_size=max_domains, ttl=ttl, clock=clock)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="dns")
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.lookups = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def check(self, email):
+        """Return an error message if the address's domain can't take mail"""
+        started = time.perf_counter()
+        try:
+            parsed = parse_email(email, check_deliverability=False)
+        except EmailNotValidError:
+            # The form's own rules already accepted it; leave it to SMTP
+            return None
+        domain, domain_i18n = parsed.ascii_domain, parsed.domain
+
+        result = self._cache.get(domain, _MISSING)
+        source = "cache"
+        if result is _MISSING:
+            source = "dns"
+            future = self._lookup(domain, domain_i18n)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                self.timeouts += 1
+                source = "timeout"
+                logger.warning("Deliverability check for %s timed out", domain)
+                result = UNKNOWN
+        else:
+            self.hits += 1
+        metrics.observe(
+            "deliverability_seconds", time.perf_counter() - started, source=source
+        )
+
+        if isinstance(result, str):
+            self.rejected += 1
+            return result
+        return None
+
+    def _lookup(self, domain, domain_i18n):
+        with self._lock:
+            future = self._inflight.get(domain)
+            if future is None:
+                self.lookups += 1
+                future = self._executor.submit(self._resolve, domain, domain_i18n)
+                self._inflight[domain] = future
+        return future
+
+    def _resolve(self, domain, domain_i18n):
+        try:
+            try:
+                info = validate_email_deliverability(
+                    domain, domain_i18n, dns_resolver=self.resolver
+                )
+            except EmailUndeliverableError as e:
+                if e.__cause__ is None or isinstance(e.__cause__, NO_MAIL_ANSWERS):
+                    logger.info("Undeliverable email domain %s: %s", domain, e)
+                    result = UNDELIVERABLE_EMAIL.format(domain=domain_i18n)
+                    ttl = self.ttl
+                else:
+                    # The resolver failed; that says nothing about the domain
+                    logger.warning(
+                        "Deliverability check for %s failed: %r", domain, e.__cause__
+                    )
+                    result, ttl = UNKNOWN, self.unknown_ttl
+            else:
+                if "unknown-deliverability" in info:
+                    result, ttl = UNKNOWN, self.unknown_ttl
+                else:
+                    result, ttl = DELIVERABLE, self.ttl
+            # Cache before leaving _inflight so no check slips between the two
+            self._cache.set(domain, result, ttl=ttl)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(domain, None)
+
+    def stats(self):
+        """Cache hits, DNS lookups, timeouts and rejections so far"""
+        return {
+            "cached_domains": len(self._cache),
+            "hits": self.hits,
+            "lookups": self.lookups,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+        }
+
+
+_MISSING = object()
@@ -0,0 +1,263 @@
+"""Consultation email templates, parsed once and rendered field by field"""
+
+import base64
+import random
+import string
+from email.header import Header
+
+OWNER_SUBJECT = "🚀 New Analytics Consultation Request - {company}"
+OWNER_BODY = """
+NEW CONSULTATION REQUEST RECEIVED!
+
+Contact Information:
+━━━━━━━━━━━━━━━━━━━━━━━━
+👤 Name: {first_name} {last_name}
+📧 Email: {email}
+📞 Phone: {phone}
+🏢 Company: {company}
+💰 Revenue Range: {revenue}
+
+Challenge Description:
+━━━━━━━━━━━━━━━━━━━━━━━━
+{challenge}
+
+━━━━━━━━━━━━━━━━━━━━━━━━
+⏰ Submitted: {submitted}
+
+Next Steps:
+1. Review their challenge description
+2. Contact them within 24 hours
+3. Schedule their free strategy session
+
+Reply directly to this email to contact {first_name}.
+        """
+
+FLAGGED_SUBJECT = "⚠️ Possible Spam: Analytics Consultation Request - {company}"
+FLAGGED_NOTE = """
+The spam filter flagged this request ({spam_reason}). It is stored, but
+the prospect was not sent a confirmation. Check it before replying.
+"""
+
+DIGEST_SUBJECT = "🚀 {count} New Analytics Consultation Requests"
+DIGEST_HEADER = """
+{count} NEW CONSULTATION REQUESTS RECEIVED
+{first_submitted} - {last_submitted}
+"""
+DIGEST_ENTRY = """
+━━━━━━━━━━━━━━━━━━━━━━━━
+{number}. {first_name} {last_name} - {company}
+📧 Email: {email}
+📞 Phone: {phone}
+💰 Revenue Range: {revenue}
+⏰ Submitted: {submitted}
+
+{challenge}
+"""
+DIGEST_FOOTER = """
+━━━━━━━━━━━━━━━━━━━━━━━━
+Contact each prospect within 24 hours to schedule their free strategy session.
+"""
+
+PROSPECT_SUBJECT = "Your Free Analytics Consultation Request - Excelerate Analytics"
+PROSPECT_BODY = """Hi {first_name},
+
+Thank you for requesting a free analytics strategy session with Excelerate Analytics!
+
+We've received your consultation request and will contact you within 24 hours to schedule your complimentary 45-minute session.
+
+During your session, we'll:
+✅ Audit your current data and analytics setup
+✅ Identify your biggest profit opportunities
+✅ Create a custom roadmap to increase revenue and reduce costs
+✅ Provide actionable steps you can implement immediately
+
+What to Expect Next:
+━━━━━━━━━━━━━━━━━━━━━━━━
+1. We'll call you within 24 hours to schedule your session
+2. Your free consultation will be scheduled at your convenience
+3. We'll send you a calendar invite with all the details
+
+Questions? Simply reply to this email or call us at (702) 445-2266.
+
+Looking forward to helping you transform your data into your biggest competitive advantage!
+
+Best regards,
+Michael Bacon
+Excelerate Analytics, LLC
+michael@excelerateanalytics.com
+(702) 445-2266
+
+P.S. This consultation is normally $500 but it's completely free with no obligation. We're confident you'll find immediate value in our session!
+        """
+
+# Base64 output never contains a run of '=' this long, so one boundary
+# chosen at import can be shared by every message
+_BOUNDARY = "=" * 15 + "%019d" % random.randrange(10**18) + "=="
+
+_PART_HEADER = (
+    f"--{_BOUNDARY}\n"
+    'Content-Type: text/plain; charset="utf-8"\n'
+    "MIME-Version: 1.0\n"
+    "Content-Transfer-Encoding: base64\n"
+    "\n"
+)
+_CLOSING = f"--{_BOUNDARY}--\n"
+_ENVELOPE = (
+    f'Content-Type: multipart/mixed; boundary="{_BOUNDARY}"\n' "MIME-Version: 1.0\n"
+)
+
+
+def _compile(template):
+    """Split a str.format template into (literal, field) pairs once"""
+    return [
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(template)
+    ]
+
+
+def _fill(parts, fields):
+    out = []
+    for literal, field in parts:
+        out.append(literal)
+        if field is not None:
+            out.append(str(fields[field]))
+    return "".join(out)
+
+
+def _format_time(submitted):
+    return submitted.strftime("%B %d, %Y at %I:%M %p")
+
+
+def _header_value(value):
+    # Header values must stay on one line
+    return " ".join(str(value).splitlines())
+
+
+def ascii_address(address):
+    """The address with an internationalized domain in its IDNA (xn--) form
+
+    A non-ASCII local part can't be made ASCII and is kept as it is.
+    """
+    local, at, domain = address.strip().rpartition("@")
+    if not at or domain.isascii():
+        return address.strip()
+    try:
+        return f"{local}@{domain.encode('idna').decode('ascii')}"
+    except UnicodeError:
+        return address.strip()
+
+
+def _encode_address(value):
+    value = _header_value(value)
+    address = ascii_address(value)
+    if address.isascii():
+        return address
+    # SMTP without SMTPUTF8 has no other way to carry a non-ASCII local part
+    return Header(value, "utf-8").encode()
+
+
+def _encode_header(value):
+    if value.isascii() and len(value) < 900:
+        return value
+    return Header(value, "utf-8").encode()
+
+
+class MessageTemplate:
+    """Plain-text email whose constant parts are prepared ahead of time"""
+
+    def __init__(self, subject, body):
+        self._subject = _compile(subject)
+        self._body = _compile(body)
+        # A subject without fields is encoded once here instead of per message
+        self._fixed_subject = None
+        if all(field is None for _, field in self._subject):
+            self._fixed_subject = _encode_header(subject)
+        # Otherwise a non-ASCII literal prefix (the emoji) is encoded once and
+        # an ASCII remainder is appended as plain text after the space
+        self._subject_prefix = None
+        prefix = self._subject[0][0]
+        separator = prefix[len(prefix.rstrip()) :]
+        if not prefix.isascii() and separator:
+            self._subject_prefix = Header(prefix.rstrip(), "utf-8").encode()
+            self._subject_prefix += separator
+            self._subject_rest = [("", self._subject[0][1])] + self._subject[1:]
+
+    def _subject_for(self, fields):
+        if self._fixed_subject:
+            return self._fixed_subject
+        if self._subject_prefix:
+            rest = _header_value(_fill(self._subject_rest, fields))
+            if rest.isascii() and len(rest) < 900:
+                return self._subject_prefix + rest
+        return _encode_header(_header_value(_fill(self._subject, fields)))
+
+    def render(self, sender, recipient, fields, reply_to=None):
+        """Complete MIME message as a string, ready for sendmail()"""
+        headers = [
+            _ENVELOPE,
+            f"From: {_encode_address(sender)}\n",
+            f"To: {_encode_address(recipient)}\n",
+            f"Subject: {self._subject_for(fields)}\n",
+        ]
+        if reply_to:
+            headers.append(f"Reply-To: {_encode_address(reply_to)}\n")
+        body = _fill(self._body, fields).encode("utf-8")
+        return "".join(
+            headers
+            + ["\n", _PART_HEADER, base64.encodebytes(body).decode("ascii"), _CLOSING]
+        )
+
+
+OWNER_MESSAGE = MessageTemplate(OWNER_SUBJECT, OWNER_BODY)
+FLAGGED_MESSAGE = MessageTemplate(FLAGGED_SUBJECT, FLAGGED_NOTE + OWNER_BODY)
+DIGEST_MESSAGE = MessageTemplate(DIGEST_SUBJECT, "{header}{entries}{footer}")
+_DIGEST_ENTRY = _compile(DIGEST_ENTRY)
+_DIGEST_HEADER = _compile(DIGEST_HEADER)
+PROSPECT_MESSAGE = MessageTemplate(PROSPECT_SUBJECT, PROSPECT_BODY)
+
+
+def _owner_fields(lead, submitted):
+    fields = dict(lead, revenue=lead.get("revenue") or "Not specified")
+    fields["submitted"] = _format_time(submitted)
+    return fields
+
+
+def build_owner_message(sender, recipient, lead, submitted, spam_reason=None):
+    """Notification to the business owner about a new lead
+
+    A lead the spam filter flagged is marked as possible spam.
+    """
+    fields = _owner_fields(lead, submitted)
+    template = OWNER_MESSAGE
+    if spam_reason:
+        fields["spam_reason"] = spam_reason
+        template = FLAGGED_MESSAGE
+    return template.render(sender, recipient, fields, reply_to=lead["email"])
+
+
+def build_owner_digest(sender, recipient, batch):
+    """One summary notification for a list of (lead, submitted) pairs"""
+    entries = []
+    for number, (lead, submitted) in enumerate(batch, start=1):
+        fields = _owner_fields(lead, submitted)
+        fields["number"] = number
+        entries.append(_fill(_DIGEST_ENTRY, fields))
+    header = _fill(
+        _DIGEST_HEADER,
+        {
+            "count": len(batch),
+            "first_submitted": _format_time(batch[0][1]),
+            "last_submitted": _format_time(batch[-1][1]),
+        },
+    )
+    fields = {
+        "count": len(batch),
+        "header": header,
+        "entries": "".join(entries),
+        "footer": DIGEST_FOOTER,
+    }
+    return DIGEST_MESSAGE.render(sender, recipient, fields)
+
+
+def build_prospect_message(sender, lead):
+    """Confirmation sent to the prospect"""
+    return PROSPECT_MESSAGE.render(sender, lead["email"], lead)
@@ -0,0 +1,69 @@
+import hashlib
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from ttl_cache import TTLCache
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def _normalize_text(value):
+    return _WHITESPACE.sub(" ", value).strip().casefold()
+
+
+def submission_key(email, phone, company, challenge):
+    """Stable hash identifying a submission regardless of casing and spacing"""
+    parts = (
+        email.strip().lower(),
+        _NON_DIGITS.sub("", phone),
+        _normalize_text(company),
+        _normalize_text(challenge),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """Recognise repeated submissions within a time window
+
+    Results are kept in a bounded TTL cache; when a lead store is given,
+    cache misses fall back to it so duplicates are also caught across
+    processes and restarts.
+    """
+
+    PENDING = "pending"
+
+    def __init__(self, window=600, max_entries=10000, store=None, clock=time.monotonic):
+        self.window = window
+        self.store = store
+        self._cache = TTLCache(max_size=max_entries, ttl=window, clock=clock)
+        self.duplicates = 0
+
+    def claim(self, key):
+        """Return None for a new submission, else the result recorded for it"""
+        claim = _Claim()
+        previous = self._cache.setdefault(key, claim)
+        if previous is not claim:
+            self.duplicates += 1
+            return self.PENDING if isinstance(previous, _Claim) else previous
+        if self.store is not None:
+            since = datetime.now(timezone.utc) - timedelta(seconds=self.window)
+            since = since.isoformat(timespec="seconds")
+            if self.store.has_recent_submission(key, since):
+                self._cache.set(key, True)
+                self.duplicates += 1
+                return True
+        return None
+
+    def complete(self, key, result):
+        """Record the outcome to replay for later duplicates"""
+        self._cache.set(key, result)
+
+    def release(self, key):
+        """Forget a claim whose processing failed so it can be retried"""
+        self._cache.pop(key)
+
+
+class _Claim:
+    """Placeholder for a submission that is still being processed"""
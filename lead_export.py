@@ -0,0 +1,110 @@
+"""Stream stored leads as CSV or JSON Lines
+
+Usable as a command for the owner:
+
+    python -m lead_export --db leads.db --format csv --since 2025-01-01 \\
+        --revenue "\\$1M - \\$5M" --revenue "\\$5M - \\$10M" > leads.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+from lead_store import LEAD_FIELDS, connect, iter_leads
+
+EXPORT_FIELDS = ("id", "submitted_at") + LEAD_FIELDS + ("spam_reason",)
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+# Spreadsheet apps run cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(leads, chunk_rows=500):
+    """CSV text for leads, yielded a few hundred rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    rows = 0
+    for lead in leads:
+        writer.writerow([_safe_cell(lead.get(field)) for field in EXPORT_FIELDS])
+        rows += 1
+        if rows % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_chunks(leads, chunk_rows=500):
+    """One JSON object per lead, yielded a few hundred lines at a time"""
+    lines = []
+    for lead in leads:
+        record = {field: lead.get(field) for field in EXPORT_FIELDS}
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        if len(lines) == chunk_rows:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines)
+
+
+def export_chunks(leads, format="csv"):
+    """Serialize an iterable of leads in the given format"""
+    if format == "csv":
+        return csv_chunks(leads)
+    if format == "jsonl":
+        return jsonl_chunks(leads)
+    raise ValueError(f"Unknown export format: {format!r}")
+
+
+def date_range(since=None, until=None):
+    """[start, end) bounds on submitted_at for inclusive dates"""
+    start = since.isoformat() if since else None
+    end = (until + timedelta(days=1)).isoformat() if until else None
+    return start, end
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="leads.db", help="lead store path")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument(
+        "--since", type=date.fromisoformat, help="first day (UTC), YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--until", type=date.fromisoformat, help="last day (UTC), YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--revenue",
+        action="append",
+        help='revenue range to include, repeatable; "" for none given',
+    )
+    parser.add_argument("--output", "-o", help="file to write instead of stdout")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        parser.error(f"no lead store at {args.db}")
+
+    conn = connect(args.db)
+    start, end = date_range(args.since, args.until)
+    leads = iter_leads(conn, start, end, args.revenue)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        for chunk in export_chunks(leads, args.format):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
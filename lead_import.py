@@ -0,0 +1,248 @@
+"""Import leads from CSV or JSON Lines, as if each had come through the form
+
+Records get the form's validation, duplicates of stored leads are skipped,
+and each new lead is stored with its confirmation email queued in the
+outbox for the app's outbox workers to send:
+
+    python -m lead_import partners.csv --db leads.db
+    python -m lead_import signups.jsonl --no-mail --errors rejected.jsonl
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from idempotency import submission_key
+from lead_export import FORMATS, FORMULA_PREFIXES
+from lead_store import LEAD_FIELDS, LeadStore
+from page_sections import REVENUE_RANGES
+from validation import normalize_email, validate_batch
+
+# Column names as they tend to appear in spreadsheets, after _field_name()
+FIELD_ALIASES = {
+    "firstname": "first_name",
+    "lastname": "last_name",
+    "business_email": "email",
+    "email_address": "email",
+    "phone_number": "phone",
+    "company_name": "company",
+    "annual_revenue_range": "revenue",
+    "annual_revenue": "revenue",
+    "biggest_data_challenge": "challenge",
+    "what_s_your_biggest_data_challenge": "challenge",
+}
+UNKNOWN_REVENUE = "Please choose one of the listed revenue ranges"
+NOT_A_RECORD = "Not a JSON object"
+
+_NON_WORD = re.compile(r"\W+")
+
+
+def _field_name(column):
+    name = _NON_WORD.sub("_", column.strip().lower()).strip("_")
+    return FIELD_ALIASES.get(name, name)
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    value = str(value).strip()
+    # Undo the quote lead_export puts before formula-like cells
+    if value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def read_records(stream, input_format):
+    """(line number, record) pairs, with None for a line that isn't a record"""
+    if input_format == "csv":
+        reader = csv.DictReader(stream)
+        reader.fieldnames = [_field_name(c) for c in reader.fieldnames or ()]
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        if isinstance(record, dict):
+            record = {_field_name(key): value for key, value in record.items()}
+        else:
+            record = None
+        yield number, record
+
+
+def prepare_chunk(chunk):
+    """Validate and normalize records, returning (accepted, rejected)
+
+    accepted holds (line, lead, dedupe key) and rejected (line, errors).
+    Runs in worker processes, so it only takes and returns plain data.
+    """
+    numbers, leads, rejected = [], [], []
+    for number, record in chunk:
+        if record is None:
+            rejected.append((number, [NOT_A_RECORD]))
+        else:
+            numbers.append(number)
+            leads.append({field: _cell(record.get(field)) for field in LEAD_FIELDS})
+
+    accepted = []
+    for number, lead, errors in zip(numbers, leads, validate_batch(leads)):
+        if lead["revenue"] not in REVENUE_RANGES:
+            errors.append(UNKNOWN_REVENUE)
+        if errors:
+            rejected.append((number, errors))
+            continue
+        lead["email"] = normalize_email(lead["email"])
+        key = submission_key(
+            lead["email"], lead["phone"], lead["company"], lead["challenge"]
+        )
+        accepted.append((number, lead, key))
+    return accepted, rejected
+
+
+def import_leads(
+    records, store, workers=1, chunk_size=500, mail=True, on_rejected=None
+):
+    """Store valid records and queue their emails, returning counts
+
+    Chunks are validated in `workers` processes while the lead store's
+    writer commits earlier ones; at most two chunks per worker are in
+    flight, so memory stays flat however large the input.
+    """
+    correlation_id = f"import-{uuid.uuid4().hex[:8]}"
+
+    def messages(lead):
+        if not mail:
+            return []
+        return [("prospect", {"lead": lead, "correlation_id": correlation_id})]
+
+    counts = {"records": 0, "imported": 0, "duplicates": 0, "rejected": 0}
+    records = iter(records)
+    chunks = iter(lambda: list(itertools.islice(records, chunk_size)), [])
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    prepared = deque()
+    writes = deque()
+    limit = max(2, 2 * workers)
+
+    def write_oldest():
+        ids = writes.popleft().result()
+        stored = sum(lead_id is not None for lead_id in ids)
+        counts["imported"] += stored
+        counts["duplicates"] += len(ids) - stored
+
+    def store_oldest():
+        accepted, rejected = prepared.popleft().result()
+        counts["rejected"] += len(rejected)
+        if on_rejected is not None:
+            for number, errors in rejected:
+                on_rejected(number, errors)
+        if accepted:
+            writes.append(
+                store.add_many(
+                    [(lead, key) for _, lead, key in accepted], messages=messages
+                )
+            )
+            if len(writes) >= limit:
+                write_oldest()
+
+    try:
+        for chunk in chunks:
+            counts["records"] += len(chunk)
+            if pool is None:
+                future = Future()
+                future.set_result(prepare_chunk(chunk))
+                prepared.append(future)
+            else:
+                prepared.append(pool.submit(prepare_chunk, chunk))
+            if len(prepared) >= limit:
+                store_oldest()
+        while prepared:
+            store_oldest()
+        while writes:
+            write_oldest()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("--db", default="leads.db", help="lead store path")
+    parser.add_argument(
+        "--format", choices=sorted(FORMATS), help="default: from the file name"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="validation processes",
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument(
+        "--no-mail", action="store_true", help="store leads without emailing them"
+    )
+    parser.add_argument("--errors", help="write rejected records here as JSONL")
+    args = parser.parse_args(argv)
+
+    input_format = args.format
+    if input_format is None:
+        input_format = "jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv"
+    source = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, newline="", encoding="utf-8-sig")
+    )
+    errors_out = open(args.errors, "w") if args.errors else None
+
+    def on_rejected(number, errors):
+        if errors_out is not None:
+            errors_out.write(json.dumps({"line": number, "errors": errors}) + "\n")
+        else:
+            print(f"line {number}: {'; '.join(errors)}", file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        counts = import_leads(
+            read_records(source, input_format),
+            LeadStore(args.db),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            mail=not args.no_mail,
+            on_rejected=on_rejected,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if errors_out is not None:
+            errors_out.close()
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{counts['records']} records in {elapsed:.2f}s "
+        f"({counts['records'] / elapsed:,.0f} records/s): "
+        f"{counts['imported']} imported, {counts['duplicates']} duplicates, "
+        f"{counts['rejected']} rejected",
+        file=sys.stderr,
+    )
+    if counts["imported"] and not args.no_mail:
+        print(
+            f"{counts['imported']} confirmation emails queued for the app's outbox",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
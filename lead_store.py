@@ -0,0 +1,432 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version)
+MIGRATIONS = [
+    """
+    CREATE TABLE leads (
+        id INTEGER PRIMARY KEY,
+        submitted_at TEXT NOT NULL,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        phone TEXT NOT NULL,
+        company TEXT NOT NULL,
+        revenue TEXT,
+        challenge TEXT NOT NULL
+    );
+    CREATE INDEX idx_leads_email ON leads (email);
+    CREATE INDEX idx_leads_company ON leads (company);
+    CREATE INDEX idx_leads_submitted_at ON leads (submitted_at);
+    """,
+    """
+    ALTER TABLE leads ADD COLUMN dedupe_key TEXT;
+    CREATE INDEX idx_leads_dedupe_key ON leads (dedupe_key, submitted_at);
+    """,
+    # Rollups for the owner dashboard, kept current on every write instead
+    # of recomputed by scanning leads. Days are the UTC date of submitted_at.
+    """
+    CREATE TABLE leads_daily (
+        day TEXT NOT NULL,
+        revenue TEXT NOT NULL,
+        submissions INTEGER NOT NULL,
+        PRIMARY KEY (day, revenue)
+    ) WITHOUT ROWID;
+    INSERT INTO leads_daily (day, revenue, submissions)
+        SELECT substr(submitted_at, 1, 10), COALESCE(revenue, ''), COUNT(*)
+        FROM leads GROUP BY 1, 2;
+    CREATE TRIGGER leads_daily_insert AFTER INSERT ON leads BEGIN
+        INSERT INTO leads_daily (day, revenue, submissions)
+        VALUES (substr(NEW.submitted_at, 1, 10), COALESCE(NEW.revenue, ''), 1)
+        ON CONFLICT (day, revenue) DO UPDATE SET submissions = submissions + 1;
+    END;
+    CREATE TRIGGER leads_daily_delete AFTER DELETE ON leads BEGIN
+        UPDATE leads_daily SET submissions = submissions - 1
+        WHERE day = substr(OLD.submitted_at, 1, 10)
+            AND revenue = COALESCE(OLD.revenue, '');
+    END;
+    CREATE TABLE funnel_daily (
+        day TEXT NOT NULL,
+        event TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, event)
+    ) WITHOUT ROWID;
+    """,
+    # Emails waiting to be sent, written in the same transaction as their
+    # lead; see outbox.py. Times are Unix seconds.
+    """
+    CREATE TABLE outbox (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        created_at REAL NOT NULL,
+        available_at REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        lease_owner TEXT,
+        last_error TEXT,
+        finished_at REAL
+    );
+    CREATE INDEX idx_outbox_ready ON outbox (status, available_at);
+    """,
+    # Owner digests are batched by kind and timed from the kind's last send
+    """
+    CREATE INDEX idx_outbox_kind ON outbox (kind, status, finished_at);
+    """,
+    # Why the spam filter flagged a lead it kept (spam_filter.CONTENT), or NULL
+    """
+    ALTER TABLE leads ADD COLUMN spam_reason TEXT;
+    """,
+]
+
+LEAD_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "company",
+    "revenue",
+    "challenge",
+)
+
+
+def connect(path):
+    """Open a connection configured for concurrent access"""
+    # Autocommit mode; transactions are managed explicitly
+    conn = sqlite3.connect(
+        path, timeout=30, check_same_thread=False, isolation_level=None
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+def _statements(script):
+    # executescript() would commit the open transaction first
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip() != ";":
+                yield statement
+            statement = ""
+
+
+def migrate(conn):
+    """Bring the database schema up to date
+
+    Safe to call from several processes at once: the version is re-read
+    under the write lock, so each migration is applied exactly once.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            for statement in _statements(script):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    if version < len(MIGRATIONS):
+        logger.info("Lead store migrated to schema version %d", len(MIGRATIONS))
+
+
+def iter_leads(conn, start=None, end=None, revenue=None, page_size=500):
+    """Yield leads in submission order, one keyset page at a time
+
+    start and end bound submitted_at as [start, end) and may be dates or UTC
+    ISO timestamps; revenue limits the export to those revenue ranges ("" for
+    leads that didn't pick one). Each page is its own short query, so memory
+    stays flat and no read transaction is held open between pages.
+    """
+    clauses, params = [], []
+    if start:
+        clauses.append("submitted_at >= ?")
+        params.append(start)
+    if end:
+        clauses.append("submitted_at < ?")
+        params.append(end)
+    if revenue is not None:
+        revenue = list(revenue)
+        clauses.append(f"COALESCE(revenue, '') IN ({', '.join('?' * len(revenue))})")
+        params += revenue
+    # Row-value comparison walks idx_leads_submitted_at without a sort
+    clauses.append("(submitted_at, id) > (?, ?)")
+    sql = (
+        f"SELECT * FROM leads WHERE {' AND '.join(clauses)} "
+        "ORDER BY submitted_at, id LIMIT ?"
+    )
+
+    after = ("", 0)
+    while True:
+        rows = conn.execute(sql, params + [*after, page_size]).fetchall()
+        for row in rows:
+            yield dict(row)
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]["submitted_at"], rows[-1]["id"])
+
+
+def daily_submissions(conn, start, end):
+    """Leads per UTC day and revenue range for days in [start, end)"""
+    rows = conn.execute(
+        "SELECT day, revenue, submissions FROM leads_daily "
+        "WHERE day >= ? AND day < ? ORDER BY day, revenue",
+        (start, end),
+    )
+    return [dict(row) for row in rows]
+
+
+def daily_events(conn, start, end):
+    """Funnel event counts per UTC day for days in [start, end)"""
+    rows = conn.execute(
+        "SELECT day, event, count FROM funnel_daily "
+        "WHERE day >= ? AND day < ? ORDER BY day, event",
+        (start, end),
+    )
+    return [dict(row) for row in rows]
+
+
+def enqueue(conn, kind, payload, delay=0):
+    """Add a message to the outbox, available to workers after delay seconds"""
+    now = time.time()
+    conn.execute(
+        "INSERT INTO outbox (kind, payload, created_at, available_at) "
+        "VALUES (?, ?, ?, ?)",
+        (kind, json.dumps(payload), now, now + delay),
+    )
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class LeadStore:
+    """Persistent store for consultation submissions
+
+    Writes are queued and committed by a single writer thread in batches,
+    so callers never wait on fsync; each write returns a Future that resolves
+    once its batch is committed.
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=0):
+        self.path = path
+        self.batch_size = batch_size
+        # How long to linger for more writes; by default a batch is whatever
+        # queued up during the previous commit, since submissions now wait
+        # for their commit
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._writes = queue.Queue()
+
+        writer = connect(path)
+        migrate(writer)
+        self._writer = threading.Thread(
+            target=self._write_loop, args=(writer,), name="lead-store", daemon=True
+        )
+        self._writer.start()
+
+    # Writes
+
+    def execute(self, operation):
+        """Run operation(conn) inside the next group commit"""
+        future = Future()
+        self._writes.put((operation, future))
+        return future
+
+    def add(
+        self,
+        lead,
+        submitted_at=None,
+        dedupe_key=None,
+        messages=(),
+        spam_reason=None,
+        delay=0,
+    ):
+        """Queue a lead for insertion, returning a Future of its row id
+
+        messages are (kind, payload) pairs put in the outbox in the same
+        transaction, so a lead is never stored without its emails. They
+        are held for delay seconds before workers may send them.
+        """
+        row = [submitted_at or utc_now(), dedupe_key, spam_reason]
+        row += [lead.get(f) for f in LEAD_FIELDS]
+
+        columns = ", ".join(("submitted_at", "dedupe_key", "spam_reason") + LEAD_FIELDS)
+
+        def insert(conn):
+            lead_id = conn.execute(
+                f"INSERT INTO leads ({columns}) VALUES ({', '.join('?' * len(row))})",
+                row,
+            ).lastrowid
+            for kind, payload in messages:
+                enqueue(conn, kind, payload, delay)
+            return lead_id
+
+        return self.execute(insert)
+
+    def add_many(self, leads, submitted_at=None, messages=None):
+        """Queue (lead, dedupe_key) pairs as one write, skipping stored keys
+
+        The Future resolves to a row id per lead, None where a lead with the
+        same dedupe key is already stored. messages(lead) gives each new
+        lead's outbox messages.
+        """
+        submitted_at = submitted_at or utc_now()
+        columns = ", ".join(("submitted_at", "dedupe_key") + LEAD_FIELDS)
+        placeholders = ", ".join("?" * (len(LEAD_FIELDS) + 2))
+
+        def insert(conn):
+            ids = []
+            for lead, dedupe_key in leads:
+                if (
+                    dedupe_key is not None
+                    and conn.execute(
+                        "SELECT 1 FROM leads WHERE dedupe_key = ? LIMIT 1",
+                        (dedupe_key,),
+                    ).fetchone()
+                ):
+                    ids.append(None)
+                    continue
+                row = [submitted_at, dedupe_key] + [lead.get(f) for f in LEAD_FIELDS]
+                ids.append(
+                    conn.execute(
+                        f"INSERT INTO leads ({columns}) VALUES ({placeholders})", row
+                    ).lastrowid
+                )
+                for kind, payload in messages(lead) if messages else ():
+                    enqueue(conn, kind, payload)
+            return ids
+
+        return self.execute(insert)
+
+    def record_events(self, *events):
+        """Add one to today's count of each funnel event"""
+        rows = [(utc_now()[:10], event) for event in events]
+
+        def upsert(conn):
+            conn.executemany(
+                "INSERT INTO funnel_daily (day, event, count) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, event) DO UPDATE SET count = count + 1",
+                rows,
+            )
+
+        return self.execute(upsert)
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self.execute(lambda conn: None).result()
+
+    def _write_loop(self, conn):
+        while True:
+            batch = [self._writes.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._writes.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+            self._commit(conn, batch)
+
+    def _commit(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                # A failing operation only rolls back its own savepoint
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((future, operation(conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    results.append((future, None, e))
+                conn.execute("RELEASE op")
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error("Lead store commit failed: %s", e)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for future, value, error in results:
+            if error is None:
+                future.set_result(value)
+            else:
+                future.set_exception(error)
+
+    # Reads
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def query(self, sql, params=()):
+        return [dict(row) for row in self._reader().execute(sql, params)]
+
+    def get(self, lead_id):
+        rows = self.query("SELECT * FROM leads WHERE id = ?", (lead_id,))
+        return rows[0] if rows else None
+
+    def find_by_email(self, email):
+        return self.query(
+            "SELECT * FROM leads WHERE email = ? ORDER BY submitted_at DESC",
+            (email,),
+        )
+
+    def find_by_company(self, company):
+        return self.query(
+            "SELECT * FROM leads WHERE company = ? ORDER BY submitted_at DESC",
+            (company,),
+        )
+
+    def submitted_between(self, start, end):
+        """Leads submitted in [start, end), given as UTC ISO timestamps"""
+        return self.query(
+            "SELECT * FROM leads WHERE submitted_at >= ? AND submitted_at < ? "
+            "ORDER BY submitted_at",
+            (start, end),
+        )
+
+    def iter_leads(self, start=None, end=None, revenue=None, page_size=500):
+        """Stream leads matching the filters; see iter_leads()"""
+        return iter_leads(self._reader(), start, end, revenue, page_size)
+
+    def has_recent_submission(self, dedupe_key, since):
+        """Whether a lead with this dedupe key was stored at or after since"""
+        row = (
+            self._reader()
+            .execute(
+                "SELECT 1 FROM leads WHERE dedupe_key = ? AND submitted_at >= ? LIMIT 1",
+                (dedupe_key, since),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def daily_submissions(self, start, end):
+        """Leads per day and revenue range; see daily_submissions()"""
+        return daily_submissions(self._reader(), start, end)
+
+    def daily_events(self, start, end):
+        """Funnel event counts per day; see daily_events()"""
+        return daily_events(self._reader(), start, end)
+
+    def count(self):
+        return self._reader().execute("SELECT COUNT(*) FROM leads").fetchone()[0]
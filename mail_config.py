@@ -0,0 +1,140 @@
+"""Typed mail configuration, validated once and reloaded when secrets change"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+from validation import validate_email
+
+logger = logging.getLogger(__name__)
+
+# Values shipped as examples that would only fail at SMTP login time
+PLACEHOLDERS = {"your-email@gmail.com", "your-app-password"}
+
+
+class MailConfigError(ValueError):
+    """The mail secrets are missing or invalid"""
+
+
+@dataclass(frozen=True)
+class MailConfig:
+    sender_email: str
+    sender_password: str = field(repr=False)
+    smtp_server: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    recipient_email: str = "michael@excelerateanalytics.com"
+    # Only disable STARTTLS for a local test server
+    use_tls: bool = True
+    # Socket timeout for connecting and for each SMTP command
+    timeout: float = 10.0
+
+    @classmethod
+    def from_secrets(cls, secrets):
+        """Build a config from a secrets mapping, reporting every problem at once"""
+        errors = []
+
+        def get(key, cast, default=None, required=False):
+            value = secrets.get(key, default)
+            if value is None or value == "":
+                if required:
+                    errors.append(f"{key} is required")
+                return default
+            if isinstance(value, str) and value in PLACEHOLDERS:
+                errors.append(f"{key} still has its placeholder value")
+                return default
+            try:
+                return cast(value)
+            except (TypeError, ValueError):
+                errors.append(f"{key} has an invalid value: {value!r}")
+                return default
+
+        def flag(value):
+            if isinstance(value, str):
+                return value.strip().lower() in ("1", "true", "yes", "on")
+            return bool(value)
+
+        fields = {
+            "sender_email": get("SENDER_EMAIL", str, required=True),
+            "sender_password": get("SENDER_PASSWORD", str, required=True),
+            "smtp_server": get("SMTP_SERVER", str, cls.smtp_server),
+            "smtp_port": get("SMTP_PORT", int, cls.smtp_port),
+            "recipient_email": get("RECIPIENT_EMAIL", str, cls.recipient_email),
+            "use_tls": get("SMTP_USE_TLS", flag, cls.use_tls),
+            "timeout": get("SMTP_TIMEOUT_SECONDS", float, cls.timeout),
+        }
+        for key in ("sender_email", "recipient_email"):
+            if fields[key] and not validate_email(fields[key]):
+                errors.append(f"{key.upper()} is not a valid email address")
+        if not 0 < fields["smtp_port"] < 65536:
+            errors.append("SMTP_PORT must be between 1 and 65535")
+        if fields["timeout"] <= 0:
+            errors.append("SMTP_TIMEOUT_SECONDS must be positive")
+
+        if errors:
+            raise MailConfigError("; ".join(errors))
+        return cls(**fields)
+
+
+class MailConfigWatcher:
+    """Hold the current MailConfig and reload it when a secrets file changes
+
+    load() returns the secrets mapping (st.secrets in the app); the files'
+    stat signature only decides when to call it again. A change is picked
+    up once the files have been still for one interval, which also gives
+    Streamlit time to re-read them. Reads happen on a background thread,
+    so callers on the submit path only read an attribute. An invalid edit
+    is logged and the last good config stays in place.
+    """
+
+    def __init__(self, paths, load, interval=2.0):
+        self.paths = list(paths)
+        self.load = load
+        self.interval = interval
+        self.config = None
+        self.error = None
+        self._signature = None
+        self.reload()
+        threading.Thread(target=self._watch, name="mail-config", daemon=True).start()
+
+    def _stat(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def reload(self):
+        self._signature = self._stat()
+        try:
+            try:
+                secrets = self.load()
+            except FileNotFoundError:
+                secrets = {}
+            config = MailConfig.from_secrets(secrets)
+        except Exception as e:
+            self.error = str(e)
+            if self.config is None:
+                logger.error("Mail configuration is invalid, emails are off: %s", e)
+            else:
+                logger.error("Mail configuration is invalid, keeping the last: %s", e)
+            return
+        self.config = config
+        self.error = None
+        logger.info(
+            "Mail configuration loaded (%s:%s)", config.smtp_server, config.smtp_port
+        )
+
+    def _watch(self):
+        previous = self._signature
+        while True:
+            time.sleep(self.interval)
+            signature = self._stat()
+            if signature != self._signature and signature == previous:
+                logger.info("Secrets changed, reloading mail configuration")
+                self.reload()
+            previous = signature
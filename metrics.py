@@ -0,0 +1,217 @@
+"""Hot-path timing histograms with Prometheus text output
+
+Instrumentation is off until configure(enabled=True) is called; while off,
+timed() hands back a shared no-op context manager so the cost at each call
+site is one global lookup.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, from sub-millisecond Python work to slow SMTP
+BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+HELP = {
+    "rerun_seconds": "Time to execute one Streamlit rerun of the page or the form fragment",
+    "render_seconds": "Time to render a section of the page",
+    "validation_seconds": "Time to validate a consultation submission",
+    "deliverability_seconds": "Time to check that a prospect's email domain takes mail",
+    "submit_seconds": "Time to store and queue a valid submission",
+    "smtp_phase_seconds": "Time spent in each SMTP phase",
+    "email_delivery_seconds": "Time from an email entering the outbox to it being sent",
+    "email_queue_depth": "Outbox emails waiting to be sent (pending) or given up on (dead)",
+    "rate_limit_checks": "Submissions the rate limiter accepted, delayed or throttled since start",
+    "sessions": "Streamlit sessions held by this process",
+    "process_rss_bytes": "Resident memory of this process",
+}
+
+_NOOP = nullcontext()
+_enabled = False
+_lock = threading.Lock()
+_histograms = {}
+_gauges = {}
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class _Timer:
+    __slots__ = ("key", "started")
+
+    def __init__(self, key):
+        self.key = key
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _observe(self.key, time.perf_counter() - self.started)
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def _observe(key, value):
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+
+def enabled():
+    return _enabled
+
+
+def timed(name, **labels):
+    """Context manager recording the duration of its block"""
+    if not _enabled:
+        return _NOOP
+    return _Timer(_key(name, labels))
+
+
+def observe(name, seconds, **labels):
+    if _enabled:
+        _observe(_key(name, labels), seconds)
+
+
+def set_gauge(name, value, **labels):
+    if _enabled:
+        with _lock:
+            _gauges[_key(name, labels)] = value
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format"""
+    with _lock:
+        histograms = sorted(
+            (key, list(h.counts), h.total, h.count) for key, h in _histograms.items()
+        )
+        gauges = sorted(_gauges.items())
+
+    lines = []
+    described = set()
+    for (name, labels), counts, total, count in histograms:
+        if name not in described:
+            described.add(name)
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + ("+Inf",), counts):
+            cumulative += bucket_count
+            le = _format_labels(labels, [("le", bound)])
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    for (name, labels), value in gauges:
+        if name not in described:
+            described.add(name)
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def summary():
+    """One line per histogram with count, mean and approximate p50/p95"""
+    with _lock:
+        items = sorted(_histograms.items())
+        lines = []
+        for (name, labels), h in items:
+            mean = h.total / h.count if h.count else 0.0
+            lines.append(
+                f"{name}{_format_labels(labels)} n={h.count} "
+                f"mean={mean * 1000:.1f}ms p50<={h.quantile(0.5) * 1000:g}ms "
+                f"p95<={h.quantile(0.95) * 1000:g}ms"
+            )
+    return lines
+
+
+def write_textfile(path):
+    """Atomically write metrics for node_exporter's textfile collector"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+
+def _report_loop(interval, textfile):
+    while True:
+        time.sleep(interval)
+        try:
+            if textfile:
+                write_textfile(textfile)
+            else:
+                for line in summary():
+                    logger.info("metrics %s", line)
+        except OSError as e:
+            logger.error("Failed to write metrics: %s", e)
+
+
+def configure(enabled=True, interval=60, textfile=None):
+    """Turn instrumentation on and start the periodic reporter
+
+    With a textfile path the metrics are written there every interval for a
+    Prometheus scraper; otherwise a summary is logged.
+    """
+    global _enabled
+    _enabled = enabled
+    if enabled and interval:
+        threading.Thread(
+            target=_report_loop,
+            args=(interval, textfile),
+            name="metrics-reporter",
+            daemon=True,
+        ).start()
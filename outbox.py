@@ -0,0 +1,380 @@
+"""Durable email outbox shared by every web process through the lead store
+
+Also a command for the owner:
+
+    python -m outbox --db leads.db             # counts by status
+    python -m outbox --db leads.db --requeue   # retry dead-lettered emails
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+
+import metrics
+from lead_store import connect, migrate
+from structured_logging import correlation_scope
+
+logger = logging.getLogger(__name__)
+
+# Lease time beyond the send deadline, for building the message and
+# recording the outcome
+LEASE_MARGIN = 10
+
+LEASE = """
+UPDATE outbox
+SET lease_owner = :owner, available_at = :now + :lease, attempts = attempts + 1
+WHERE id IN (
+    SELECT id FROM outbox
+    WHERE status = 'pending' AND available_at <= :now
+        AND kind NOT IN (SELECT value FROM json_each(:batched))
+    ORDER BY available_at
+    LIMIT :limit
+)
+RETURNING id, kind, payload, attempts, created_at
+"""
+
+# Messages of one kind ready to go, how many of them are being sent right
+# now, and when one was last sent
+BATCH_STATE = """
+SELECT
+    COUNT(*) FILTER (WHERE available_at <= :now) AS ready,
+    MIN(created_at) FILTER (WHERE available_at <= :now) AS oldest,
+    COUNT(*) FILTER (
+        WHERE available_at > :now AND lease_owner IS NOT NULL
+    ) AS sending,
+    (
+        SELECT MAX(finished_at) FROM outbox
+        WHERE kind = :kind AND status = 'sent'
+    ) AS last_sent
+FROM outbox
+WHERE kind = :kind AND status = 'pending'
+"""
+
+LEASE_BATCH = """
+UPDATE outbox
+SET lease_owner = :owner, available_at = :now + :lease, attempts = attempts + 1
+WHERE id IN (
+    SELECT id FROM outbox
+    WHERE kind = :kind AND status = 'pending' AND available_at <= :now
+    ORDER BY created_at
+    LIMIT :limit
+)
+RETURNING id, kind, payload, attempts, created_at
+"""
+
+
+def backoff(attempts, base, cap):
+    """Exponential delay before retry number `attempts`, with equal jitter"""
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class Outbox:
+    """Deliver outbox messages with leases, retries and a dead letter status
+
+    Workers in any number of processes lease messages with a single
+    UPDATE ... RETURNING, so each message is held by one worker at a time.
+    The lease pushes available_at forward; if the worker dies mid-send the
+    message becomes available again once the lease runs out. A failed send
+    is retried after an exponential backoff with jitter, and after
+    max_attempts the message is marked dead for the owner to requeue.
+    Delivery is at least once: a send that outlives its lease can repeat.
+
+    Kinds in `batches` are held back and sent several to one email: a
+    worker leases every ready message of the kind once its batcher says
+    they are due, and acks or retries them together, so a batch waiting
+    for its window survives a restart like any other message.
+    """
+
+    def __init__(
+        self,
+        path,
+        handlers,
+        workers=4,
+        batch_size=1,
+        lease_seconds=60,
+        max_attempts=8,
+        backoff_base=30,
+        backoff_cap=3600,
+        poll_interval=1.0,
+        on_outcome=None,
+        batches=None,
+        report_interval=15,
+        send_deadline=None,
+    ):
+        if send_deadline is not None and lease_seconds < send_deadline + LEASE_MARGIN:
+            raise ValueError(
+                f"The outbox lease ({lease_seconds:g}s) must be at least "
+                f"{LEASE_MARGIN}s longer than the send deadline ({send_deadline:g}s), "
+                "or a slow send is repeated by another worker"
+            )
+        self.path = path
+        # {kind: handler(payload)}; a handler raises if the send failed
+        self.handlers = handlers
+        self.workers = workers
+        self.batch_size = batch_size
+        # Handlers must give up within send_deadline, so a message is never
+        # leased again while its first send is still running
+        self.lease_seconds = lease_seconds
+        self.send_deadline = send_deadline
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.poll_interval = poll_interval
+        # Called with (kind, "sent" | "retry" | "dead") after each attempt
+        self.on_outcome = on_outcome
+        # {kind: batcher}; see owner_digest.OwnerDigest for the interface
+        self.batches = batches or {}
+        self._batched = json.dumps(sorted(self.batches))
+        # How often the first worker updates the email_queue_depth gauge
+        self.report_interval = report_interval
+        self._wake = threading.Event()
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        for n in range(self.workers):
+            threading.Thread(
+                target=self._run,
+                args=(f"{self._owner}:{n}", n == 0),
+                name=f"outbox-{n}",
+                daemon=True,
+            ).start()
+        return self
+
+    def wake(self):
+        """Check for work now instead of at the next poll"""
+        self._wake.set()
+
+    def lease(self, conn, owner, limit):
+        rows = conn.execute(
+            LEASE,
+            {
+                "owner": owner,
+                "now": time.time(),
+                "lease": self.lease_seconds,
+                "limit": limit,
+                "batched": self._batched,
+            },
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def lease_batch(self, conn, owner, kind):
+        """Lease the ready messages of a batched kind if they are due"""
+        batcher = self.batches[kind]
+        if not self._batch_due(conn, kind, batcher):
+            return []
+        # Checked again under the write lock, so one worker takes the batch
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = []
+            if self._batch_due(conn, kind, batcher):
+                rows = conn.execute(
+                    LEASE_BATCH,
+                    {
+                        "owner": owner,
+                        "kind": kind,
+                        "now": time.time(),
+                        "lease": self.lease_seconds,
+                        "limit": batcher.max_batch,
+                    },
+                ).fetchall()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return [dict(row) for row in rows]
+
+    def _batch_due(self, conn, kind, batcher):
+        now = time.time()
+        state = conn.execute(BATCH_STATE, {"kind": kind, "now": now}).fetchone()
+        if not state["ready"]:
+            return False
+        # A batch still being sent counts as sent just now
+        last_sent = now if state["sending"] else state["last_sent"]
+        return batcher.due(state["ready"], state["oldest"], last_sent, now)
+
+    def _run(self, owner, report):
+        conn = connect(self.path)
+        next_report = 0
+        while True:
+            if report and time.monotonic() >= next_report:
+                next_report = time.monotonic() + self.report_interval
+                try:
+                    report_depth(conn)
+                except Exception as e:
+                    logger.error("Outbox depth report failed: %s", e)
+            try:
+                handled = self.work(conn, owner)
+            except Exception as e:
+                logger.error("Outbox lease failed: %s", e)
+                handled = 0
+            if not handled:
+                if self._wake.wait(self.poll_interval):
+                    self._wake.clear()
+
+    def work(self, conn, owner):
+        """Lease and deliver due batches and up to batch_size other messages
+
+        Returns how many messages were handled.
+        """
+        handled = 0
+        for kind in self.batches:
+            messages = self.lease_batch(conn, owner, kind)
+            if messages:
+                try:
+                    self.deliver_batch(conn, owner, kind, messages)
+                except Exception as e:
+                    logger.error("Outbox worker failed on a %s batch: %s", kind, e)
+                handled += len(messages)
+
+        messages = self.lease(conn, owner, self.batch_size)
+        for message in messages:
+            try:
+                self.deliver(conn, owner, message)
+            except Exception as e:
+                # The lease runs out and another attempt picks it up
+                logger.error("Outbox worker failed on a message: %s", e)
+        return handled + len(messages)
+
+    def deliver(self, conn, owner, message):
+        """Send one leased message and record the outcome under the lease"""
+        payload = json.loads(message["payload"])
+        # Logs from this send carry the ID of the submission that queued it
+        with correlation_scope(payload.get("correlation_id")):
+            self._attempt(conn, owner, message, payload)
+
+    def deliver_batch(self, conn, owner, kind, messages):
+        """Send leased messages of a batched kind as one, then ack them together"""
+        error = None
+        try:
+            self.batches[kind].send([json.loads(m["payload"]) for m in messages])
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for message in messages:
+                self._record(conn, owner, message, error)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _attempt(self, conn, owner, message, payload):
+        error = None
+        try:
+            self.handlers[message["kind"]](payload)
+        except Exception as e:
+            # Kept as last_error, so `python -m outbox` shows the cause
+            error = f"{type(e).__name__}: {str(e)}"
+        self._record(conn, owner, message, error)
+
+    def _record(self, conn, owner, message, error):
+        kind = message["kind"]
+        now = time.time()
+        if error is None:
+            outcome = "sent"
+            updated = conn.execute(
+                "UPDATE outbox SET status = 'sent', finished_at = ?, "
+                "lease_owner = NULL, last_error = NULL "
+                "WHERE id = ? AND lease_owner = ?",
+                (now, message["id"], owner),
+            ).rowcount
+            metrics.observe("email_delivery_seconds", now - message["created_at"])
+        elif message["attempts"] >= self.max_attempts:
+            outcome = "dead"
+            updated = conn.execute(
+                "UPDATE outbox SET status = 'dead', finished_at = ?, "
+                "lease_owner = NULL, last_error = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (now, error, message["id"], owner),
+            ).rowcount
+            logger.error(
+                "Outbox %s message %d dead after %d attempts: %s",
+                kind,
+                message["id"],
+                message["attempts"],
+                error,
+            )
+        else:
+            outcome = "retry"
+            delay = backoff(message["attempts"], self.backoff_base, self.backoff_cap)
+            updated = conn.execute(
+                "UPDATE outbox SET available_at = ?, lease_owner = NULL, "
+                "last_error = ? WHERE id = ? AND lease_owner = ?",
+                (now + delay, error, message["id"], owner),
+            ).rowcount
+            logger.warning(
+                "Outbox %s message %d failed (attempt %d), retrying in %.0fs: %s",
+                kind,
+                message["id"],
+                message["attempts"],
+                delay,
+                error,
+            )
+        if not updated:
+            # Another worker took over after the lease ran out
+            logger.warning("Outbox lease on message %d was lost", message["id"])
+        if self.on_outcome is not None:
+            self.on_outcome(kind, outcome)
+
+
+def status_counts(conn):
+    """Messages per status, e.g. {"pending": 3, "sent": 120, "dead": 1}"""
+    rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+    return {status: count for status, count in rows}
+
+
+def report_depth(conn):
+    """Set the email_queue_depth gauge to the pending and dead message counts"""
+    rows = conn.execute(
+        "SELECT status, COUNT(*) FROM outbox "
+        "WHERE status IN ('pending', 'dead') GROUP BY status"
+    )
+    counts = dict.fromkeys(("pending", "dead"), 0)
+    counts.update(rows)
+    for status, count in counts.items():
+        metrics.set_gauge("email_queue_depth", count, status=status)
+    return counts
+
+
+def requeue_dead(conn):
+    """Give every dead message a fresh set of attempts, returning how many"""
+    return conn.execute(
+        "UPDATE outbox SET status = 'pending', attempts = 0, available_at = ?, "
+        "finished_at = NULL WHERE status = 'dead'",
+        (time.time(),),
+    ).rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="leads.db", help="lead store path")
+    parser.add_argument(
+        "--requeue", action="store_true", help="retry dead-lettered messages"
+    )
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        parser.error(f"no lead store at {args.db}")
+
+    conn = connect(args.db)
+    migrate(conn)
+    if args.requeue:
+        print(f"requeued {requeue_dead(conn)} dead messages")
+    for status, count in sorted(status_counts(conn).items()):
+        print(f"{status:<8} {count}")
+    for row in conn.execute(
+        "SELECT id, kind, attempts, last_error FROM outbox "
+        "WHERE status = 'dead' ORDER BY id DESC LIMIT 10"
+    ):
+        print(
+            f"dead #{row['id']} {row['kind']} x{row['attempts']}: {row['last_error']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+MODES = ("off", "burst", "always")
+
+
+class OwnerDigest:
+    """Batch owner notifications into summary emails
+
+    Owner messages wait in the outbox like any other, and an outbox worker
+    asks due() whether the ready ones should go out now. In "always" mode
+    every lead waits for the next digest. In "burst" mode a lead arriving
+    after a quiet window is sent on its own right away, and only the leads
+    that follow it within the window are batched. A digest goes out once
+    the oldest waiting lead is a window old or max_leads are waiting.
+    """
+
+    def __init__(
+        self, send_single, send_digest, mode="burst", window=300, max_leads=20
+    ):
+        if mode not in MODES[1:]:
+            raise ValueError(f"Unknown digest mode: {mode}")
+        self._send_single = send_single
+        self._send_digest = send_digest
+        self.mode = mode
+        self.window = window
+        self.max_leads = max_leads
+        # The most owner messages one worker leases for a digest
+        self.max_batch = max_leads
+        self.notifications_sent = 0
+        self.digests_sent = 0
+        self.leads_batched = 0
+
+    def due(self, waiting, oldest, last_sent, now):
+        """Whether the waiting notifications should be sent now
+
+        oldest is when the first waiting lead was queued and last_sent when
+        the previous notification went out (None if never), in Unix seconds.
+        """
+        if waiting >= self.max_leads or now - oldest >= self.window:
+            return True
+        quiet = last_sent is None or now - last_sent >= self.window
+        return self.mode == "burst" and quiet
+
+    def send(self, payloads):
+        """Send owner message payloads as one email, raising if it fails"""
+        batch = [
+            (payload["lead"], datetime.fromisoformat(payload["submitted"]))
+            for payload in payloads
+        ]
+        if len(batch) == 1:
+            self._send_single(*batch[0])
+            self.notifications_sent += 1
+        else:
+            self._send_digest(batch)
+            self.digests_sent += 1
+            self.leads_batched += len(batch)
@@ -0,0 +1,43 @@
+"""Sign-in and lead store access shared by the owner-only pages"""
+
+import hmac
+
+import streamlit as st
+
+from lead_store import connect, migrate
+
+
+def require_owner():
+    """Stop the page unless this session has entered OWNER_PASSWORD"""
+    try:
+        password = st.secrets.get("OWNER_PASSWORD")
+    except FileNotFoundError:
+        password = None
+    if not password:
+        st.error("Owner pages are disabled. Set OWNER_PASSWORD in secrets.toml.")
+        st.stop()
+    if st.session_state.get("owner_authenticated"):
+        return
+
+    with st.form("owner_sign_in"):
+        entered = st.text_input("Owner password", type="password")
+        if st.form_submit_button("Sign in"):
+            if hmac.compare_digest(entered.encode(), password.encode()):
+                st.session_state["owner_authenticated"] = True
+                st.rerun()
+            st.error("Incorrect password")
+    st.stop()
+
+
+def leads_db_path():
+    try:
+        return st.secrets.get("LEADS_DB_PATH", "leads.db")
+    except FileNotFoundError:
+        return "leads.db"
+
+
+def open_lead_store():
+    """A read connection to the lead store, with the schema up to date"""
+    conn = connect(leads_db_path())
+    migrate(conn)
+    return conn
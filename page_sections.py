@@ -0,0 +1,118 @@
+"""Static HTML for the landing page, built once per process
+
+Each block is a single HTML fragment without blank lines so that several
+blocks can be joined and rendered by one st.markdown call.
+"""
+
+HERO_HTML = """
+<div class="hero-section">
+    <h1 class="hero-title">
+        Excelerate Analytics, LLC<br><br>
+        <span class="hero-highlight">Turn Your Data Into Your Biggest Competitive Advantage</span>
+    </h1>
+    <p class="hero-subtext">🚀 Get A FREE Strategy Session Worth $500</p>
+    <p class="hero-description">
+        Discover exactly how to unlock hidden profits in your data and make decisions that drive real growth.
+        No fluff, just actionable insights tailored to your business.
+    </p>
+</div>
+"""
+
+VALUE_PROPS = [
+    (
+        "📈 Increase Revenue by 15-30%",
+        "Identify profit opportunities hiding in your data",
+    ),
+    ("💰 Cut Costs by 20-40%", "Eliminate waste and optimize operations"),
+    (
+        "🎯 Make Smarter Decisions",
+        "Stop guessing, start knowing with data-driven insights",
+    ),
+]
+
+# The .value-props grid lays the cards out in a row, replacing st.columns
+VALUE_PROPS_HTML = (
+    '<div class="value-props">\n'
+    + "".join(
+        f'    <div class="value-prop">\n'
+        f"        <h3>{title}</h3>\n"
+        f"        <p>{text}</p>\n"
+        f"    </div>\n"
+        for title, text in VALUE_PROPS
+    )
+    + "</div>\n"
+)
+
+TRUST_HTML = """
+<div class="trust-section">
+    <h2>Trusted by Growing Businesses</h2>
+    <div class="trust-items">
+        <div class="trust-item">
+            <div class="trust-number">50+</div>
+            <div class="trust-label">Businesses Transformed</div>
+        </div>
+        <div class="trust-item">
+            <div class="trust-number">$2M+</div>
+            <div class="trust-label">In Client Savings Generated</div>
+        </div>
+        <div class="trust-item">
+            <div class="trust-number">100%</div>
+            <div class="trust-label">Client Satisfaction Rate</div>
+        </div>
+    </div>
+</div>
+"""
+
+# Hero, value propositions and trust section in a single element
+LANDING_HTML = HERO_HTML.strip() + "\n" + VALUE_PROPS_HTML + TRUST_HTML.strip()
+
+SESSION_INTRO_MD = """
+## Book Your Free Analytics Strategy Session
+
+** Normally $500 - Yours FREE for a Limited Time
+
+In just 45 minutes, we'll analyze your current data situation and show you exactly how to unlock hidden profits in your business.
+"""
+
+BENEFITS = [
+    "✅ A complete audit of your current data and analytics setup",
+    "✅ Custom roadmap to increase revenue and reduce costs",
+    "✅ Identification of your biggest profit opportunities",
+    "✅ Actionable steps you can implement immediately",
+    "✅ No-obligation consultation - zero pressure",
+]
+
+BENEFITS_MD = "### What You'll Get In Your Session:\n\n" + "".join(
+    '<div style="display: flex; align-items: flex-start; margin-bottom: 1rem; '
+    "padding: 1rem; background: rgba(59, 130, 246, 0.1); "
+    "border: 1px solid rgba(148, 163, 184, 0.2); border-radius: 12px; "
+    f'color: #f8fafc;">{benefit}</div>\n'
+    for benefit in BENEFITS
+)
+
+# Options of the form's revenue selectbox; "" means none was picked
+REVENUE_RANGES = ["", "Under $500K", "$500K - $1M", "$1M - $5M", "$5M - $10M", "$10M+"]
+
+PRIVACY_NOTE_HTML = """
+<p style="text-align: center; color: #94a3b8; font-size: 0.9rem; margin-top: 1rem;">
+    🔒 Your information is secure and will never be shared. We'll contact you within 24 hours to schedule your session.
+</p>
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 2rem; margin-bottom: 2rem;">
+        <div>
+            <h4 style="color: #fbbf24; margin-bottom: 1rem;">Excelerate Analytics, LLC</h4>
+            <p>Transforming data into competitive advantages for ambitious businesses.</p>
+        </div>
+        <div>
+            <h4 style="color: #fbbf24; margin-bottom: 1rem;">Contact Info</h4>
+            <p>michael@excelerateanalytics.com<br>
+            (702) 445-2266<br>
+            Las Vegas, NV</p>
+        </div>
+    </div>
+    <p>© 2025 Excelerate Analytics, LLC. All rights reserved.</p>
+</div>
+"""
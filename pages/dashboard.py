@@ -0,0 +1,130 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+import streamlit as st
+
+from lead_store import daily_events, daily_submissions
+from owner_pages import open_lead_store, require_owner
+from page_sections import REVENUE_RANGES
+
+VALIDATION_ERROR = "validation_error:"
+SPAM_BLOCKED = "spam_blocked:"
+SPAM_FLAGGED = "spam_flagged:"
+REVENUE_LABELS = [option or "Not given" for option in REVENUE_RANGES]
+
+st.set_page_config(page_title="Lead dashboard", page_icon="📊", layout="wide")
+require_owner()
+
+st.title("Lead dashboard")
+
+today = datetime.now(timezone.utc).date()
+period = st.date_input(
+    "Days (UTC)", value=(today - timedelta(days=29), today), max_value=today
+)
+if len(period) != 2:
+    st.stop()
+start, end = period[0].isoformat(), (period[1] + timedelta(days=1)).isoformat()
+
+# Both queries read the rollup tables, a few rows per day, never leads
+conn = open_lead_store()
+try:
+    submissions = daily_submissions(conn, start, end)
+    events = daily_events(conn, start, end)
+finally:
+    conn.close()
+
+days = pd.date_range(period[0], period[1], freq="D").date
+leads = (
+    pd.DataFrame(submissions, columns=["day", "revenue", "submissions"])
+    .replace({"revenue": {"": "Not given"}})
+    .pivot_table(index="day", columns="revenue", values="submissions", aggfunc="sum")
+    .rename(index=date.fromisoformat)
+    .reindex(days, fill_value=0)
+    .reindex(columns=REVENUE_LABELS, fill_value=0)
+    .fillna(0)
+    .astype(int)
+)
+funnel = (
+    pd.DataFrame(events, columns=["day", "event", "count"])
+    .groupby("event")["count"]
+    .sum()
+)
+
+
+def total(event):
+    return int(funnel.get(event, 0))
+
+
+attempts = total("submit_attempt")
+invalid = total("validation_failed")
+delivered = total("email_delivered")
+undelivered = total("email_failed")
+
+col_a, col_b, col_c, col_d = st.columns(4)
+col_a.metric("Leads", int(leads.to_numpy().sum()))
+col_b.metric("Form submits", attempts)
+col_c.metric("Validation error rate", f"{invalid / attempts:.1%}" if attempts else "–")
+col_d.metric(
+    "Email delivery success",
+    f"{delivered / (delivered + undelivered):.1%}" if delivered + undelivered else "–",
+)
+
+st.subheader("Leads per day")
+st.bar_chart(leads, stack=True)
+
+col_left, col_right = st.columns(2)
+with col_left:
+    st.subheader("By revenue range")
+    st.dataframe(
+        leads.sum().rename("Leads").to_frame(),
+        use_container_width=True,
+    )
+with col_right:
+    st.subheader("Funnel")
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "Form submits": attempts,
+                "Blocked as spam": int(
+                    funnel[funnel.index.str.startswith(SPAM_BLOCKED)].sum()
+                ),
+                "Stored flagged as spam": int(
+                    funnel[funnel.index.str.startswith(SPAM_FLAGGED)].sum()
+                ),
+                "Failed validation": invalid,
+                "Duplicates ignored": total("duplicate"),
+                "Throttled": total("throttled"),
+                "Emails held by rate limit": total("mail_delayed"),
+                "Emails delivered": delivered,
+                "Email retries": total("email_retried"),
+                "Emails failed": total("email_failed"),
+            }.items(),
+            columns=["Step", "Count"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+errors = funnel[funnel.index.str.startswith(VALIDATION_ERROR)]
+if not errors.empty:
+    st.subheader("Validation errors")
+    st.dataframe(
+        errors.rename(lambda event: event[len(VALIDATION_ERROR) :])
+        .sort_values(ascending=False)
+        .rename_axis("Error")
+        .rename("Count")
+        .to_frame(),
+        use_container_width=True,
+    )
+
+spam = funnel[funnel.index.str.startswith(SPAM_BLOCKED)]
+if not spam.empty:
+    st.subheader("Blocked as spam")
+    st.dataframe(
+        spam.rename(lambda event: event[len(SPAM_BLOCKED) :])
+        .sort_values(ascending=False)
+        .rename_axis("Reason")
+        .rename("Count")
+        .to_frame(),
+        use_container_width=True,
+    )
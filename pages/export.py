@@ -0,0 +1,72 @@
+import itertools
+
+import streamlit as st
+
+from lead_export import FORMATS, date_range, export_chunks
+from lead_store import iter_leads
+from owner_pages import leads_db_path, open_lead_store, require_owner
+from page_sections import REVENUE_RANGES
+
+# download_button holds the whole file in memory, so larger exports are
+# left to `python -m lead_export`, which streams
+MAX_IN_APP_LEADS = 50000
+
+
+def build_export(since, until, revenue, export_format):
+    """The export file and how many leads matched, up to one over the cap"""
+    matched = 0
+
+    def counted(leads):
+        nonlocal matched
+        for lead in leads:
+            matched += 1
+            yield lead
+
+    start, end = date_range(since, until)
+    conn = open_lead_store()
+    try:
+        leads = iter_leads(conn, start, end, revenue or None)
+        capped = itertools.islice(leads, MAX_IN_APP_LEADS + 1)
+        data = "".join(export_chunks(counted(capped), export_format))
+    finally:
+        conn.close()
+    return data, matched
+
+
+st.set_page_config(page_title="Lead export", page_icon="📊", layout="wide")
+require_owner()
+
+st.title("Lead export")
+
+with st.form("export_filters"):
+    col_a, col_b = st.columns(2)
+    with col_a:
+        since = st.date_input("Submitted from (UTC)", value=None)
+    with col_b:
+        until = st.date_input("Submitted until (UTC)", value=None)
+    revenue = st.multiselect(
+        "Annual revenue range",
+        REVENUE_RANGES,
+        format_func=lambda option: option or "Not given",
+        placeholder="All ranges",
+    )
+    export_format = st.radio("Format", list(FORMATS), horizontal=True)
+    prepare = st.form_submit_button("Prepare export")
+
+if prepare:
+    data, matched = build_export(since, until, revenue, export_format)
+
+    if matched > MAX_IN_APP_LEADS:
+        st.warning(
+            f"More than {MAX_IN_APP_LEADS:,} leads match. Narrow the filters or "
+            f"run `python -m lead_export --db {leads_db_path()}` on the server."
+        )
+    else:
+        st.write(f"{matched:,} leads")
+        st.download_button(
+            f"Download {export_format.upper()}",
+            data,
+            file_name=f"leads.{export_format}",
+            mime=FORMATS[export_format],
+            on_click="ignore",
+        )
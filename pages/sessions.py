@@ -0,0 +1,48 @@
+import pandas as pd
+import streamlit as st
+
+from owner_pages import require_owner
+from session_monitor import (
+    StreamlitInternalsChanged,
+    process_rss_bytes,
+    session_footprints,
+    touch,
+)
+
+st.set_page_config(page_title="Sessions", page_icon="📊", layout="wide")
+require_owner()
+touch()
+
+st.title("Sessions")
+
+# Measuring every session's state walks it object by object, so only on demand
+try:
+    sessions = session_footprints()
+except StreamlitInternalsChanged as e:
+    st.warning(f"Session details are unavailable: {e}")
+    sessions = []
+footprints = pd.DataFrame(
+    sessions,
+    columns=["session_id", "active", "idle_seconds", "script_runs", "state_bytes"],
+)
+rss = process_rss_bytes()
+
+col_a, col_b, col_c, col_d = st.columns(4)
+col_a.metric("Sessions", len(footprints))
+col_b.metric("Connected", int(footprints["active"].sum()))
+col_c.metric("Session state", f"{footprints['state_bytes'].sum() / 1024:,.0f} KiB")
+col_d.metric("Process memory", f"{rss / 2**20:,.0f} MiB" if rss else "–")
+
+st.caption(
+    "Session state is what each session's widgets and values hold; the rest "
+    "of a session (element trees, queues, script runner) shows only in "
+    "process memory."
+)
+st.dataframe(
+    footprints.sort_values("idle_seconds", ascending=False, na_position="first"),
+    hide_index=True,
+    column_config={
+        "idle_seconds": st.column_config.NumberColumn("Idle (s)", format="%.0f"),
+        "state_bytes": st.column_config.NumberColumn("State bytes", format="%d"),
+    },
+)
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+
+class RateLimitExceeded(Exception):
+    """A submission was throttled"""
+
+    def __init__(self, scope):
+        super().__init__(f"Rate limit exceeded ({scope})")
+        self.scope = scope
+
+
+class TokenBucket:
+    """Allow bursts of `capacity`, refilling at `rate` tokens per second"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        return self.tokens
+
+
+class RateLimiter:
+    """Per-session and per-email token buckets, and a global mail pace
+
+    Keyed buckets live in bounded LRU caches. A bucket that has been idle
+    long enough to refill completely is indistinguishable from a new one,
+    so each entry expires after its full refill time.
+
+    The global bucket never turns a submission away: past its burst the
+    lead is still stored, and check() says how long to hold its emails so
+    they go out at the global rate. Only one visitor's session or email
+    address running out of tokens rejects the submission.
+    """
+
+    def __init__(
+        self,
+        global_limit=(30, 0.5),
+        session_limit=(3, 1 / 60),
+        email_limit=(2, 1 / 600),
+        max_keys=10000,
+        clock=time.monotonic,
+    ):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._global = TokenBucket(*global_limit, clock())
+        self._limits = {"session": session_limit, "email": email_limit}
+        self._buckets = {
+            scope: TTLCache(max_size=max_keys, ttl=capacity / rate, clock=clock)
+            for scope, (capacity, rate) in self._limits.items()
+        }
+        self.accepted = 0
+        self.delayed = 0
+        self.throttled = {"session": 0, "email": 0}
+
+    def _bucket(self, scope, key, now):
+        bucket = self._buckets[scope].get(key)
+        if bucket is None:
+            bucket = TokenBucket(*self._limits[scope], now)
+        return bucket
+
+    def check(self, session_id=None, email=None):
+        """Take a session and an email token, returning seconds to hold the mail
+
+        Raises RateLimitExceeded, consuming nothing, unless both buckets
+        have a token. The global bucket may go into debt; the debt divided
+        by its rate is how long this submission's emails should wait.
+        """
+        with self._lock:
+            now = self._clock()
+            buckets = []
+            if email:
+                email = email.strip().lower()
+                buckets.append(("email", email, self._bucket("email", email, now)))
+            if session_id:
+                session = self._bucket("session", session_id, now)
+                buckets.append(("session", session_id, session))
+
+            for scope, _, bucket in buckets:
+                if bucket.refill(now) < 1:
+                    self.throttled[scope] += 1
+                    raise RateLimitExceeded(scope)
+
+            for scope, key, bucket in buckets:
+                bucket.tokens -= 1
+                self._buckets[scope].set(key, bucket)
+
+            self._global.refill(now)
+            self._global.tokens -= 1
+            delay = max(0.0, -self._global.tokens / self._global.rate)
+            if delay:
+                self.delayed += 1
+            else:
+                self.accepted += 1
+            return delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                "accepted": self.accepted,
+                "delayed": self.delayed,
+                "throttled": dict(self.throttled),
+            }
@@ -0,0 +1,194 @@
+"""Per-session memory accounting and idle-session reclamation
+
+Every browser tab holds a Streamlit session with its widget state until the
+tab closes, and a disconnected session is kept for
+server.disconnectedSessionTTL in case the tab reconnects. Crawlers and ad
+clicks leave many such tabs open. The reaper closes sessions that have been
+idle too long, and the longest-idle ones once there are more than a cap.
+
+A closed session's websocket is closed too. If the tab is still open, the
+browser reconnects and gets a fresh session with an empty form.
+
+Streamlit has no public API for listing or closing sessions, so this uses
+its private runtime internals, checked against CHECKED_STREAMLIT. When they
+change, StreamlitInternalsChanged is raised and the reaper turns itself off.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime import Runtime
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Time of the session's last rerun, kept in its own session state
+LAST_SEEN_KEY = "_last_seen"
+
+# The Streamlit release whose private session APIs this module was checked
+# against; requirements.txt pins the same version
+CHECKED_STREAMLIT = "1.46.1"
+
+
+class StreamlitInternalsChanged(RuntimeError):
+    """Streamlit's private session APIs are missing or have changed"""
+
+
+@contextmanager
+def _internals(what):
+    try:
+        yield
+    except (AttributeError, TypeError) as e:
+        raise StreamlitInternalsChanged(
+            f"{what} failed on Streamlit {st.__version__} "
+            f"(checked against {CHECKED_STREAMLIT}): {e!r}"
+        ) from e
+
+
+def touch():
+    """Mark the current session as active now"""
+    st.session_state[LAST_SEEN_KEY] = time.time()
+
+
+def process_rss_bytes():
+    """Resident set size of this process, or None off Linux"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _session_manager():
+    if not Runtime.exists():
+        return None
+    runtime = Runtime.instance()
+    if not issubclass(type(runtime), Runtime):
+        # streamlit.testing's runtime is a mock without sessions
+        return None
+    with _internals("Finding the session manager"):
+        return runtime._session_mgr
+
+
+def session_footprints(sizes=True):
+    """One dict per session: id, active, idle seconds, script runs, state bytes
+
+    State bytes are measured the way Streamlit's own stats endpoint does,
+    with a deep sizeof of the session state, and are None with sizes=False.
+    """
+    manager = _session_manager()
+    if manager is None:
+        return []
+    with _internals("Listing sessions"):
+        return _footprints(manager, sizes)
+
+
+def _footprints(manager, sizes):
+    now = time.time()
+    footprints = []
+    for info in manager.list_sessions():
+        session = info.session
+        state = session.session_state
+        try:
+            last_seen = state[LAST_SEEN_KEY]
+        except KeyError:
+            last_seen = None
+        state_bytes = None
+        if sizes:
+            try:
+                state_bytes = sum(stat.byte_length for stat in state.get_stats())
+            except RuntimeError:
+                # The session's script changed its state mid-measurement
+                pass
+        footprints.append(
+            {
+                "session_id": session.id,
+                "active": info.client is not None,
+                "idle_seconds": None if last_seen is None else now - last_seen,
+                "script_runs": info.script_run_count,
+                "state_bytes": state_bytes,
+            }
+        )
+    return footprints
+
+
+def close_sessions(session_ids):
+    """Shut sessions down and close their websockets, from any thread"""
+    runtime = Runtime.instance()
+
+    def close():
+        for session_id in session_ids:
+            client = runtime.get_client(session_id)
+            runtime.close_session(session_id)
+            if client is not None:
+                client.close()
+
+    with _internals("Closing sessions"):
+        runtime._get_async_objs().eventloop.call_soon_threadsafe(close)
+
+
+class SessionReaper:
+    """Close idle sessions, and the longest-idle ones over a cap, periodically
+
+    idle_seconds or max_sessions of 0 turns that rule off. Sessions that
+    have not rerun since the reaper started count as idle from when it
+    first saw them.
+    """
+
+    def __init__(self, idle_seconds=1800, max_sessions=0, interval=60):
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.interval = interval
+        self._first_seen = {}
+
+    def start(self):
+        threading.Thread(target=self._run, name="session-reaper", daemon=True).start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sweep()
+            except StreamlitInternalsChanged as e:
+                logger.error("Session reaper disabled: %s", e)
+                return
+            except Exception as e:
+                logger.error("Session sweep failed: %s", e)
+
+    def sweep(self):
+        """Close what is over the limits and record gauges, returning the IDs"""
+        footprints = session_footprints(sizes=False)
+        now = time.time()
+        seen = {}
+        for footprint in footprints:
+            session_id = footprint["session_id"]
+            if footprint["idle_seconds"] is None:
+                seen[session_id] = self._first_seen.get(session_id, now)
+                footprint["idle_seconds"] = now - seen[session_id]
+        self._first_seen = seen
+
+        by_idle = sorted(footprints, key=lambda f: f["idle_seconds"], reverse=True)
+        evict = []
+        if self.idle_seconds:
+            evict = [f for f in by_idle if f["idle_seconds"] > self.idle_seconds]
+        if self.max_sessions and len(footprints) - len(evict) > self.max_sessions:
+            evict = by_idle[: len(footprints) - self.max_sessions]
+        evicted = [f["session_id"] for f in evict]
+        if evicted:
+            close_sessions(evicted)
+            logger.info("Closed %d idle sessions", len(evicted))
+
+        remaining = [f for f in footprints if f["session_id"] not in evicted]
+        active = sum(f["active"] for f in remaining)
+        metrics.set_gauge("sessions", active, state="active")
+        metrics.set_gauge("sessions", len(remaining) - active, state="disconnected")
+        rss = process_rss_bytes()
+        if rss is not None:
+            metrics.set_gauge("process_rss_bytes", rss)
+        return evicted
@@ -1,8 +1,15 @@
 mkdir -p ~/.streamlit/
 echo "
-[server]n
-headless = truen
-port = $PORTn
-enableCORS = falsen
-n
-" > ~/.streamlit/config.toml
\ No newline at end of file
+[server]
+headless = true
+port = $PORT
+enableCORS = false
+enableStaticServing = true
+" > ~/.streamlit/config.toml
+
+# Self-host the Inter font so first paint doesn't wait on a third-party CDN
+FONT=static/fonts/InterVariable.woff2
+if [ ! -f "$FONT" ]; then
+    mkdir -p static/fonts
+    curl -fsSL -o "$FONT" https://rsms.me/inter/font-files/InterVariable.woff2 || rm -f "$FONT"
+fi
@@ -0,0 +1,61 @@
+"""Stylesheet and font assets, prepared once per process"""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+STYLESHEET_PATH = ROOT / "assets" / "styles.css"
+FONTS_DIR = ROOT / "static" / "fonts"
+
+# Streamlit serves ./static at app/static when server.enableStaticServing is on
+FONT_URL_PREFIX = "app/static/fonts/"
+INTER_FONT_FILE = "InterVariable.woff2"
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_AROUND_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_AFTER_COLON = re.compile(r":\s+")
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _COMMENTS.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    css = _AROUND_PUNCTUATION.sub(r"\1", css)
+    # Only spaces after a colon are dropped; "a :hover" differs from "a:hover"
+    css = _AFTER_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def font_face_css(url_prefix=FONT_URL_PREFIX):
+    """@font-face rule for the self-hosted Inter font, if it is installed"""
+    if not (FONTS_DIR / INTER_FONT_FILE).is_file():
+        # Fall back to the system font stack rather than a third-party CDN
+        return ""
+    return (
+        "@font-face{font-family:'Inter';font-style:normal;font-weight:100 900;"
+        f"font-display:swap;src:url('{url_prefix}{INTER_FONT_FILE}') "
+        "format('woff2')}"
+    )
+
+
+@lru_cache(maxsize=None)
+def stylesheet(url_prefix=FONT_URL_PREFIX):
+    """Minified stylesheet and its content hash, built once per process"""
+    source = STYLESHEET_PATH.read_text(encoding="utf-8")
+    digest = hashlib.sha256(source.encode()).hexdigest()[:12]
+    return font_face_css(url_prefix) + minify_css(source), digest
+
+
+@lru_cache(maxsize=None)
+def style_tag():
+    """<style> element ready for st.markdown
+
+    The tag is identical on every rerun, so once it is over Streamlit's
+    global.minCachedMessageSize the browser replays it from its message
+    cache instead of receiving the stylesheet again.
+    """
+    css, digest = stylesheet()
+    return f'<style data-css="{digest}">{css}</style>'
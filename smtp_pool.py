@@ -0,0 +1,220 @@
+import logging
+import smtplib
+import socket
+import ssl
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_ssl_context():
+    """Process-wide TLS context so the CA bundle is only loaded once"""
+    return ssl.create_default_context()
+
+
+class Deadline:
+    """Shut down the connection a send is using once its time is up
+
+    Socket timeouts only bound each read, so a send that reconnects and
+    runs every SMTP command could otherwise take many timeouts in total.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+        self.expired = False
+        self._server = None
+        self._lock = threading.Lock()
+        self._timer = threading.Timer(seconds, self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def remaining(self):
+        """Seconds left, raising TimeoutError once there are none"""
+        remaining = self.expires - time.monotonic()
+        if self.expired or remaining <= 0:
+            raise TimeoutError(f"SMTP send exceeded its {self.seconds:g}s deadline")
+        return remaining
+
+    def watch(self, server):
+        with self._lock:
+            self._server = server
+            if self.expired:
+                _shutdown(server)
+
+    def cancel(self):
+        with self._lock:
+            self._server = None
+        self._timer.cancel()
+
+    def _expire(self):
+        with self._lock:
+            self.expired = True
+            if self._server is not None:
+                _shutdown(self._server)
+
+
+def _shutdown(server):
+    # Wakes a thread blocked reading the socket; close() alone may not
+    try:
+        server.sock.shutdown(socket.SHUT_RDWR)
+    except (AttributeError, OSError):
+        pass
+
+
+class SMTPConnectionPool:
+    """Keep authenticated SMTP connections alive between submissions"""
+
+    def __init__(
+        self,
+        host,
+        port,
+        username,
+        password,
+        use_tls=True,
+        max_size=4,
+        timeout=30,
+        max_idle=240,
+        noop_after=5,
+        deadline=None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        # Most providers drop idle sessions after a few minutes, so anything
+        # idle for longer than max_idle is replaced instead of probed
+        self.max_idle = max_idle
+        # Connections used within the last noop_after seconds skip the NOOP
+        # round trip; a drop is still caught by the retry in sendmail()
+        self.noop_after = noop_after
+        # Seconds one sendmail() may take in total, reconnecting included
+        self.deadline = deadline
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.connects = 0
+        self.reuses = 0
+
+    def _connect(self, deadline=None):
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        with metrics.timed("smtp_phase_seconds", phase="connect"):
+            server = smtplib.SMTP(self.host, self.port, timeout=timeout)
+        if deadline is not None:
+            deadline.watch(server)
+        try:
+            if self.use_tls:
+                with metrics.timed("smtp_phase_seconds", phase="starttls"):
+                    server.starttls(context=get_ssl_context())
+            if self.username:
+                with metrics.timed("smtp_phase_seconds", phase="login"):
+                    server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.connects += 1
+        return server
+
+    def _is_alive(self, server):
+        try:
+            with metrics.timed("smtp_phase_seconds", phase="noop"):
+                return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self, deadline=None):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, idle_since = self._idle.pop()
+            if deadline is not None:
+                deadline.watch(server)
+            idle_for = time.monotonic() - idle_since
+            if idle_for < self.max_idle and (
+                idle_for < self.noop_after or self._is_alive(server)
+            ):
+                self.reuses += 1
+                return server
+            self._discard(server)
+        return self._connect(deadline)
+
+    def _release(self, server):
+        with self._lock:
+            self._idle.append((server, time.monotonic()))
+
+    def _discard(self, server):
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @contextmanager
+    def connection(self, deadline=None):
+        """Borrow a live, authenticated connection from the pool"""
+        with self._slots:
+            server = self._acquire(deadline)
+            try:
+                yield server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                server.close()
+                raise
+            except Exception:
+                # The session may be mid-transaction, so don't hand it out again
+                self._discard(server)
+                raise
+            else:
+                self._release(server)
+
+    def warm(self, count=1):
+        """Open count connections ahead of the first sends"""
+        with ExitStack() as stack:
+            for _ in range(count):
+                stack.enter_context(self.connection())
+
+    def sendmail(self, from_addr, to_addrs, msg, kind="message"):
+        """Send one message, reconnecting once if a pooled session was dropped
+
+        With a deadline, raises TimeoutError once the whole send has taken
+        longer than that.
+        """
+        deadline = Deadline(self.deadline) if self.deadline else None
+        try:
+            try:
+                return self._send(deadline, from_addr, to_addrs, msg, kind)
+            except smtplib.SMTPServerDisconnected:
+                if deadline is not None:
+                    deadline.remaining()
+                logger.info("SMTP connection dropped, reconnecting")
+                return self._send(deadline, from_addr, to_addrs, msg, kind)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # A connection shut down by the deadline fails with whatever
+            # error the read ran into; report it as the timeout it was
+            if deadline is not None:
+                deadline.remaining()
+            raise
+        finally:
+            if deadline is not None:
+                deadline.cancel()
+
+    def _send(self, deadline, from_addr, to_addrs, msg, kind):
+        with self.connection(deadline) as server:
+            with metrics.timed("smtp_phase_seconds", phase="sendmail", kind=kind):
+                return server.sendmail(from_addr, to_addrs, msg)
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._discard(server)
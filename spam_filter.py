@@ -0,0 +1,126 @@
+import hashlib
+import re
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+# Only URLs; prospects name their own sites and storefronts as bare domains
+LINK = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+HTML_TAG = re.compile(r"</?[a-z][^>]*>|\[url", re.IGNORECASE)
+# Words from link and pharma spam, not from industries a prospect may be in
+SPAM_WORDS = re.compile(
+    r"\b(?:casino|viagra|cialis|porn|backlinks?|seo services?|guest posts?|"
+    r"rank(?:ing)? your (?:site|website)|click here|unsubscribe|dear sir|"
+    r"whatsapp|telegram)\b",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+# Text fields that are scored for links, markup and spam words
+SCORED_FIELDS = ("first_name", "last_name", "company", "challenge")
+
+
+# A reason check() returns for a lead that is stored and sent to the owner
+# marked as possible spam, without a confirmation to the prospect
+CONTENT = "content"
+
+
+class SpamRejected(Exception):
+    """A submission was rejected as spam"""
+
+    def __init__(self, reason):
+        super().__init__(f"Rejected as spam ({reason})")
+        self.reason = reason
+
+
+class SpamFilter:
+    """Cheap checks that stop bot submissions before anything is stored or sent
+
+    In order: a honeypot field people never see, a minimum time between the
+    form being shown and submitted, and the same challenge text arriving from
+    several email addresses reject a submission. A high score for links,
+    markup and spam words only flags it, since real prospects can trip it;
+    a flagged lead is kept for the owner to review.
+    """
+
+    def __init__(
+        self,
+        min_fill_seconds=3,
+        max_score=2,
+        repeat_limit=3,
+        repeat_window=3600,
+        max_texts=10000,
+        clock=time.monotonic,
+    ):
+        self.min_fill_seconds = min_fill_seconds
+        self.max_score = max_score
+        self.repeat_limit = repeat_limit
+        self._lock = threading.Lock()
+        # Challenge text hash -> hashes of the emails that sent it
+        self._seen = TTLCache(max_size=max_texts, ttl=repeat_window, clock=clock)
+        self.accepted = 0
+        self.flagged = 0
+        self.rejected = {"honeypot": 0, "too_fast": 0, "repeated": 0}
+
+    def check(self, lead, honeypot="", fill_seconds=None):
+        """Raise SpamRejected for a submission that looks automated
+
+        Returns CONTENT for one to store flagged, otherwise None.
+        """
+        reason = self._reason(lead, honeypot, fill_seconds)
+        flag = None
+        if reason is None and score(lead) > self.max_score:
+            flag = CONTENT
+        with self._lock:
+            if reason is not None:
+                self.rejected[reason] += 1
+            elif flag is not None:
+                self.flagged += 1
+            else:
+                self.accepted += 1
+        if reason is not None:
+            raise SpamRejected(reason)
+        return flag
+
+    def _reason(self, lead, honeypot, fill_seconds):
+        if honeypot:
+            return "honeypot"
+        if fill_seconds is not None and fill_seconds < self.min_fill_seconds:
+            return "too_fast"
+        if self.repeat_limit and self._repeated(lead):
+            return "repeated"
+        return None
+
+    def _repeated(self, lead):
+        text = _WHITESPACE.sub(" ", lead.get("challenge") or "").strip().casefold()
+        # Short answers like "reporting" repeat between real prospects
+        if len(text) < 40:
+            return False
+        key = hashlib.sha256(text.encode()).digest()
+        sender = hashlib.sha256((lead.get("email") or "").lower().encode()).digest()
+        with self._lock:
+            senders = self._seen.get(key) or frozenset()
+            if sender not in senders and len(senders) < self.repeat_limit:
+                senders = senders | {sender}
+                self._seen.set(key, senders)
+        return sender not in senders
+
+    def stats(self):
+        with self._lock:
+            return {
+                "accepted": self.accepted,
+                "flagged": self.flagged,
+                "rejected": dict(self.rejected),
+            }
+
+
+def score(lead):
+    """Links count two each past the first, markup two, each spam word one"""
+    text = " ".join(lead.get(field) or "" for field in SCORED_FIELDS)
+    links = len(LINK.findall(text))
+    return (
+        2 * max(0, links - 1)
+        + (2 if HTML_TAG.search(text) else 0)
+        + len(SPAM_WORDS.findall(text))
+    )
@@ -0,0 +1,102 @@
+"""Cold-start profile: process start to first render, plus warm-up timings
+
+Import this module before anything heavy in the app script so the first
+rerun's import time can be measured. Every mark is recorded once per
+process, so reruns cost a dictionary lookup.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+# perf_counter() when this module was first imported, i.e. the top of the
+# first script run
+SCRIPT_STARTED = time.perf_counter()
+
+_lock = threading.Lock()
+_marks = {}
+_steps = {}
+_reported = False
+
+
+def _process_age():
+    """Seconds since the OS started this process, or None off Linux"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 is the start time in clock ticks since boot; the
+            # command name in field 2 may contain spaces, so split after it
+            started = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return uptime - started / os.sysconf("SC_CLK_TCK")
+
+
+# Process start to the first line of the app script: interpreter start,
+# importing Streamlit, starting the server and waiting for the first visitor
+BOOT_SECONDS = _process_age()
+
+
+def mark(name):
+    """Record seconds since the script started, the first time only"""
+    if name in _marks:
+        return
+    with _lock:
+        _marks.setdefault(name, time.perf_counter() - SCRIPT_STARTED)
+
+
+def step(name, func):
+    """Run one warm-up step, recording how long it took"""
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        logger.warning("Warm-up step '%s' failed: %s", name, e)
+    finally:
+        with _lock:
+            _steps[name] = time.perf_counter() - started
+
+
+def warm_up(steps, then=None):
+    """Run (name, func) steps on a background thread, then call then()"""
+
+    def run():
+        for name, func in steps:
+            step(name, func)
+        if then is not None:
+            then()
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    # Cached resources built on this thread look for the script's context
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+
+def profile():
+    """Startup timings in seconds, keyed by phase"""
+    result = {} if BOOT_SECONDS is None else {"boot": BOOT_SECONDS}
+    with _lock:
+        result.update(_marks)
+        result.update((f"warm_up.{name}", seconds) for name, seconds in _steps.items())
+    return result
+
+
+def report():
+    """Log the startup profile once per process"""
+    global _reported
+    with _lock:
+        if _reported:
+            return
+        _reported = True
+    logger.info(
+        "Startup profile: %s",
+        ", ".join(
+            f"{name} {seconds * 1000:.1f}ms" for name, seconds in profile().items()
+        ),
+    )
@@ -0,0 +1,178 @@
+"""Export the landing page as static files for any web server or CDN
+
+The marketing sections, stylesheet and font are written out once, so page
+views need no Streamlit session. Only the consultation form is served by
+the app, behind a link or embedded in an iframe:
+
+    python -m static_site --app-url https://book.example.com --out site
+    python -m static_site --app-url https://book.example.com --form embed
+
+An embedded form opens a Streamlit session on most views, which costs the
+app about as much as the full page did; a link only opens one on a click.
+"""
+
+import argparse
+import html
+import re
+import shutil
+from pathlib import Path
+from urllib.parse import urlencode
+
+from page_sections import (
+    BENEFITS_MD,
+    FOOTER_HTML,
+    LANDING_HTML,
+    PRIVACY_NOTE_HTML,
+    SESSION_INTRO_MD,
+)
+from site_assets import FONTS_DIR, INTER_FONT_FILE, minify_css, stylesheet
+
+FORM_MODES = ("link", "embed")
+
+# Stands in for the page layout Streamlit gives the app in wide mode
+LAYOUT_CSS = minify_css("""
+body { margin: 0; }
+.stApp { min-height: 100vh; }
+.static-page { max-width: 1200px; margin: 0 auto; padding: 0 1.5rem 2rem; }
+.static-columns {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
+    gap: 2rem;
+    align-items: start;
+}
+.static-form { width: 100%; min-height: 1000px; border: 0; }
+.static-cta {
+    display: block;
+    text-align: center;
+    text-decoration: none;
+    background: linear-gradient(45deg, #3b82f6, #60a5fa);
+    color: #f8fafc;
+    padding: 18px 40px;
+    font-size: 1.2rem;
+    font-weight: 600;
+    border-radius: 12px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+""")
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Excelerate Analytics, LLC</title>
+<link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>📊</text></svg>">
+{preload}<link rel="stylesheet" href="{css_file}">
+</head>
+<body>
+<div class="stApp"><main class="static-page">
+{landing}
+{intro}
+<div class="static-columns">
+<div>
+{benefits}
+</div>
+<div id="book">
+{form}
+{privacy}
+</div>
+</div>
+{footer}
+</main></div>
+</body>
+</html>
+"""
+
+_HEADING = re.compile(r"(#{1,6}) (.*)")
+
+
+def markdown_html(text):
+    """HTML for the page sections' markdown: headings, paragraphs and HTML"""
+    blocks = []
+    for block in re.split(r"\n\s*\n", text.strip()):
+        heading = _HEADING.fullmatch(block)
+        if heading:
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{html.escape(heading.group(2))}</h{level}>")
+        elif block.lstrip().startswith("<"):
+            blocks.append(block)
+        else:
+            blocks.append(f"<p>{html.escape(block)}</p>")
+    return "\n".join(blocks)
+
+
+def form_url(app_url, embed):
+    """The app's form-only view, chromeless when embedded"""
+    params = {"embed": "true", "view": "form"} if embed else {"view": "form"}
+    return f"{app_url.rstrip('/')}/?{urlencode(params)}"
+
+
+def form_html(app_url, mode):
+    if mode == "embed":
+        # Lazy, so the Streamlit session only opens once the form is near view
+        return (
+            f'<iframe class="static-form" src="{html.escape(form_url(app_url, True))}" '
+            'title="Reserve Your Free Session" loading="lazy"></iframe>'
+        )
+    return (
+        "<h3>Reserve Your Free Session</h3>\n"
+        f'<a class="static-cta" href="{html.escape(form_url(app_url, False))}">'
+        "🚀 Book My Free Session Now</a>"
+    )
+
+
+def export(out_dir, app_url, mode="link"):
+    """Write index.html, a content-hashed stylesheet and fonts to out_dir"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    css, digest = stylesheet("fonts/")
+    css_file = f"styles.{digest}.css"
+    (out_dir / css_file).write_text(css + LAYOUT_CSS, encoding="utf-8")
+
+    files = [out_dir / "index.html", out_dir / css_file]
+    preload = ""
+    font = FONTS_DIR / INTER_FONT_FILE
+    if font.is_file():
+        (out_dir / "fonts").mkdir(exist_ok=True)
+        files.append(Path(shutil.copy2(font, out_dir / "fonts" / INTER_FONT_FILE)))
+        preload = (
+            f'<link rel="preload" href="fonts/{INTER_FONT_FILE}" as="font" '
+            'type="font/woff2" crossorigin>\n'
+        )
+
+    page = PAGE.format(
+        preload=preload,
+        css_file=css_file,
+        landing=LANDING_HTML,
+        intro=markdown_html(SESSION_INTRO_MD),
+        benefits=markdown_html(BENEFITS_MD),
+        form=form_html(app_url, mode),
+        privacy=PRIVACY_NOTE_HTML.strip(),
+        footer=FOOTER_HTML.strip(),
+    )
+    (out_dir / "index.html").write_text(page, encoding="utf-8")
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--app-url", required=True, help="where the Streamlit app is served"
+    )
+    parser.add_argument("--out", default="site", help="output directory")
+    parser.add_argument(
+        "--form",
+        choices=FORM_MODES,
+        default="link",
+        help="link to the form or embed it in an iframe",
+    )
+    args = parser.parse_args(argv)
+
+    for path in export(args.out, args.app_url, args.form):
+        print(f"{path.stat().st_size:>9,} {path}")
+
+
+if __name__ == "__main__":
+    main()
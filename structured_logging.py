@@ -0,0 +1,146 @@
+"""Queue-based JSON logging with correlation IDs and PII redaction
+
+Callers only put records on a bounded queue; a listener thread formats,
+redacts and writes them. Records are not pre-formatted on the caller's
+thread, so %-style arguments are only interpolated by the listener.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import re
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# As broad as validation.EMAIL_PATTERN, so any address the form accepts,
+# Unicode included, is masked
+EMAIL = re.compile(r"([^\s@])[^\s@]*@([^\s@]+\.[^\s@]+)")
+# Ten or more digits, alone or split by spaces, dots, dashes or parentheses
+PHONE = re.compile(r"\+?\(?\d(?:[\s().-]{0,3}\d){9,}\)?")
+
+_correlation_id = contextvars.ContextVar("correlation_id", default=None)
+_listener = None
+
+
+def redact(text):
+    """Mask email local parts and phone numbers in a log message"""
+    text = EMAIL.sub(r"\1***@\2", text)
+    return PHONE.sub("[phone]", text)
+
+
+def current_correlation_id():
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id=None):
+    """Tag every record logged in this block with one ID, new if not given"""
+    token = _correlation_id.set(correlation_id or uuid.uuid4().hex[:12])
+    try:
+        yield _correlation_id.get()
+    finally:
+        _correlation_id.reset(token)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with PII redacted from the message"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage()),
+        }
+        correlation_id = getattr(record, "correlation_id", None)
+        if correlation_id:
+            entry["correlation_id"] = correlation_id
+        if record.exc_info:
+            entry["exception"] = redact(self.formatException(record.exc_info))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RedactingFormatter(logging.Formatter):
+    """Plain text lines for local runs, still redacted"""
+
+    def format(self, record):
+        return redact(super().format(record))
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Drop records rather than block when the listener falls behind"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+
+    def prepare(self, record):
+        # The queue stays in-process, so the record is passed as is and
+        # formatting waits for the listener thread
+        record.correlation_id = _correlation_id.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.dropped != self._reported:
+                self._report_drops()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _report_drops(self):
+        dropped = self.dropped - self._reported
+        warning = logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "Log queue was full, dropped %d records",
+            (dropped,),
+            None,
+        )
+        warning.correlation_id = None
+        self.queue.put_nowait(warning)
+        self._reported = self.dropped
+
+
+def configure_logging(level="INFO", json_format=True, max_queue=10000, stream=None):
+    """Route the root logger through a queue to stderr; safe to call again"""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.Queue(maxsize=max_queue)
+    output = logging.StreamHandler(stream or sys.stderr)
+    if json_format:
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(
+            RedactingFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(BoundedQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    # Flush what's queued when the process exits
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
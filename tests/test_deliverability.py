@@ -0,0 +1,81 @@
+import dns.rdata
+import dns.resolver
+
+from deliverability import DeliverabilityChecker, make_resolver
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Resolver:
+    """Answers MX queries from a table of domain -> records or exception"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+
+    def resolve(self, qname, rdtype):
+        self.queries.append((qname, rdtype))
+        answer = self.answers[qname]
+        if isinstance(answer, Exception):
+            raise answer
+        if rdtype != "MX":
+            raise dns.resolver.NoAnswer()
+        return [dns.rdata.from_text("IN", "MX", record) for record in answer]
+
+
+def make_checker(answers, **options):
+    clock = Clock()
+    resolver = Resolver(answers)
+    checker = DeliverabilityChecker(
+        resolver, timeout=5, ttl=3600, unknown_ttl=60, clock=clock, **options
+    )
+    return checker, resolver, clock
+
+
+def test_domain_with_mx_is_deliverable_and_cached():
+    checker, resolver, _ = make_checker({"example.com": ["10 mx.example.com."]})
+
+    assert checker.check("ann@example.com") is None
+    assert checker.check("bob@example.com") is None
+    assert len(resolver.queries) == 1
+    assert checker.stats()["hits"] == 1
+
+
+def test_missing_domain_and_null_mx_are_rejected_and_cached():
+    checker, resolver, _ = make_checker(
+        {"nope.example": dns.resolver.NXDOMAIN(), "nomail.example": ["0 ."]}
+    )
+
+    assert "nope.example" in checker.check("ann@nope.example")
+    assert "nomail.example" in checker.check("ann@nomail.example")
+    assert "nope.example" in checker.check("bob@nope.example")
+    assert len(resolver.queries) == 2
+    assert checker.stats()["rejected"] == 3
+
+
+def test_resolver_failure_lets_the_address_through_and_retries_soon():
+    checker, resolver, clock = make_checker({"gmail.com": OSError("unreachable")})
+
+    assert checker.check("ann@gmail.com") is None
+    assert checker.check("bob@gmail.com") is None
+    assert len(resolver.queries) == 1
+
+    # Cached for unknown_ttl, not the full ttl
+    clock.now += 61
+    resolver.answers["gmail.com"] = ["5 gmail-smtp-in.l.google.com."]
+    assert checker.check("cat@gmail.com") is None
+    assert len(resolver.queries) == 2
+    assert checker.stats()["rejected"] == 0
+
+
+def test_make_resolver_accepts_a_string_of_nameservers():
+    resolver = make_resolver("192.0.2.1, 192.0.2.2 192.0.2.3", timeout=2)
+
+    assert resolver.nameservers == ["192.0.2.1", "192.0.2.2", "192.0.2.3"]
+    assert resolver.lifetime == 2
@@ -0,0 +1,83 @@
+import email
+from datetime import datetime
+from email.header import decode_header, make_header
+
+from email_templates import (
+    ascii_address,
+    build_owner_digest,
+    build_owner_message,
+    build_prospect_message,
+)
+
+LEAD = {
+    "first_name": "José",
+    "last_name": "Müller",
+    "email": "josé@exämple.com",
+    "phone": "(555) 555-5555",
+    "company": "Exämple Café",
+    "revenue": "",
+    "challenge": "Reports take forever\nand nobody trusts them",
+}
+SUBMITTED = datetime(2024, 5, 6, 14, 30)
+
+
+def parse(message):
+    # smtplib.sendmail() encodes a str message as ASCII
+    message.encode("ascii")
+    return email.message_from_string(message)
+
+
+def header(parsed, name):
+    return str(make_header(decode_header(parsed[name])))
+
+
+def body(parsed):
+    (part,) = parsed.get_payload()
+    return part.get_payload(decode=True).decode("utf-8")
+
+
+def test_owner_message_round_trips_unicode_lead():
+    parsed = parse(
+        build_owner_message("site@example.com", "owner@example.com", LEAD, SUBMITTED)
+    )
+
+    assert header(parsed, "Reply-To") == LEAD["email"]
+    assert header(parsed, "To") == "owner@example.com"
+    assert header(parsed, "Subject").endswith("Request - Exämple Café")
+    assert "👤 Name: José Müller" in body(parsed)
+    assert "Reports take forever\nand nobody trusts them" in body(parsed)
+
+
+def test_flagged_lead_is_marked_as_possible_spam():
+    parsed = parse(
+        build_owner_message(
+            "site@example.com", "owner@example.com", LEAD, SUBMITTED, "content"
+        )
+    )
+
+    assert header(parsed, "Subject").startswith("⚠️ Possible Spam:")
+    assert "flagged this request (content)" in body(parsed)
+    assert "👤 Name: José Müller" in body(parsed)
+
+
+def test_internationalized_domain_uses_idna():
+    lead = dict(LEAD, email="jose@exämple.com")
+    parsed = parse(build_prospect_message("site@example.com", lead))
+
+    assert parsed["To"] == "jose@xn--exmple-cua.com"
+    assert ascii_address(" jose@exämple.com ") == "jose@xn--exmple-cua.com"
+    assert ascii_address("josé@exämple.com") == "josé@xn--exmple-cua.com"
+    assert "Hi José," in body(parsed)
+
+
+def test_digest_round_trips():
+    parsed = parse(
+        build_owner_digest(
+            "site@example.com",
+            "owner@example.com",
+            [(LEAD, SUBMITTED), (dict(LEAD, first_name="Zoë"), SUBMITTED)],
+        )
+    )
+
+    assert header(parsed, "Subject").endswith("2 New Analytics Consultation Requests")
+    assert "2. Zoë Müller - Exämple Café" in body(parsed)
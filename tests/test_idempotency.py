@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+from idempotency import IdempotencyGuard, submission_key
+from lead_store import LeadStore
+
+KEY = submission_key("ann@example.com", "(555) 555-1234", "Acme", "Reports")
+
+
+def test_key_ignores_case_spacing_and_phone_format():
+    assert KEY == submission_key(
+        " Ann@Example.com", "555.555.1234", "  ACME ", "reports\n"
+    )
+    assert KEY != submission_key("ann@example.com", "5555551234", "Acme", "Other")
+
+
+def test_claim_pending_then_complete():
+    guard = IdempotencyGuard()
+
+    assert guard.claim(KEY) is None
+    # A double-click while the first submit is still processing
+    assert guard.claim(KEY) == IdempotencyGuard.PENDING
+    guard.complete(KEY, True)
+    assert guard.claim(KEY) is True
+    assert guard.duplicates == 2
+
+
+def test_release_lets_a_failed_submission_be_retried():
+    guard = IdempotencyGuard()
+    guard.claim(KEY)
+    guard.release(KEY)
+
+    assert guard.claim(KEY) is None
+
+
+def test_window_expiry():
+    now = [0.0]
+    guard = IdempotencyGuard(window=600, clock=lambda: now[0])
+    guard.claim(KEY)
+    guard.complete(KEY, True)
+
+    now[0] = 600
+    assert guard.claim(KEY) is None
+
+
+def test_falls_back_to_the_lead_store(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.db"))
+    lead = {
+        "first_name": "Ann",
+        "last_name": "Lee",
+        "email": "ann@example.com",
+        "phone": "5555551234",
+        "company": "Acme",
+        "revenue": "",
+        "challenge": "Reports",
+    }
+    store.add(lead, dedupe_key=KEY).result()
+    old = datetime(2020, 1, 1, tzinfo=timezone.utc).isoformat(timespec="seconds")
+    other = submission_key("bo@example.com", "5555551234", "Acme", "Reports")
+    store.add(dict(lead, email="bo@example.com"), old, other).result()
+
+    # A fresh process: nothing cached, but the stored lead is recent
+    guard = IdempotencyGuard(window=600, store=store)
+    assert guard.claim(KEY) is True
+    # Stored, but outside the window
+    assert guard.claim(other) is None
@@ -0,0 +1,123 @@
+import io
+import json
+
+from lead_import import (
+    NOT_A_RECORD,
+    UNKNOWN_REVENUE,
+    import_leads,
+    prepare_chunk,
+    read_records,
+)
+from lead_store import LeadStore, connect
+
+CSV = """First Name,Last Name,Email Address,Phone Number,Company Name,Annual Revenue Range,What's your biggest data challenge?
+Ann,Lee,Ann@Example.com,(702) 555-0100,Acme,$1M - $5M,'=SUM(A1:A2) is all we have
+Bob,Ray,bob@example.com,555,Beta,,Reporting
+"""
+
+
+def lead(n, **fields):
+    record = dict(
+        first_name="Ann",
+        last_name="Lee",
+        email=f"p{n}@example.com",
+        phone="702-555-0100",
+        company=f"Company {n}",
+        revenue="",
+        challenge="Reporting",
+    )
+    record.update(fields)
+    return record
+
+
+def test_csv_aliases_and_quoted_formulas():
+    records = list(read_records(io.StringIO(CSV), "csv"))
+    accepted, rejected = prepare_chunk(records)
+
+    ((line, first, key),) = accepted
+    assert line == 2
+    assert first["email"] == "Ann@example.com"
+    assert first["revenue"] == "$1M - $5M"
+    # The quote lead_export added before a formula-like cell comes off again
+    assert first["challenge"] == "=SUM(A1:A2) is all we have"
+    assert key
+    assert rejected == [(3, ["Please enter a valid phone number"])]
+
+
+def test_jsonl_bad_lines_and_unknown_revenue():
+    stream = io.StringIO(
+        "\n".join(
+            [
+                json.dumps(
+                    {
+                        "First Name": "Ann",
+                        "Last Name": "Lee",
+                        "Business Email": "a@example.com",
+                        "Phone": 7025550100,
+                        "Company": "Acme",
+                        "Annual Revenue": "$10M+",
+                        "Biggest data challenge": "Reporting",
+                    }
+                ),
+                "not json",
+                "[1, 2]",
+                json.dumps(dict(lead(2), revenue="A lot")),
+            ]
+        )
+    )
+
+    accepted, rejected = prepare_chunk(list(read_records(stream, "jsonl")))
+
+    ((line, first, _),) = accepted
+    assert line == 1
+    assert first["email"] == "a@example.com"
+    assert first["phone"] == "7025550100"
+    assert first["revenue"] == "$10M+"
+    assert rejected == [
+        (2, [NOT_A_RECORD]),
+        (3, [NOT_A_RECORD]),
+        (4, [UNKNOWN_REVENUE]),
+    ]
+
+
+def import_into(tmp_path, records, **options):
+    store = LeadStore(tmp_path / "leads.db")
+    rejected = []
+    counts = import_leads(
+        records,
+        store,
+        on_rejected=lambda line, errors: rejected.append(line),
+        **options,
+    )
+    return counts, rejected, connect(store.path)
+
+
+def test_duplicates_in_the_file_and_in_the_store_are_skipped(tmp_path):
+    records = [(n, lead(n % 3)) for n in range(6)] + [(6, lead(9, phone="1"))]
+
+    counts, rejected, conn = import_into(tmp_path, records, chunk_size=2)
+
+    assert counts == {"records": 7, "imported": 3, "duplicates": 3, "rejected": 1}
+    assert rejected == [6]
+    assert conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 3
+    kinds = conn.execute("SELECT kind FROM outbox").fetchall()
+    assert [row["kind"] for row in kinds] == ["prospect"] * 3
+
+    counts, _, _ = import_into(tmp_path, records[:3], mail=False)
+    assert counts["duplicates"] == 3
+
+
+def test_worker_processes_give_the_same_result(tmp_path):
+    records = [(n, lead(n)) for n in range(50)] + [(50, None)]
+
+    counts, rejected, conn = import_into(
+        tmp_path, records, workers=2, chunk_size=7, mail=False
+    )
+
+    assert counts == {"records": 51, "imported": 50, "duplicates": 0, "rejected": 1}
+    assert rejected == [50]
+    emails = [
+        row["email"] for row in conn.execute("SELECT email FROM leads ORDER BY id")
+    ]
+    assert emails == [f"p{n}@example.com" for n in range(50)]
+    assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0
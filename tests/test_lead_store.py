@@ -0,0 +1,42 @@
+import threading
+
+from lead_store import MIGRATIONS, connect, migrate
+
+
+def test_concurrent_migrations_apply_once(tmp_path):
+    path = tmp_path / "leads.db"
+    start = threading.Barrier(6)
+    errors = []
+
+    def run():
+        conn = connect(path)
+        start.wait()
+        try:
+            migrate(conn)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    conn = connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0
+
+
+def test_migrate_resumes_from_the_stored_version(tmp_path):
+    conn = connect(tmp_path / "leads.db")
+    conn.executescript(f"{MIGRATIONS[0]}\nPRAGMA user_version = 1;")
+    conn.execute(
+        "INSERT INTO leads VALUES (1, '2024-01-02T03:04:05', 'a', 'b', "
+        "'a@example.com', '555', 'Co', NULL, 'c')"
+    )
+
+    migrate(conn)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute("SELECT submissions FROM leads_daily").fetchone()[0] == 1
@@ -0,0 +1,80 @@
+import pytest
+
+from mail_config import MailConfig, MailConfigError, MailConfigWatcher
+
+VALID = {"SENDER_EMAIL": "sender@example.com", "SENDER_PASSWORD": "secret"}
+
+
+def test_defaults_fill_in_optional_settings():
+    config = MailConfig.from_secrets(VALID)
+
+    assert config.sender_email == "sender@example.com"
+    assert config.smtp_server == "smtp.gmail.com"
+    assert config.smtp_port == 587
+    assert config.use_tls is True
+    assert "secret" not in repr(config)
+
+
+def test_values_are_cast():
+    config = MailConfig.from_secrets(
+        dict(VALID, SMTP_PORT="2525", SMTP_USE_TLS="false", SMTP_TIMEOUT_SECONDS="3")
+    )
+
+    assert config.smtp_port == 2525
+    assert config.use_tls is False
+    assert config.timeout == 3.0
+
+
+def test_missing_and_placeholder_values_are_all_reported():
+    with pytest.raises(MailConfigError) as e:
+        MailConfig.from_secrets({"SENDER_PASSWORD": "your-app-password"})
+
+    assert "SENDER_EMAIL is required" in str(e.value)
+    assert "SENDER_PASSWORD still has its placeholder value" in str(e.value)
+
+
+@pytest.mark.parametrize(
+    "secrets, error",
+    [
+        ({"SMTP_PORT": "smtp"}, "SMTP_PORT has an invalid value"),
+        ({"SMTP_PORT": 70000}, "SMTP_PORT must be between 1 and 65535"),
+        ({"SMTP_TIMEOUT_SECONDS": 0}, "SMTP_TIMEOUT_SECONDS must be positive"),
+        ({"SENDER_EMAIL": "sender"}, "SENDER_EMAIL is not a valid email address"),
+        (
+            {"RECIPIENT_EMAIL": "owner@"},
+            "RECIPIENT_EMAIL is not a valid email address",
+        ),
+    ],
+)
+def test_invalid_values_are_rejected(secrets, error):
+    with pytest.raises(MailConfigError, match=error):
+        MailConfig.from_secrets(dict(VALID, **secrets))
+
+
+def test_watcher_keeps_the_last_good_config(tmp_path):
+    path = tmp_path / "secrets.toml"
+    path.write_text("")
+    secrets = dict(VALID)
+    watcher = MailConfigWatcher([str(path)], lambda: secrets, interval=3600)
+    assert watcher.config.sender_email == "sender@example.com"
+
+    # An invalid edit keeps the last good config
+    secrets["SMTP_PORT"] = 0
+    watcher.reload()
+    assert watcher.config.smtp_port == 587
+    assert "SMTP_PORT" in watcher.error
+
+    secrets["SMTP_PORT"] = 2525
+    watcher.reload()
+    assert watcher.config.smtp_port == 2525
+    assert watcher.error is None
+
+
+def test_watcher_without_secrets_reports_the_error(tmp_path):
+    def missing():
+        raise FileNotFoundError("No secrets found")
+
+    watcher = MailConfigWatcher([str(tmp_path / "secrets.toml")], missing, 3600)
+
+    assert watcher.config is None
+    assert "SENDER_EMAIL is required" in watcher.error
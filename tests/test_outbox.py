@@ -0,0 +1,256 @@
+import smtplib
+import time
+
+import pytest
+
+import metrics
+from lead_store import connect, enqueue, migrate
+from outbox import Outbox, backoff, report_depth, requeue_dead, status_counts
+from owner_digest import OwnerDigest
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(tmp_path / "leads.db")
+    migrate(conn)
+    return conn
+
+
+def make_outbox(conn, handler, **options):
+    path = conn.execute("PRAGMA database_list").fetchone()["file"]
+    outcomes = []
+    outbox = Outbox(
+        path,
+        {"mail": handler},
+        backoff_base=10,
+        backoff_cap=60,
+        on_outcome=lambda kind, outcome: outcomes.append(outcome),
+        **options,
+    )
+    return outbox, outcomes
+
+
+def row(conn, message_id=1):
+    return dict(
+        conn.execute("SELECT * FROM outbox WHERE id = ?", (message_id,)).fetchone()
+    )
+
+
+def sent_ok(payload):
+    pass
+
+
+def mailbox_unavailable(payload):
+    raise smtplib.SMTPRecipientsRefused({payload["to"]: (550, b"Mailbox unavailable")})
+
+
+def test_lease_holds_each_message_for_one_worker(conn):
+    for n in range(3):
+        enqueue(conn, "mail", {"to": f"p{n}@example.com"})
+    outbox, _ = make_outbox(conn, sent_ok, lease_seconds=60)
+
+    first = outbox.lease(conn, "a", 2)
+    second = outbox.lease(conn, "b", 2)
+
+    assert [m["id"] for m in first] == [1, 2]
+    assert [m["id"] for m in second] == [3]
+    assert outbox.lease(conn, "c", 2) == []
+    assert row(conn)["lease_owner"] == "a"
+    assert row(conn)["attempts"] == 1
+    assert row(conn)["available_at"] > time.time() + 50
+
+
+def test_ack_marks_sent(conn):
+    enqueue(conn, "mail", {"to": "p@example.com"})
+    outbox, outcomes = make_outbox(conn, sent_ok)
+
+    assert outbox.work(conn, "a") == 1
+
+    message = row(conn)
+    assert message["status"] == "sent"
+    assert message["lease_owner"] is None
+    assert message["finished_at"] is not None
+    assert outcomes == ["sent"]
+    assert outbox.work(conn, "a") == 0
+
+
+def test_failure_is_retried_after_backoff_with_the_smtp_error(conn):
+    enqueue(conn, "mail", {"to": "p@example.com"})
+    outbox, outcomes = make_outbox(conn, mailbox_unavailable, max_attempts=3)
+
+    before = time.time()
+    outbox.work(conn, "a")
+
+    message = row(conn)
+    assert message["status"] == "pending"
+    assert message["lease_owner"] is None
+    assert "SMTPRecipientsRefused" in message["last_error"]
+    assert "Mailbox unavailable" in message["last_error"]
+    # First retry waits between half and all of backoff_base
+    assert before + 5 <= message["available_at"] <= time.time() + 10
+    assert outcomes == ["retry"]
+    # Not ready again until the backoff has passed
+    assert outbox.work(conn, "a") == 0
+
+
+def test_backoff_doubles_up_to_the_cap():
+    for attempts, full in ((1, 10), (2, 20), (3, 40), (4, 60), (9, 60)):
+        delay = backoff(attempts, 10, 60)
+        assert full / 2 <= delay <= full
+
+
+def test_dead_letter_after_max_attempts_and_requeue(conn):
+    enqueue(conn, "mail", {"to": "p@example.com"})
+    outbox, outcomes = make_outbox(conn, mailbox_unavailable, max_attempts=2)
+
+    outbox.work(conn, "a")
+    conn.execute("UPDATE outbox SET available_at = 0")
+    outbox.work(conn, "a")
+
+    message = row(conn)
+    assert message["status"] == "dead"
+    assert message["attempts"] == 2
+    assert "Mailbox unavailable" in message["last_error"]
+    assert outcomes == ["retry", "dead"]
+    assert status_counts(conn) == {"dead": 1}
+
+    assert requeue_dead(conn) == 1
+    assert status_counts(conn) == {"pending": 1}
+    assert row(conn)["attempts"] == 0
+
+
+def test_lost_lease_cannot_overwrite_the_new_owner(conn):
+    enqueue(conn, "mail", {"to": "p@example.com"})
+    outbox, _ = make_outbox(conn, sent_ok, lease_seconds=0)
+    failing, _ = make_outbox(conn, mailbox_unavailable)
+
+    (stale,) = outbox.lease(conn, "a", 1)
+    # The lease ran out before "a" finished, so "b" takes the message over
+    (current,) = outbox.lease(conn, "b", 1)
+    failing.deliver(conn, "a", stale)
+
+    message = row(conn)
+    assert message["lease_owner"] == "b"
+    assert message["last_error"] is None
+
+    outbox.deliver(conn, "b", current)
+    assert row(conn)["status"] == "sent"
+    assert row(conn)["attempts"] == 2
+
+
+class Digest(OwnerDigest):
+    def __init__(self, fail=False, **options):
+        self.sent = []
+        self.fail = fail
+        super().__init__(self.single, self.digest, **options)
+
+    def single(self, lead, submitted):
+        self.digest([(lead, submitted)])
+
+    def digest(self, batch):
+        if self.fail:
+            raise smtplib.SMTPDataError(451, b"Try again later")
+        self.sent.append([lead["email"] for lead, _ in batch])
+
+
+def enqueue_owner(conn, n, age=0):
+    enqueue(
+        conn,
+        "owner",
+        {"lead": {"email": f"p{n}@example.com"}, "submitted": "2024-05-06T14:30:00"},
+    )
+    conn.execute(
+        "UPDATE outbox SET created_at = created_at - ?, available_at = "
+        "available_at - ? WHERE id = last_insert_rowid()",
+        (age, age),
+    )
+
+
+def make_digest_outbox(conn, digest):
+    path = conn.execute("PRAGMA database_list").fetchone()["file"]
+    return Outbox(path, {}, backoff_base=10, batches={"owner": digest})
+
+
+def test_digest_waits_in_the_outbox_for_its_window(conn):
+    digest = Digest(mode="always", window=300, max_leads=20)
+    outbox = make_digest_outbox(conn, digest)
+    enqueue_owner(conn, 1, age=100)
+    enqueue_owner(conn, 2)
+
+    assert outbox.work(conn, "a") == 0
+    assert status_counts(conn) == {"pending": 2}
+
+    # A restart loses nothing: a new outbox sends them once the window ends
+    conn.execute("UPDATE outbox SET created_at = created_at - 200")
+    assert make_digest_outbox(conn, digest).work(conn, "b") == 2
+    assert digest.sent == [["p1@example.com", "p2@example.com"]]
+    assert status_counts(conn) == {"sent": 2}
+
+
+def test_digest_goes_out_at_max_leads(conn):
+    digest = Digest(mode="always", window=300, max_leads=3)
+    outbox = make_digest_outbox(conn, digest)
+    for n in range(4):
+        enqueue_owner(conn, n)
+
+    assert outbox.work(conn, "a") == 3
+    assert digest.sent == [["p0@example.com", "p1@example.com", "p2@example.com"]]
+    assert outbox.work(conn, "a") == 0
+    assert status_counts(conn) == {"pending": 1, "sent": 3}
+
+
+def test_burst_sends_after_a_quiet_window_then_batches(conn):
+    digest = Digest(mode="burst", window=300, max_leads=20)
+    outbox = make_digest_outbox(conn, digest)
+    enqueue_owner(conn, 1)
+    assert outbox.work(conn, "a") == 1
+
+    enqueue_owner(conn, 2)
+    assert outbox.work(conn, "a") == 0
+    assert digest.sent == [["p1@example.com"]]
+
+
+def test_failed_digest_retries_every_lead_in_it(conn):
+    digest = Digest(fail=True, mode="always", window=300, max_leads=2)
+    outbox = make_digest_outbox(conn, digest)
+    enqueue_owner(conn, 1)
+    enqueue_owner(conn, 2)
+
+    assert outbox.work(conn, "a") == 2
+
+    rows = conn.execute("SELECT * FROM outbox").fetchall()
+    assert [r["status"] for r in rows] == ["pending", "pending"]
+    assert all("Try again later" in r["last_error"] for r in rows)
+    assert all(r["available_at"] > time.time() for r in rows)
+
+    digest.fail = False
+    conn.execute("UPDATE outbox SET available_at = 0")
+    assert outbox.work(conn, "a") == 2
+    assert digest.sent == [["p1@example.com", "p2@example.com"]]
+    assert status_counts(conn) == {"sent": 2}
+
+
+def test_batched_kinds_are_not_leased_one_by_one(conn):
+    outbox = make_digest_outbox(conn, Digest(mode="always"))
+    enqueue_owner(conn, 1)
+    enqueue(conn, "prospect", {"to": "p1@example.com"})
+
+    assert [m["kind"] for m in outbox.lease(conn, "a", 10)] == ["prospect"]
+
+
+def test_report_depth_sets_the_queue_gauge(conn, monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.setattr(metrics, "_gauges", {})
+    for n in range(3):
+        enqueue(conn, "mail", {"to": f"p{n}@example.com"})
+    conn.execute("UPDATE outbox SET status = 'dead' WHERE id = 1")
+
+    assert report_depth(conn) == {"pending": 2, "dead": 1}
+    assert 'email_queue_depth{status="pending"} 2' in metrics.render_prometheus()
+    assert 'email_queue_depth{status="dead"} 1' in metrics.render_prometheus()
+
+
+def test_lease_must_outlast_the_send_deadline(conn):
+    with pytest.raises(ValueError, match="send deadline"):
+        make_outbox(conn, sent_ok, lease_seconds=30, send_deadline=30)
+    make_outbox(conn, sent_ok, lease_seconds=60, send_deadline=30)
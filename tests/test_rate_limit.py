@@ -0,0 +1,89 @@
+import pytest
+
+from rate_limit import RateLimiter, RateLimitExceeded
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock, **options):
+    limits = dict(
+        global_limit=(100, 1.0), session_limit=(2, 0.1), email_limit=(1, 0.01)
+    )
+    limits.update(options)
+    return RateLimiter(clock=clock, **limits)
+
+
+def test_session_limit_and_refill():
+    clock = Clock()
+    limiter = make_limiter(clock, email_limit=(100, 1.0))
+
+    limiter.check("s1", "a@example.com")
+    limiter.check("s1", "b@example.com")
+    with pytest.raises(RateLimitExceeded) as e:
+        limiter.check("s1", "c@example.com")
+    assert e.value.scope == "session"
+    # Other sessions are unaffected
+    limiter.check("s2", "d@example.com")
+
+    clock.now += 10
+    limiter.check("s1", "e@example.com")
+
+
+def test_throttled_check_takes_no_tokens():
+    clock = Clock()
+    limiter = make_limiter(clock, email_limit=(2, 0.01))
+
+    limiter.check("s1", "a@example.com")
+    limiter.check("s1", "b@example.com")
+    # The session is out, so a@example.com keeps its second token
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("s1", "a@example.com")
+    limiter.check("s2", "a@example.com")
+    with pytest.raises(RateLimitExceeded) as e:
+        limiter.check("s3", "a@example.com")
+    assert e.value.scope == "email"
+
+
+def test_email_limit_ignores_case_and_spaces():
+    limiter = make_limiter(Clock())
+
+    limiter.check("s1", "Ann@Example.com ")
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("s2", "ann@example.com")
+
+
+def test_global_limit_delays_mail_at_its_rate():
+    clock = Clock()
+    limiter = make_limiter(clock, global_limit=(2, 0.5))
+
+    assert limiter.check("s1", "a@example.com") == 0
+    assert limiter.check("s2", "b@example.com") == 0
+    # Past the burst each submission waits one more token's worth
+    assert limiter.check("s3", "c@example.com") == pytest.approx(2)
+    assert limiter.check("s4", "d@example.com") == pytest.approx(4)
+
+    clock.now += 4
+    assert limiter.check("s5", "e@example.com") == pytest.approx(2)
+    assert limiter.stats() == {
+        "accepted": 2,
+        "delayed": 3,
+        "throttled": {"session": 0, "email": 0},
+    }
+
+
+def test_idle_buckets_expire_once_full():
+    clock = Clock()
+    limiter = make_limiter(clock, max_keys=10)
+
+    limiter.check("s1", "a@example.com")
+    assert "s1" in limiter._buckets["session"]
+    # A session bucket refills in 2 / 0.1 = 20 seconds
+    clock.now += 21
+    assert "s1" not in limiter._buckets["session"]
+    assert "a@example.com" in limiter._buckets["email"]
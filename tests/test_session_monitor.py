@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from streamlit.runtime import Runtime
+
+import session_monitor
+from session_monitor import SessionReaper, StreamlitInternalsChanged
+
+
+class ChangedRuntime(Runtime):
+    """A real Runtime type whose internals are not what we expect"""
+
+    def __init__(self):
+        pass
+
+
+@pytest.fixture
+def changed_runtime(monkeypatch):
+    runtime = ChangedRuntime()
+    monkeypatch.setattr(Runtime, "exists", classmethod(lambda cls: True))
+    monkeypatch.setattr(Runtime, "instance", classmethod(lambda cls: runtime))
+    return runtime
+
+
+def test_missing_internals_raise_with_the_checked_version(changed_runtime):
+    with pytest.raises(StreamlitInternalsChanged, match="checked against 1.46.1"):
+        session_monitor.session_footprints()
+    with pytest.raises(StreamlitInternalsChanged, match="Closing sessions"):
+        session_monitor.close_sessions(["s1"])
+
+
+def test_changed_session_objects_raise(changed_runtime):
+    class Manager:
+        def list_sessions(self):
+            return [object()]
+
+    changed_runtime._session_mgr = Manager()
+
+    with pytest.raises(StreamlitInternalsChanged, match="Listing sessions"):
+        session_monitor.session_footprints()
+
+
+def test_reaper_turns_itself_off_when_internals_change(changed_runtime, caplog):
+    reaper = SessionReaper(interval=0)
+
+    with caplog.at_level(logging.ERROR, logger="session_monitor"):
+        reaper._run()
+
+    # _run returned instead of sweeping again, and said why once
+    (record,) = caplog.records
+    assert record.getMessage().startswith(
+        "Session reaper disabled: Finding the session manager failed"
+    )
+
+
+def test_no_sessions_without_a_runtime():
+    assert session_monitor.session_footprints() == []
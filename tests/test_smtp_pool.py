@@ -0,0 +1,50 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from smtp_pool import SMTPConnectionPool
+
+
+@pytest.fixture
+def stalling_server():
+    """Greets and answers EHLO, then never replies to MAIL"""
+    listener = socket.create_server(("127.0.0.1", 0))
+    stop = threading.Event()
+
+    def serve(conn):
+        with conn, conn.makefile("rb") as lines:
+            conn.sendall(b"220 test\r\n")
+            for line in lines:
+                if line.upper().startswith(b"EHLO"):
+                    conn.sendall(b"250 test\r\n")
+                else:
+                    stop.wait(10)
+                    return
+
+    def accept():
+        while not stop.is_set():
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield listener.getsockname()[1]
+    stop.set()
+    listener.close()
+
+
+def test_send_gives_up_at_its_deadline(stalling_server):
+    pool = SMTPConnectionPool(
+        "127.0.0.1", stalling_server, None, None, use_tls=False, deadline=0.5
+    )
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="0.5s deadline"):
+        pool.sendmail("a@example.com", ["b@example.com"], "Subject: hi\r\n\r\nhi")
+    # The 30s socket timeout never came into play, nor did a reconnect
+    assert time.monotonic() - started < 2
+    assert pool.connects == 1
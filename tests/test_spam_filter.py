@@ -0,0 +1,64 @@
+import pytest
+
+from spam_filter import CONTENT, SpamFilter, SpamRejected, score
+
+LEAD = {
+    "first_name": "Ann",
+    "last_name": "Lee",
+    "email": "ann@example.com",
+    "phone": "(555) 555-1234",
+    "company": "Acme Analytics",
+    "revenue": "",
+    "challenge": "Our monthly reports take a week to build by hand in spreadsheets",
+}
+
+
+@pytest.mark.parametrize(
+    "challenge",
+    [
+        "We're a consumer loan servicer; loan origination and loan default "
+        "reports take days",
+        "Crypto exchange: bitcoin and forex volumes never reconcile across desks",
+        "Sales split across shopify.com, amazon.com and etsy.com, nothing matches",
+        "Our site is www.acme.com and we can't tell which campaigns convert",
+    ],
+)
+def test_real_prospects_are_accepted(challenge):
+    lead = dict(LEAD, challenge=challenge)
+    assert score(lead) <= 2
+    assert SpamFilter().check(lead, fill_seconds=30) is None
+
+
+def test_link_spam_is_stored_flagged_not_rejected():
+    spam_filter = SpamFilter()
+    lead = dict(
+        LEAD,
+        challenge="Best SEO services and backlinks http://a.xyz http://b.xyz "
+        "<a href=http://c.xyz>click here</a>",
+    )
+
+    assert spam_filter.check(lead, fill_seconds=30) == CONTENT
+    assert spam_filter.stats()["flagged"] == 1
+
+
+@pytest.mark.parametrize(
+    "honeypot, fill_seconds, reason",
+    [("http://spam.example", 30, "honeypot"), ("", 0.5, "too_fast")],
+)
+def test_bots_are_rejected(honeypot, fill_seconds, reason):
+    spam_filter = SpamFilter()
+    with pytest.raises(SpamRejected) as rejected:
+        spam_filter.check(LEAD, honeypot=honeypot, fill_seconds=fill_seconds)
+    assert rejected.value.reason == reason
+    assert spam_filter.stats()["rejected"][reason] == 1
+
+
+def test_same_text_from_many_senders_is_rejected():
+    spam_filter = SpamFilter(repeat_limit=2)
+    for n in range(2):
+        spam_filter.check(dict(LEAD, email=f"p{n}@example.com"), fill_seconds=30)
+    # A sender already seen may resubmit
+    spam_filter.check(dict(LEAD, email="p0@example.com"), fill_seconds=30)
+
+    with pytest.raises(SpamRejected, match="repeated"):
+        spam_filter.check(dict(LEAD, email="p2@example.com"), fill_seconds=30)
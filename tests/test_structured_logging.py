@@ -0,0 +1,60 @@
+import json
+import logging
+
+import pytest
+
+from structured_logging import JSONFormatter, redact
+from validation import validate_email, validate_phone
+
+EMAILS = [
+    "ann@example.com",
+    "josé@exämple.com",
+    "o'brien+leads@sub.example.co.uk",
+    "用户@例子.公司",
+]
+PHONES = [
+    "5555555555",
+    "(555) 555-5555",
+    "555.555.5555",
+    "+1 702 445 2266",
+    "+44 20 7946 0958",
+    "555 - 555 - 5555",
+]
+
+
+@pytest.mark.parametrize("email", EMAILS)
+def test_accepted_emails_are_masked(email):
+    assert validate_email(email)
+    text = redact(f"New consultation request from {email} at Co")
+
+    local, domain = email.split("@")
+    assert local not in text
+    assert text == f"New consultation request from {local[0]}***@{domain} at Co"
+
+
+@pytest.mark.parametrize("phone", PHONES)
+def test_accepted_phones_are_masked(phone):
+    assert validate_phone(phone)
+    assert redact(f"call {phone} today") == "call [phone] today"
+
+
+def test_ordinary_numbers_are_kept():
+    text = "Outbox owner message 12 failed (attempt 3), retrying in 25s"
+    assert redact(text) == text
+    assert redact("boot 400.0ms at 2024-05-06T14:30:00") == (
+        "boot 400.0ms at 2024-05-06T14:30:00"
+    )
+
+
+def test_json_lines_are_redacted():
+    record = logging.LogRecord(
+        "app",
+        logging.INFO,
+        __file__,
+        1,
+        "Lead %s %s",
+        ("josé@exämple.com", "5555555555"),
+        None,
+    )
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "Lead j***@exämple.com [phone]"
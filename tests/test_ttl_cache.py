@@ -0,0 +1,56 @@
+from ttl_cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl():
+    clock = Clock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+    clock.now = 30
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, clock=Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_setdefault_keeps_a_live_entry_and_replaces_an_expired_one():
+    clock = Clock()
+    cache = TTLCache(ttl=10, clock=clock)
+
+    assert cache.setdefault("a", 1) == 1
+    assert cache.setdefault("a", 2) == 1
+    clock.now = 10
+    assert cache.setdefault("a", 3) == 3
+
+
+def test_pop_removes_and_returns():
+    cache = TTLCache(clock=Clock())
+    cache.set("a", 1)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe mapping with per-entry expiry and LRU eviction"""
+
+    def __init__(self, max_size=10000, ttl=600, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def setdefault(self, key, value, ttl=None):
+        """Store value unless a live entry exists; return the live entry"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > self._clock():
+                self._data.move_to_end(key)
+                return entry[0]
+            self._store(key, value, ttl)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def _store(self, key, value, ttl):
+        self._data[key] = (value, self._clock() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def _expire(self):
+        now = self._clock()
+        expired = [k for k, (_, expires_at) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+
+
+_MISSING = object()
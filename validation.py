@@ -0,0 +1,64 @@
+import re
+
+EMAIL_PATTERN = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+PHONE_SEPARATORS = re.compile(r"[\s\-\(\)\.]+")
+MIN_PHONE_DIGITS = 10
+
+# (field, message when missing) in the order errors are shown on the form
+REQUIRED_FIELDS = (
+    ("first_name", "First name is required"),
+    ("last_name", "Last name is required"),
+    ("email", "Email is required"),
+    ("phone", "Phone number is required"),
+    ("company", "Company name is required"),
+    ("challenge", "Please describe your biggest data challenge"),
+)
+INVALID_EMAIL = "Please enter a valid email address"
+INVALID_PHONE = "Please enter a valid phone number"
+
+
+def validate_email(email):
+    """Validate email format"""
+    return EMAIL_PATTERN.match(email) is not None
+
+
+def validate_phone(phone):
+    """Validate phone number"""
+    return len(PHONE_SEPARATORS.sub("", phone)) >= MIN_PHONE_DIGITS
+
+
+def validate_submission(lead):
+    """Return every validation error for a lead, in form order"""
+    errors = []
+    for field, missing in REQUIRED_FIELDS:
+        value = lead.get(field) or ""
+        if not value.strip():
+            errors.append(missing)
+        elif field == "email" and not validate_email(value):
+            errors.append(INVALID_EMAIL)
+        elif field == "phone" and not validate_phone(value):
+            errors.append(INVALID_PHONE)
+    return errors
+
+
+def validate_batch(records):
+    """Errors for each of many leads, as validate_submission() gives them"""
+    return [validate_submission(lead) for lead in records]
+
+
+def normalize_email(email):
+    """Canonical form of an email address via email_validator, if installed
+
+    Falls back to the stripped input when the package is missing or rejects
+    an address the form's own rules accepted.
+    """
+    email = email.strip()
+    try:
+        from email_validator import EmailNotValidError
+        from email_validator import validate_email as check_email
+    except ImportError:
+        return email
+    try:
+        return check_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return email